@@ -0,0 +1,31 @@
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from bot.utils.metrics import count_update_operation
+
+current_operations: ContextVar[Optional[Counter]] = ContextVar('current_operations', default=None)
+
+
+def count_operation(name: str, amount=1):
+    # fakes report through the same per-update counter as the real clients, so the accounting middleware sees them too
+    count_update_operation(name, amount)
+
+    operations = current_operations.get()
+    if operations is not None:
+        operations[name] += amount
+
+
+def instrument_redis(redis):
+    pool = redis.connection_pool
+    connection_class = pool.connection_class
+
+    async def send_packed_command(self, command, check_health=True):
+        operations = current_operations.get()
+        if operations is not None:
+            operations['redis_round_trips'] += 1
+        await connection_class.send_packed_command(self, command, check_health)
+
+    pool.connection_class = type(connection_class.__name__, (connection_class,), {
+        'send_packed_command': send_packed_command,
+    })
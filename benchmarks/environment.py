@@ -0,0 +1,37 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import rsa
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def prepare_environment():
+    # the benchmark never talks to real services, so bot.config is fed the placeholders from env.example
+    os.environ['ENVIRONMENT'] = 'benchmark'
+    for line in (BASE_DIR / 'env.example').read_text().splitlines():
+        line = line.split('#', 1)[0].strip()
+        if '=' in line:
+            key, value = line.split('=', 1)
+            os.environ.setdefault(key.strip(), value.strip())
+    os.environ.setdefault('WEBHOOK_PIKA_PATH', '/pika')
+    os.environ.setdefault('DEEPSEEK_API_KEY', 'benchmark')
+    os.environ.setdefault('ADDITIONAL_BOT_TOKENS', '[]')
+
+    # google clients parse the service account on import, so a throwaway one is generated when there is none
+    if not (BASE_DIR / os.environ['CERTIFICATE_NAME']).exists():
+        _, private_key = rsa.newkeys(1024)
+        certificate = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+        with certificate:
+            json.dump({
+                'type': 'service_account',
+                'project_id': 'benchmark',
+                'private_key_id': 'benchmark',
+                'private_key': private_key.save_pkcs1().decode(),
+                'client_email': 'benchmark@benchmark.iam.gserviceaccount.com',
+                'client_id': 'benchmark',
+                'token_uri': 'https://oauth2.googleapis.com/token',
+            }, certificate)
+        os.environ['CERTIFICATE_NAME'] = certificate.name
@@ -0,0 +1,428 @@
+import asyncio
+import copy
+import functools
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Iterable, Optional
+
+from google.cloud.firestore_v1 import FieldFilter, Query
+from google.cloud.firestore_v1.base_aggregation import AggregationResult
+from google.cloud.firestore_v1.transforms import (
+    ArrayRemove,
+    ArrayUnion,
+    DELETE_FIELD,
+    Increment,
+    Maximum,
+    Minimum,
+    SERVER_TIMESTAMP,
+)
+
+from benchmarks.counters import count_operation
+
+MISSING = object()
+
+
+def get_field(data: dict, field_path: str):
+    value = data
+    for part in field_path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return MISSING
+        value = value[part]
+    return value
+
+
+def resolve(current, value):
+    if value is DELETE_FIELD:
+        return MISSING
+    elif value is SERVER_TIMESTAMP:
+        return datetime.now(timezone.utc)
+    elif isinstance(value, Increment):
+        return (current or 0) + value.value
+    elif isinstance(value, Maximum):
+        return max(current or 0, value.value)
+    elif isinstance(value, Minimum):
+        return min(current or 0, value.value)
+    elif isinstance(value, ArrayUnion):
+        return list(current or []) + [item for item in value.values if item not in (current or [])]
+    elif isinstance(value, ArrayRemove):
+        return [item for item in current or [] if item not in value.values]
+    elif isinstance(value, dict):
+        resolved = {key: resolve(None, item) for key, item in value.items()}
+        return {key: item for key, item in resolved.items() if item is not MISSING}
+    return copy.deepcopy(value)
+
+
+def assign(data: dict, name: str, value):
+    value = resolve(data.get(name), value)
+    if value is MISSING:
+        data.pop(name, None)
+    else:
+        data[name] = value
+
+
+def apply_field(data: dict, field_path: str, value):
+    *parents, name = field_path.split('.')
+    for part in parents:
+        data = data.setdefault(part, {})
+    assign(data, name, value)
+
+
+def merge_fields(data: dict, values: dict):
+    for key, value in values.items():
+        if isinstance(value, dict) and isinstance(data.get(key), dict):
+            merge_fields(data[key], value)
+        else:
+            assign(data, key, value)
+
+
+def matches(data: dict, field_filter: FieldFilter) -> bool:
+    value = get_field(data, field_filter.field_path)
+    if value is MISSING:
+        return False
+
+    op, expected = field_filter.op_string, field_filter.value
+    try:
+        if op == '==':
+            return value == expected
+        elif op == '!=':
+            return value != expected
+        elif op == '<':
+            return value < expected
+        elif op == '<=':
+            return value <= expected
+        elif op == '>':
+            return value > expected
+        elif op == '>=':
+            return value >= expected
+        elif op == 'in':
+            return value in expected
+        elif op == 'not-in':
+            return value not in expected
+        elif op == 'array_contains':
+            return isinstance(value, list) and expected in value
+        elif op == 'array_contains_any':
+            return isinstance(value, list) and any(item in value for item in expected)
+    except TypeError:
+        # firestore never matches values of different types
+        return False
+
+    raise NotImplementedError(f'Unsupported operator: {op}')
+
+
+class FakeDocumentSnapshot:
+    def __init__(self, reference: 'FakeDocumentReference', data: Optional[dict], fields: Optional[list[str]] = None):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+        self._fields = fields
+
+    def to_dict(self) -> Optional[dict]:
+        if self._data is None:
+            return None
+        if self._fields is not None:
+            return {
+                field: copy.deepcopy(self._data[field]) for field in self._fields if field in self._data
+            }
+        return copy.deepcopy(self._data)
+
+    def get(self, field_path: str):
+        value = get_field(self._data or {}, field_path)
+        if value is MISSING:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+
+class FakeDocumentReference:
+    def __init__(self, client: 'FakeFirestore', collection_name: str, id: str):
+        self._client = client
+        self._collection_name = collection_name
+        self.id = id
+        self.path = f'{collection_name}/{id}'
+
+    @property
+    def parent(self) -> 'FakeCollectionReference':
+        return self._client.collection(self._collection_name)
+
+    async def get(self, field_paths=None, transaction=None, **kwargs) -> FakeDocumentSnapshot:
+        await self._client.round_trip()
+        count_operation('firestore_reads')
+
+        data = self._client.documents(self._collection_name).get(self.id)
+        if data is not None:
+            count_operation('firestore_documents')
+        return FakeDocumentSnapshot(self, data, field_paths)
+
+    async def create(self, document_data: dict, **kwargs):
+        await self._client.commit([('create', self, document_data, False)])
+
+    async def set(self, document_data: dict, merge=False, **kwargs):
+        await self._client.commit([('set', self, document_data, merge)])
+
+    async def update(self, field_updates: dict, **kwargs):
+        await self._client.commit([('update', self, field_updates, False)])
+
+    async def delete(self, **kwargs):
+        await self._client.commit([('delete', self, None, False)])
+
+
+class FakeAggregationQuery:
+    def __init__(self, query: 'FakeQuery', alias: str):
+        self._query = query
+        self._alias = alias
+
+    async def get(self, **kwargs) -> list[list[AggregationResult]]:
+        await self._query._client.round_trip()
+        count_operation('firestore_queries')
+
+        count = len(self._query._run())
+        return [[AggregationResult(alias=self._alias, value=count)]]
+
+
+class FakeQuery:
+    def __init__(
+        self,
+        client: 'FakeFirestore',
+        collection_name: str,
+        filters: tuple = (),
+        orders: tuple = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        start_after: Optional[FakeDocumentSnapshot] = None,
+        fields: Optional[list[str]] = None,
+    ):
+        self._client = client
+        self._collection_name = collection_name
+        self._filters = filters
+        self._orders = orders
+        self._limit = limit
+        self._offset = offset
+        self._start_after = start_after
+        self._fields = fields
+
+    def _copy(self, **kwargs) -> 'FakeQuery':
+        return FakeQuery(**{
+            'client': self._client,
+            'collection_name': self._collection_name,
+            'filters': self._filters,
+            'orders': self._orders,
+            'limit': self._limit,
+            'offset': self._offset,
+            'start_after': self._start_after,
+            'fields': self._fields,
+            **kwargs,
+        })
+
+    def where(self, field_path: Optional[str] = None, op_string: Optional[str] = None, value=None, *, filter=None):
+        field_filter = filter or FieldFilter(field_path, op_string, value)
+        return self._copy(filters=self._filters + (field_filter,))
+
+    def order_by(self, field_path: str, direction=Query.ASCENDING):
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count: int):
+        return self._copy(limit=count)
+
+    def offset(self, num_to_skip: int):
+        return self._copy(offset=num_to_skip)
+
+    def start_after(self, document_fields_or_snapshot):
+        return self._copy(start_after=document_fields_or_snapshot)
+
+    def select(self, field_paths: Iterable[str]):
+        return self._copy(fields=list(field_paths))
+
+    def count(self, alias: Optional[str] = None) -> FakeAggregationQuery:
+        return FakeAggregationQuery(self, alias or 'count')
+
+    def compare(self, left: tuple[str, dict], right: tuple[str, dict]) -> int:
+        for field_path, direction in self._orders:
+            left_value, right_value = get_field(left[1], field_path), get_field(right[1], field_path)
+            if left_value != right_value:
+                try:
+                    result = -1 if left_value < right_value else 1
+                except TypeError:
+                    result = -1 if type(left_value).__name__ < type(right_value).__name__ else 1
+                return -result if direction == Query.DESCENDING else result
+
+        return (left[0] > right[0]) - (left[0] < right[0])
+
+    def _run(self) -> list[tuple[str, dict]]:
+        documents = [
+            (id, data) for id, data in self._client.documents(self._collection_name).items()
+            if all(matches(data, field_filter) for field_filter in self._filters) and
+            all(get_field(data, field_path) is not MISSING for field_path, _ in self._orders)
+        ]
+        documents.sort(key=functools.cmp_to_key(self.compare))
+
+        if self._start_after is not None:
+            cursor = self._start_after
+            if isinstance(cursor, FakeDocumentSnapshot):
+                cursor = (cursor.id, cursor._data or {})
+            else:
+                cursor = ('', cursor)
+            documents = [document for document in documents if self.compare(document, cursor) > 0]
+
+        documents = documents[self._offset:]
+        if self._limit is not None:
+            documents = documents[:self._limit]
+        return documents
+
+    async def stream(self, transaction=None, **kwargs) -> AsyncIterator[FakeDocumentSnapshot]:
+        await self._client.round_trip()
+        count_operation('firestore_queries')
+
+        documents = self._run()
+        count_operation('firestore_documents', len(documents))
+        for id, data in documents:
+            yield FakeDocumentSnapshot(
+                FakeDocumentReference(self._client, self._collection_name, id),
+                copy.deepcopy(data),
+                self._fields,
+            )
+
+    async def get(self, transaction=None, **kwargs) -> list[FakeDocumentSnapshot]:
+        return [document async for document in self.stream(transaction)]
+
+
+class FakeCollectionReference(FakeQuery):
+    def __init__(self, client: 'FakeFirestore', collection_name: str):
+        super().__init__(client, collection_name)
+        self.id = collection_name
+
+    def document(self, document_id: Optional[str] = None) -> FakeDocumentReference:
+        return FakeDocumentReference(self._client, self._collection_name, document_id or uuid.uuid4().hex[:20])
+
+    async def add(self, document_data: dict, document_id: Optional[str] = None, **kwargs):
+        document = self.document(document_id)
+        await document.set(document_data)
+        return datetime.now(timezone.utc), document
+
+
+class FakeWriteBatch:
+    def __init__(self, client: 'FakeFirestore'):
+        self._client = client
+        self._writes = []
+
+    def __len__(self):
+        return len(self._writes)
+
+    def create(self, reference: FakeDocumentReference, document_data: dict):
+        self._writes.append(('create', reference, document_data, False))
+
+    def set(self, reference: FakeDocumentReference, document_data: dict, merge=False):
+        self._writes.append(('set', reference, document_data, merge))
+
+    def update(self, reference: FakeDocumentReference, field_updates: dict, **kwargs):
+        self._writes.append(('update', reference, field_updates, False))
+
+    def delete(self, reference: FakeDocumentReference, **kwargs):
+        self._writes.append(('delete', reference, None, False))
+
+    async def commit(self, **kwargs):
+        writes, self._writes = self._writes, []
+        await self._client.commit(writes)
+
+
+class FakeTransaction(FakeWriteBatch):
+    # the attributes and hooks @firestore.async_transactional drives a real AsyncTransaction through
+    def __init__(self, client: 'FakeFirestore', max_attempts=5, read_only=False):
+        super().__init__(client)
+        self._max_attempts = max_attempts
+        self._read_only = read_only
+        self._id = None
+
+    def _clean_up(self):
+        self._writes = []
+        self._id = None
+
+    async def _begin(self, retry_id=None):
+        await self._client.round_trip()
+        self._id = uuid.uuid4().bytes
+
+    async def _commit(self):
+        await self.commit()
+        self._id = None
+
+    async def _rollback(self):
+        self._clean_up()
+
+    async def get(self, reference_or_query, **kwargs) -> AsyncIterator[FakeDocumentSnapshot]:
+        if isinstance(reference_or_query, FakeDocumentReference):
+            yield await reference_or_query.get()
+        else:
+            async for document in reference_or_query.stream():
+                yield document
+
+
+class FakeFirestore:
+    """
+    In-memory stand-in for the subset of google.cloud.firestore_v1.AsyncClient used in bot/database/operations.
+    Every call that would be an RPC sleeps for `latency` and is counted like the real client is by bot.utils.metrics.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.collections: dict[str, dict[str, dict]] = {}
+
+    async def round_trip(self):
+        await asyncio.sleep(self.latency)
+
+    def documents(self, collection_name: str) -> dict[str, dict]:
+        return self.collections.setdefault(collection_name, {})
+
+    def collection(self, collection_name: str) -> FakeCollectionReference:
+        return FakeCollectionReference(self, collection_name)
+
+    def document(self, document_path: str) -> FakeDocumentReference:
+        collection_name, id = document_path.split('/', 1)
+        return FakeDocumentReference(self, collection_name, id)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def transaction(self, max_attempts=5, read_only=False) -> FakeTransaction:
+        return FakeTransaction(self, max_attempts, read_only)
+
+    async def get_all(self, references: Iterable[FakeDocumentReference], field_paths=None, transaction=None, **kwargs):
+        references = list(references)
+        await self.round_trip()
+        count_operation('firestore_reads')
+
+        for reference in references:
+            data = self.documents(reference._collection_name).get(reference.id)
+            if data is not None:
+                count_operation('firestore_documents')
+            yield FakeDocumentSnapshot(reference, copy.deepcopy(data), field_paths)
+
+    async def commit(self, writes: list[tuple[str, FakeDocumentReference, Any, bool]]):
+        await self.round_trip()
+        count_operation('firestore_commits')
+        count_operation('firestore_writes', len(writes))
+
+        # writes are validated before any is applied, so a failed commit leaves nothing behind
+        for kind, reference, _, _ in writes:
+            exists = reference.id in self.documents(reference._collection_name)
+            if kind == 'create' and exists:
+                raise ValueError(f'Document already exists: {reference.path}')
+            if kind == 'update' and not exists:
+                raise ValueError(f'No document to update: {reference.path}')
+
+        for kind, reference, values, merge in writes:
+            documents = self.documents(reference._collection_name)
+            if kind == 'delete':
+                documents.pop(reference.id, None)
+            elif kind == 'update' or (kind == 'set' and merge and reference.id in documents):
+                document = documents[reference.id]
+                if kind == 'update':
+                    for field_path, value in values.items():
+                        apply_field(document, field_path, value)
+                else:
+                    merge_fields(document, values)
+            else:
+                document = documents[reference.id] = {}
+                for key, value in values.items():
+                    assign(document, key, value)
+
+    def close(self):
+        pass
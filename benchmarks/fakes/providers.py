@@ -0,0 +1,126 @@
+import asyncio
+import contextlib
+import importlib
+from types import SimpleNamespace
+from typing import AsyncIterator
+
+from benchmarks.counters import count_operation
+
+OPENAI_COMPATIBLE_MODULES = (
+    'bot.integrations.open_ai',
+    'bot.integrations.deep_seek',
+    'bot.integrations.grok',
+    'bot.integrations.perplexity',
+)
+ANTHROPIC_MODULES = (
+    'bot.integrations.anthropic',
+)
+
+
+class FakeProvider:
+    """
+    Shapes the response timing of an LLM: `latency` until the first token, then `chunks` deltas `chunk_interval` apart.
+    """
+
+    def __init__(self, latency=0.5, chunks=20, chunk_interval=0.02, input_tokens=500):
+        self.latency = latency
+        self.chunks = chunks
+        self.chunk_interval = chunk_interval
+        self.input_tokens = input_tokens
+
+    def get_text(self) -> str:
+        return ' '.join(f'token{i}' for i in range(self.chunks))
+
+    async def wait_for_response(self):
+        count_operation('provider_requests')
+        await asyncio.sleep(self.latency + self.chunks * self.chunk_interval)
+
+    async def stream_deltas(self) -> AsyncIterator[str]:
+        count_operation('provider_requests')
+        await asyncio.sleep(self.latency)
+        for i in range(self.chunks):
+            yield f'token{i} ' if i < self.chunks - 1 else f'token{i}'
+            await asyncio.sleep(self.chunk_interval)
+
+
+class FakeOpenAICompletions:
+    def __init__(self, provider: FakeProvider):
+        self.provider = provider
+
+    async def create(self, model: str, messages: list, stream=False, **kwargs):
+        if stream:
+            return self.stream()
+
+        await self.provider.wait_for_response()
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    finish_reason='stop',
+                    message=SimpleNamespace(role='assistant', content=self.provider.get_text()),
+                ),
+            ],
+            usage=SimpleNamespace(prompt_tokens=self.provider.input_tokens, completion_tokens=self.provider.chunks),
+        )
+
+    async def stream(self):
+        async for delta in self.provider.stream_deltas():
+            yield SimpleNamespace(
+                usage=None,
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=delta), finish_reason=None)],
+            )
+
+        yield SimpleNamespace(
+            usage=None,
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=None), finish_reason='stop')],
+        )
+        yield SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=self.provider.input_tokens, completion_tokens=self.provider.chunks),
+            choices=[],
+        )
+
+
+class FakeOpenAI:
+    def __init__(self, provider: FakeProvider):
+        self.chat = SimpleNamespace(completions=FakeOpenAICompletions(provider))
+
+
+class FakeAnthropicStream:
+    def __init__(self, provider: FakeProvider):
+        self.provider = provider
+        self.text_stream = provider.stream_deltas()
+
+    async def get_final_message(self):
+        return SimpleNamespace(
+            stop_reason='end_turn',
+            usage=SimpleNamespace(input_tokens=self.provider.input_tokens, output_tokens=self.provider.chunks),
+        )
+
+
+class FakeAnthropicMessages:
+    def __init__(self, provider: FakeProvider):
+        self.provider = provider
+
+    async def create(self, model: str, messages: list, **kwargs):
+        await self.provider.wait_for_response()
+        return SimpleNamespace(
+            stop_reason='end_turn',
+            content=[SimpleNamespace(text=self.provider.get_text())],
+            usage=SimpleNamespace(input_tokens=self.provider.input_tokens, output_tokens=self.provider.chunks),
+        )
+
+    @contextlib.asynccontextmanager
+    async def stream(self, model: str, messages: list, **kwargs):
+        yield FakeAnthropicStream(self.provider)
+
+
+class FakeAnthropic:
+    def __init__(self, provider: FakeProvider):
+        self.messages = FakeAnthropicMessages(provider)
+
+
+def install_fake_providers(provider: FakeProvider):
+    # get_client only builds a client when none is set, so swapping it keeps the real request and parsing code
+    for module_name in OPENAI_COMPATIBLE_MODULES:
+        importlib.import_module(module_name).client = FakeOpenAI(provider)
+    for module_name in ANTHROPIC_MODULES:
+        importlib.import_module(module_name).client = FakeAnthropic(provider)
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Optional
+
+from benchmarks.counters import count_operation
+
+
+class FakeBlob:
+    def __init__(self, bucket: 'FakeBucket', name: str):
+        self.bucket = bucket
+        self.name = name
+
+    @property
+    def size(self) -> int:
+        return len(self.bucket.storage.blobs.get(self.name, b''))
+
+    async def download(self, **kwargs) -> bytes:
+        return await self.bucket.storage.download(self.bucket.name, self.name)
+
+    async def upload(self, data, content_type: Optional[str] = None, **kwargs):
+        return await self.bucket.storage.upload(self.bucket.name, self.name, data, content_type)
+
+
+class FakeBucket:
+    def __init__(self, storage: 'FakeStorage', name: str):
+        self.storage = storage
+        self.name = name
+
+    def new_blob(self, blob_name: str) -> FakeBlob:
+        return FakeBlob(self, blob_name)
+
+    async def get_blob(self, blob_name: str, **kwargs) -> FakeBlob:
+        await self.storage.round_trip()
+        if blob_name not in self.storage.blobs:
+            raise FileNotFoundError(blob_name)
+        return FakeBlob(self, blob_name)
+
+    async def blob_exists(self, blob_name: str, **kwargs) -> bool:
+        await self.storage.round_trip()
+        return blob_name in self.storage.blobs
+
+    async def list_blobs(self, prefix='', **kwargs) -> list[str]:
+        await self.storage.round_trip()
+        return [name for name in self.storage.blobs if name.startswith(prefix)]
+
+
+class FakeStorage:
+    """
+    In-memory stand-in for gcloud.aio.storage.Storage, keeping blobs of a single bucket.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.blobs: dict[str, bytes] = {}
+
+    async def round_trip(self):
+        count_operation('storage_operations')
+        await asyncio.sleep(self.latency)
+
+    def get_bucket(self, bucket_name: str) -> FakeBucket:
+        return FakeBucket(self, bucket_name)
+
+    async def download(self, bucket: str, object_name: str, **kwargs) -> bytes:
+        await self.round_trip()
+        return self.blobs[object_name]
+
+    async def upload(self, bucket: str, object_name: str, file_data, content_type: Optional[str] = None, **kwargs):
+        await self.round_trip()
+        self.blobs[object_name] = file_data if isinstance(file_data, bytes) else str(file_data).encode()
+        return {'name': object_name, 'bucket': bucket}
+
+    async def delete(self, bucket: str, object_name: str, **kwargs):
+        await self.round_trip()
+        self.blobs.pop(object_name, None)
+
+    async def close(self):
+        pass
@@ -0,0 +1,150 @@
+import asyncio
+import itertools
+import time
+from collections import Counter
+from typing import Any, AsyncGenerator, Dict, Optional, Union, get_args, get_origin
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import File, Message, MessageId, User, WebhookInfo
+
+from benchmarks.counters import count_operation
+
+MEDIA_FIELDS = ('photo', 'document', 'video', 'audio', 'voice', 'animation', 'video_note')
+
+
+class FakeTelegramSession(BaseSession):
+    """
+    Bot API session that answers every method locally after `latency` seconds.
+    Results go through BaseSession.check_response, so aiogram parses them exactly like real responses.
+    """
+
+    def __init__(self, latency=0.0, file_size=64 * 1024):
+        super().__init__()
+        self.latency = latency
+        self.file_size = file_size
+        self.message_ids = itertools.count(1_000_000)
+        self.requests = Counter()
+
+    async def close(self):
+        pass
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: Optional[int] = None,
+    ) -> TelegramType:
+        await asyncio.sleep(self.latency)
+        self.requests[method.__api_method__] += 1
+        count_operation('telegram_requests')
+
+        content = self.json_dumps({
+            'ok': True,
+            'result': self.build_result(bot, method),
+        })
+        response = self.check_response(bot=bot, method=method, status_code=200, content=content)
+        return response.result
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        await asyncio.sleep(self.latency)
+        self.requests['downloadFile'] += 1
+        count_operation('telegram_requests')
+
+        remaining = self.file_size
+        while remaining > 0:
+            chunk = min(chunk_size, remaining)
+            remaining -= chunk
+            yield b'\0' * chunk
+
+    def build_result(self, bot: Bot, method: TelegramMethod) -> Union[dict, list, bool]:
+        returning = method.__returning__
+        returning_types = get_args(returning) if get_origin(returning) is Union else (returning,)
+
+        if Message in returning_types and getattr(method, 'chat_id', None) is not None:
+            return self.build_message(bot, method)
+        elif get_origin(returning) is list and get_args(returning) == (Message,):
+            return [self.build_message(bot, method) for _ in getattr(method, 'media', [])]
+        elif bool in returning_types:
+            return True
+        elif returning is File:
+            return {
+                'file_id': method.file_id,
+                'file_unique_id': method.file_id,
+                'file_size': self.file_size,
+                'file_path': f'files/{method.file_id}.jpg',
+            }
+        elif returning is User:
+            return self.build_bot_user(bot)
+        elif returning is MessageId:
+            return {'message_id': next(self.message_ids)}
+        elif returning is WebhookInfo:
+            return {'url': '', 'has_custom_certificate': False, 'pending_update_count': 0}
+
+        raise NotImplementedError(f'{method.__api_method__} is not supported by FakeTelegramSession')
+
+    def build_message(self, bot: Bot, method: TelegramMethod) -> dict:
+        chat_id = method.chat_id
+        message = {
+            'message_id': getattr(method, 'message_id', None) or next(self.message_ids),
+            'date': int(time.time()),
+            'chat': {
+                'id': int(chat_id) if str(chat_id).lstrip('-').isdigit() else 0,
+                'type': 'private',
+            },
+            'from': self.build_bot_user(bot),
+        }
+
+        text = getattr(method, 'text', None)
+        caption = getattr(method, 'caption', None)
+        if isinstance(text, str):
+            message['text'] = text
+        if isinstance(caption, str):
+            message['caption'] = caption
+
+        if getattr(method, 'sticker', None) is not None:
+            message['sticker'] = {
+                **self.build_file(),
+                'type': 'regular',
+                'width': 512,
+                'height': 512,
+                'is_animated': False,
+                'is_video': False,
+            }
+        for field in MEDIA_FIELDS:
+            if getattr(method, field, None) is not None:
+                message[field] = [self.build_file(width=1280, height=720)] if field == 'photo' else {
+                    **self.build_file(),
+                    **({'duration': 1} if field in ('video', 'audio', 'voice', 'animation', 'video_note') else {}),
+                    **({'width': 1280, 'height': 720} if field in ('video', 'animation') else {}),
+                    **({'length': 240} if field == 'video_note' else {}),
+                }
+
+        return message
+
+    def build_file(self, **kwargs) -> dict:
+        file_id = f'file-{next(self.message_ids)}'
+        return {
+            'file_id': file_id,
+            'file_unique_id': file_id,
+            'file_size': self.file_size,
+            **kwargs,
+        }
+
+    @staticmethod
+    def build_bot_user(bot: Bot) -> dict:
+        return {
+            'id': bot.id,
+            'is_bot': True,
+            'first_name': 'Benchmark',
+            'username': 'benchmark_bot',
+        }
@@ -0,0 +1,106 @@
+import copy
+
+from bot.config import config
+from bot.database.models.cart import Cart
+from bot.database.models.chat import Chat
+from bot.database.models.common import Currency, Quota
+from bot.database.models.product import Product, ProductCategory, ProductType
+from bot.database.models.role import Role
+from bot.database.models.subscription import SUBSCRIPTION_FREE_LIMITS
+from bot.database.models.user import User
+from bot.locales.types import LanguageCode
+from benchmarks.fakes.firestore import FakeFirestore
+from benchmarks.fakes.storage import FakeStorage
+
+FIRST_USER_ID = 100_000
+
+BLOBS = (
+    'payments/shop.png',
+    *(f'payments/subscriptions_{language_code}.png' for language_code in LanguageCode),
+    *(f'payments/packages_{language_code}.png' for language_code in LanguageCode),
+)
+
+
+def get_user_id(index: int) -> int:
+    return FIRST_USER_ID + index
+
+
+def write(db: FakeFirestore, collection_name: str, id: str, data: dict):
+    # seeding goes straight to the store, so it shows up in neither the timings nor the operation counts
+    db.documents(collection_name)[id] = copy.deepcopy(data)
+
+
+def seed(db: FakeFirestore, storage: FakeStorage, users: int):
+    write(db, Role.COLLECTION_NAME, config.DEFAULT_ROLE_ID.get_secret_value(), Role(
+        id=config.DEFAULT_ROLE_ID.get_secret_value(),
+        translated_names={LanguageCode.EN: 'Personal Assistant'},
+        translated_descriptions={LanguageCode.EN: 'A helpful assistant'},
+        translated_instructions={LanguageCode.EN: 'You are a helpful assistant'},
+        photo='',
+    ).to_dict())
+
+    for order, quota in enumerate(SUBSCRIPTION_FREE_LIMITS):
+        product_id = f'package-{quota}'
+        write(db, Product.COLLECTION_NAME, product_id, Product(
+            id=product_id,
+            stripe_id=product_id,
+            is_active=True,
+            type=ProductType.PACKAGE,
+            category=ProductCategory.TEXT,
+            names={LanguageCode.EN: quota},
+            descriptions={LanguageCode.EN: quota},
+            prices={Currency.RUB: 10, Currency.USD: 0.1, Currency.XTR: 5},
+            order=order,
+            details={'quota': quota},
+        ).to_dict())
+    for order, category in enumerate((ProductCategory.MONTHLY, ProductCategory.YEARLY)):
+        for level in ('mini', 'standard', 'vip'):
+            product_id = f'subscription-{category}-{level}'
+            write(db, Product.COLLECTION_NAME, product_id, Product(
+                id=product_id,
+                stripe_id=product_id,
+                is_active=True,
+                type=ProductType.SUBSCRIPTION,
+                category=category,
+                names={language_code: level.title() for language_code in LanguageCode},
+                descriptions={language_code: level.title() for language_code in LanguageCode},
+                prices={Currency.RUB: 990, Currency.USD: 9.99, Currency.XTR: 500},
+                order=order,
+                details={'has_trial': level == 'standard', 'limits': SUBSCRIPTION_FREE_LIMITS},
+            ).to_dict())
+
+    # generous limits keep every synthetic request past the quota and rate limit checks
+    daily_limits = {
+        quota: True if isinstance(limit, bool) else 1_000_000 for quota, limit in SUBSCRIPTION_FREE_LIMITS.items()
+    }
+    daily_limits[Quota.FAST_MESSAGES] = True
+    daily_limits[Quota.WORK_WITH_FILES] = True
+
+    for index in range(users):
+        user_id = str(get_user_id(index))
+        chat_id = f'chat-{user_id}'
+        write(db, Chat.COLLECTION_NAME, chat_id, Chat(
+            id=chat_id,
+            user_id=user_id,
+            telegram_chat_id=user_id,
+            title='Benchmark',
+        ).to_dict())
+        write(db, Cart.COLLECTION_NAME, user_id, Cart(
+            id=user_id,
+            user_id=user_id,
+            items=[],
+        ).to_dict())
+        write(db, User.COLLECTION_NAME, user_id, User(
+            id=user_id,
+            first_name='Benchmark',
+            last_name='User',
+            username=f'user{user_id}',
+            current_chat_id=chat_id,
+            telegram_chat_id=user_id,
+            stripe_id=f'cus_{user_id}',
+            currency=Currency.USD,
+            daily_limits=dict(daily_limits),
+        ).to_dict())
+
+    for blob in BLOBS:
+        storage.blobs[blob] = b'\0' * 1024
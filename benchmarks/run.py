@@ -0,0 +1,230 @@
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+
+from benchmarks.environment import prepare_environment
+
+prepare_environment()
+
+from aiogram.types import Update  # noqa: E402
+
+import main  # noqa: E402
+from bot.config import config  # noqa: E402
+from bot.database.cache import cache  # noqa: E402
+from bot.database.main import firebase  # noqa: E402
+from bot.utils import metrics  # noqa: E402
+from bot.utils.update_executor import update_executor  # noqa: E402
+from benchmarks.counters import current_operations, instrument_redis  # noqa: E402
+from benchmarks.fakes.firestore import FakeFirestore  # noqa: E402
+from benchmarks.fakes.providers import FakeProvider, install_fake_providers  # noqa: E402
+from benchmarks.fakes.storage import FakeStorage  # noqa: E402
+from benchmarks.fakes.telegram import FakeTelegramSession  # noqa: E402
+from benchmarks.fixtures import seed  # noqa: E402
+from benchmarks.updates import generate_updates, parse_mix  # noqa: E402
+
+OPERATIONS = (
+    'firestore_reads',
+    'firestore_queries',
+    'firestore_commits',
+    'firestore_writes',
+    'firestore_documents',
+    'storage_operations',
+    'redis_round_trips',
+    'telegram_requests',
+    'provider_requests',
+)
+
+
+class ErrorCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord):
+        self.count += 1
+
+
+def get_percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[int(percentile) - 1]
+
+
+def build_report(kinds: dict[int, str], results: dict[int, dict], seconds: float, errors: int) -> dict:
+    by_kind = defaultdict(list)
+    for update_id, result in results.items():
+        by_kind[kinds[update_id]].append(result)
+
+    def summarize(items: list[dict]) -> dict:
+        latencies = [item['latency'] * 1000 for item in items]
+        handling = [item['handling'] * 1000 for item in items]
+        operations = sum((item['operations'] for item in items), Counter())
+        return {
+            'updates': len(items),
+            'latency_p50_ms': round(get_percentile(latencies, 50), 2),
+            'latency_p99_ms': round(get_percentile(latencies, 99), 2),
+            'handling_p50_ms': round(get_percentile(handling, 50), 2),
+            'handling_p99_ms': round(get_percentile(handling, 99), 2),
+            'operations_per_update': {
+                name: round(operations[name] / len(items), 2) for name in OPERATIONS
+            },
+        }
+
+    return {
+        'updates': len(results),
+        'errors': errors,
+        'seconds': round(seconds, 3),
+        'updates_per_second': round(len(results) / seconds, 2) if seconds else 0.0,
+        'total': summarize(list(results.values())),
+        'kinds': {kind: summarize(items) for kind, items in sorted(by_kind.items())},
+        'update_executor': update_executor.get_stats(),
+    }
+
+
+def print_report(report: dict):
+    print(f'{report["updates"]} updates in {report["seconds"]}s: {report["updates_per_second"]} updates/s, '
+          f'{report["errors"]} errors')
+
+    header = ['kind', 'updates', 'p50 ms', 'p99 ms', 'handler p50', 'handler p99', *OPERATIONS]
+    rows = [header]
+    for kind, summary in [*report['kinds'].items(), ('total', report['total'])]:
+        rows.append([
+            kind,
+            str(summary['updates']),
+            str(summary['latency_p50_ms']),
+            str(summary['latency_p99_ms']),
+            str(summary['handling_p50_ms']),
+            str(summary['handling_p99_ms']),
+            *(str(summary['operations_per_update'][name]) for name in OPERATIONS),
+        ])
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    for row in rows:
+        print('  '.join(value.rjust(width) for value, width in zip(row, widths)))
+
+
+async def run(args: argparse.Namespace) -> dict:
+    if args.redis_url:
+        from redis.asyncio import Redis
+
+        redis = Redis.from_url(args.redis_url)
+    else:
+        import fakeredis
+
+        redis = fakeredis.FakeAsyncRedis()
+    metrics.instrument_redis(redis)
+    instrument_redis(redis)
+    cache.redis = redis
+    main.storage.redis = redis
+
+    db = FakeFirestore(args.firestore_latency)
+    storage = FakeStorage(args.storage_latency)
+    seed(db, storage, args.users)
+
+    async def init_firebase():
+        firebase.db = db
+        firebase.storage = storage
+        firebase.bucket = storage.get_bucket(config.STORAGE_NAME.get_secret_value())
+
+    firebase.init = init_firebase
+    main.bot.session = FakeTelegramSession(args.telegram_latency)
+    install_fake_providers(FakeProvider(args.provider_latency, args.provider_chunks, args.provider_chunk_interval))
+
+    config.UPDATE_EXECUTOR_WORKERS = args.workers
+    config.UPDATE_EXECUTOR_MAX_PENDING = max(config.UPDATE_EXECUTOR_MAX_PENDING, args.workers)
+
+    generated = generate_updates(parse_mix(args.mix), args.updates, args.users, args.seed)
+    kinds = {payload['update_id']: kind for kind, payload in generated}
+    submitted_at: dict[int, float] = {}
+    results: dict[int, dict] = {}
+    finished = asyncio.Event()
+
+    async def measure(update: Update):
+        operations = Counter()
+        current_operations.set(operations)
+        started_at = time.monotonic()
+        try:
+            await main.handle_update(update)
+        finally:
+            finished_at = time.monotonic()
+            results[update.update_id] = {
+                'latency': finished_at - submitted_at[update.update_id],
+                'handling': finished_at - started_at,
+                'operations': operations,
+            }
+            if len(results) == len(generated):
+                finished.set()
+
+    errors = ErrorCounter()
+    logging.getLogger().addHandler(errors)
+
+    async with main.lifespan(main.app):
+        # the executor keeps its worker limits and per-user ordering, only the update handler is wrapped
+        await update_executor.init(measure)
+
+        started_at = time.monotonic()
+        interval = 1 / args.rate if args.rate else 0
+        for i, (_, payload) in enumerate(generated):
+            if interval:
+                await asyncio.sleep(max(0.0, started_at + i * interval - time.monotonic()))
+
+            update = Update.model_validate(payload, context={'bot': main.bot})
+            submitted_at[update.update_id] = time.monotonic()
+            while not update_executor.submit(update):
+                await asyncio.sleep(0.01)
+                submitted_at[update.update_id] = time.monotonic()
+
+        await finished.wait()
+        seconds = time.monotonic() - started_at
+
+    logging.getLogger().removeHandler(errors)
+
+    return build_report(kinds, results, seconds, errors.count)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Replay synthetic updates through handle_update against in-memory fakes')
+    parser.add_argument('--updates', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--mix', default='text=5,photo=2,callback=2,payment=1',
+                        help='comma separated kind=weight, kinds: text, photo, callback, payment')
+    parser.add_argument('--rate', type=float, default=0, help='updates per second, 0 submits them all at once')
+    parser.add_argument('--workers', type=int, default=config.UPDATE_EXECUTOR_WORKERS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--firestore-latency', type=float, default=0.01)
+    parser.add_argument('--storage-latency', type=float, default=0.03)
+    parser.add_argument('--telegram-latency', type=float, default=0.05)
+    parser.add_argument('--provider-latency', type=float, default=0.5)
+    parser.add_argument('--provider-chunks', type=int, default=20)
+    parser.add_argument('--provider-chunk-interval', type=float, default=0.02)
+    parser.add_argument('--redis-url', help='use this redis instead of fakeredis, keys are not cleaned up')
+    parser.add_argument('--json', help='also write the report to this file')
+    parser.add_argument('--log-level', default='ERROR')
+    return parser.parse_args()
+
+
+def main_cli():
+    args = parse_arguments()
+    logging.basicConfig(level=min(logging.getLevelName(args.log_level), logging.ERROR))
+    # errors are always counted, the log level only decides what is printed
+    logging.getLogger().handlers[0].setLevel(args.log_level)
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    # a regression gate should not pass on a run where updates failed
+    sys.exit(1 if report['errors'] else 0)
+
+
+if __name__ == '__main__':
+    main_cli()
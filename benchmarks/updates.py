@@ -0,0 +1,130 @@
+import itertools
+import random
+import time
+from typing import Callable
+
+from bot.database.models.common import Model, PaymentType
+from benchmarks.fixtures import get_user_id
+
+UpdateBuilder = Callable[[int, int], dict]
+
+# update ids start from the clock, so the dedupe keys of an earlier run against the same redis never match
+update_ids = itertools.count(int(time.time() * 1000))
+message_ids = itertools.count(1)
+callback_query_ids = itertools.count(1)
+
+
+def build_user(user_id: int) -> dict:
+    return {
+        'id': user_id,
+        'is_bot': False,
+        'first_name': 'Benchmark',
+        'last_name': 'User',
+        'username': f'user{user_id}',
+        'language_code': 'en',
+    }
+
+
+def build_message(user_id: int, **kwargs) -> dict:
+    return {
+        'message_id': next(message_ids),
+        'date': int(time.time()),
+        'chat': {
+            'id': user_id,
+            'type': 'private',
+            'first_name': 'Benchmark',
+        },
+        'from': build_user(user_id),
+        **kwargs,
+    }
+
+
+def build_callback_query(user_id: int, data: str) -> dict:
+    return {
+        'id': str(next(callback_query_ids)),
+        'from': build_user(user_id),
+        'chat_instance': str(user_id),
+        'data': data,
+        'message': build_message(user_id, text='Benchmark', **{'from': {
+            'id': 1,
+            'is_bot': True,
+            'first_name': 'Benchmark',
+        }}),
+    }
+
+
+def build_text_update(user_id: int, update_id: int) -> dict:
+    return {
+        'update_id': update_id,
+        'message': build_message(user_id, text='Explain how a hash map works in two sentences'),
+    }
+
+
+def build_photo_update(user_id: int, update_id: int) -> dict:
+    file_id = f'photo-{update_id}'
+    return {
+        'update_id': update_id,
+        'message': build_message(
+            user_id,
+            caption='What is on this picture?',
+            photo=[{
+                'file_id': file_id,
+                'file_unique_id': file_id,
+                'width': 1280,
+                'height': 720,
+                'file_size': 64 * 1024,
+            }],
+        ),
+    }
+
+
+def build_callback_update(user_id: int, update_id: int) -> dict:
+    return {
+        'update_id': update_id,
+        'callback_query': build_callback_query(user_id, f'settings_choose_text_model:{Model.CHAT_GPT}'),
+    }
+
+
+def build_payment_update(user_id: int, update_id: int) -> dict:
+    if update_id % 2:
+        return {
+            'update_id': update_id,
+            'message': build_message(
+                user_id,
+                text='/buy',
+                entities=[{'type': 'bot_command', 'offset': 0, 'length': 4}],
+            ),
+        }
+
+    return {
+        'update_id': update_id,
+        'callback_query': build_callback_query(user_id, f'buy:{PaymentType.SUBSCRIPTION}'),
+    }
+
+
+UPDATE_BUILDERS: dict[str, UpdateBuilder] = {
+    'text': build_text_update,
+    'photo': build_photo_update,
+    'callback': build_callback_update,
+    'payment': build_payment_update,
+}
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    weights = {}
+    for part in mix.split(','):
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        if kind not in UPDATE_BUILDERS:
+            raise ValueError(f'Unknown update kind: {kind}, expected one of {", ".join(UPDATE_BUILDERS)}')
+        weights[kind] = float(weight or 1)
+    return weights
+
+
+def generate_updates(mix: dict[str, float], count: int, users: int, seed: int) -> list[tuple[str, dict]]:
+    generator = random.Random(seed)
+    kinds = generator.choices(list(mix), weights=list(mix.values()), k=count)
+    return [
+        (kind, UPDATE_BUILDERS[kind](get_user_id(generator.randrange(users)), next(update_ids)))
+        for kind in kinds
+    ]
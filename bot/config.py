@@ -52,6 +52,36 @@ class Settings(BaseSettings):
     LIMIT_BETWEEN_REQUESTS_SECONDS: int = 20
     LIMIT_PROCESSING_SECONDS: int = 60
 
+    USER_CACHE_TTL_SECONDS: int = 5
+    USER_CACHE_MAX_SIZE: int = 10000
+    CATALOG_CACHE_TTL_SECONDS: int = 3600
+    CATALOG_CACHE_LOCAL_TTL_SECONDS: int = 60
+    CATALOG_CACHE_MAX_SIZE: int = 1000
+    KEYBOARD_CACHE_MAX_SIZE: int = 5000
+    STREAM_EDIT_INTERVAL_SECONDS: float = 1.5
+    LEDGER_FLUSH_INTERVAL_SECONDS: int = 5
+    DAILY_LIMITS_CONCURRENCY: int = 50
+    DAILY_LIMITS_BILLING_CONCURRENCY: int = 5
+    TELEGRAM_MESSAGES_PER_SECOND: int = 25
+    TELEGRAM_CHAT_MESSAGE_INTERVAL_SECONDS: float = 1.0
+    BROADCAST_RESUME_INTERVAL_SECONDS: int = 60
+    POLL_SCHEDULER_INTERVAL_SECONDS: int = 5
+    HTTP_CONNECTIONS_PER_HOST: int = 100
+    HTTP_KEEPALIVE_SECONDS: int = 60
+    HTTP_DNS_CACHE_SECONDS: int = 300
+    VISION_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    VISION_CACHE_REDIS_TTL_SECONDS: int = 0
+    UPDATE_EXECUTOR_WORKERS: int = 500
+    UPDATE_EXECUTOR_MAX_PENDING: int = 5000
+    UPDATE_EXECUTOR_USER_SERIAL_SECONDS: float = 10.0
+    UPDATE_EXECUTOR_SHUTDOWN_SECONDS: int = 30
+    UPDATE_DEDUPE_TTL_SECONDS: int = 24 * 60 * 60
+    ALBUM_IDLE_SECONDS: float = 0.5
+    OUTBOX_INTERVAL_SECONDS: int = 5
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    UPDATE_FIRESTORE_BUDGET: int = 10
+    UPDATE_ACCOUNTING_SAMPLE_RATE: float = 0.01
+
     SUPER_ADMIN_ID: str = '354543567'
     ADMIN_IDS: list[str] = field(default_factory=lambda: ['354543567', '6078317830'])
     DEVELOPER_IDS: list[str] = field(default_factory=lambda: ['354543567', '1384055865', '2048756506'])
@@ -0,0 +1,62 @@
+import logging
+import pickle
+from typing import Any, Awaitable, Callable
+
+from cachetools import TTLCache
+from redis.asyncio import Redis
+from redis.backoff import FullJitterBackoff
+from redis.exceptions import RedisError
+from redis.retry import Retry
+
+from bot.config import config
+from bot.utils.metrics import instrument_redis
+
+
+class Cache:
+    redis: Redis
+    local: TTLCache
+
+    def __init__(self):
+        self.redis = Redis.from_url(
+            config.REDIS_URL,
+            socket_keepalive=True,
+            health_check_interval=30,
+            retry_on_timeout=True,
+            retry=Retry(FullJitterBackoff(cap=5, base=1), 5),
+        )
+        instrument_redis(self.redis)
+        self.local = TTLCache(maxsize=config.CATALOG_CACHE_MAX_SIZE, ttl=config.CATALOG_CACHE_LOCAL_TTL_SECONDS)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        payload = self.local.get(key)
+        if payload is None:
+            try:
+                payload = await self.redis.get(key)
+            except RedisError as e:
+                logging.warning(f'Cache get failed for {key}: {e}')
+
+            if payload is None:
+                payload = pickle.dumps(await loader())
+                try:
+                    await self.redis.set(key, payload, ex=config.CATALOG_CACHE_TTL_SECONDS)
+                except RedisError as e:
+                    logging.warning(f'Cache set failed for {key}: {e}')
+
+            self.local[key] = payload
+
+        # every caller gets its own copy, so cached models can be mutated safely
+        return pickle.loads(payload)
+
+    async def invalidate(self, prefix: str):
+        for key in [key for key in self.local.keys() if key.startswith(prefix)]:
+            self.local.pop(key, None)
+
+        try:
+            keys = [key async for key in self.redis.scan_iter(match=f'{prefix}*', count=config.BATCH_SIZE)]
+            if keys:
+                await self.redis.delete(*keys)
+        except RedisError as e:
+            logging.warning(f'Cache invalidation failed for {prefix}: {e}')
+
+
+cache = Cache()
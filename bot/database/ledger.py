@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import pickle
+from typing import Optional
+
+from google.api_core.exceptions import InvalidArgument
+from redis.exceptions import RedisError
+
+from bot.config import config
+from bot.database.cache import cache
+from bot.database.main import firebase
+from bot.database.models.transaction import Transaction
+from bot.utils.lease import Lease
+
+# a row that fails with one of these is rejected by every retry, the rest are worth retrying
+REJECTED_ROW_ERRORS = (InvalidArgument, TypeError, ValueError)
+
+
+class Ledger:
+    KEY = 'ledger:transactions'
+    PROCESSING_KEY = 'ledger:transactions:processing'
+    DEAD_KEY = 'ledger:transactions:dead'
+    LOCK_KEY = 'ledger:lock'
+    LOCK_SECONDS = 60
+    LOCK_RETRY_SECONDS = 0.5
+
+    flush_event: asyncio.Event
+    flush_task: Optional[asyncio.Task]
+    pending_count: int
+
+    def __init__(self):
+        self.flush_event = asyncio.Event()
+        self.flush_task = None
+        self.pending_count = 0
+
+    async def init(self):
+        # rows left in redis by a previous process are flushed on the first tick
+        self.flush_task = asyncio.create_task(self.run())
+
+    async def close(self):
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+
+        await self.drain()
+
+    async def enqueue(self, transaction: Transaction):
+        try:
+            await cache.redis.rpush(self.KEY, pickle.dumps(transaction))
+        except RedisError as e:
+            logging.warning(f'Ledger enqueue failed, writing transaction {transaction.id} directly: {e}')
+            await firebase.db.collection(Transaction.COLLECTION_NAME).document(transaction.id).set(
+                transaction.to_dict(),
+            )
+            return
+
+        self.pending_count += 1
+        if self.pending_count >= config.BATCH_SIZE:
+            self.flush_event.set()
+
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.flush_event.wait(), timeout=config.LEDGER_FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self.flush_event.clear()
+            self.pending_count = 0
+
+            try:
+                await self.drain()
+            except Exception as e:
+                logging.exception(f'Ledger flush failed: {e}')
+
+    async def drain(self, wait=False):
+        # one flusher owns the processing list at a time, so rows moved by a flusher that died are committed by the next
+        # with wait, it only returns once it emptied both lists itself, for readers that need every buffered row
+        while True:
+            lease = Lease(self.LOCK_KEY, self.LOCK_SECONDS)
+            if await lease.acquire():
+                try:
+                    while lease.is_held and await self.flush():
+                        pass
+                    if lease.is_held:
+                        return
+                finally:
+                    await lease.release()
+
+            if not wait:
+                return
+            await asyncio.sleep(self.LOCK_RETRY_SECONDS)
+
+    async def flush(self) -> int:
+        payloads = await cache.redis.lrange(self.PROCESSING_KEY, 0, -1)
+        if not payloads:
+            # rows are moved rather than popped, so they stay in redis until firestore has them
+            async with cache.redis.pipeline(transaction=True) as pipeline:
+                for _ in range(config.BATCH_SIZE):
+                    pipeline.lmove(self.KEY, self.PROCESSING_KEY, 'LEFT', 'RIGHT')
+                payloads = [payload for payload in await pipeline.execute() if payload is not None]
+            if not payloads:
+                return 0
+
+        rows = []
+        for payload in payloads:
+            try:
+                rows.append((payload, pickle.loads(payload)))
+            except Exception as e:
+                logging.exception(f'Ledger row is corrupt, moving it to {self.DEAD_KEY}: {e}')
+                await self.reject(payload)
+
+        try:
+            batch = firebase.db.batch()
+            for _, transaction in rows:
+                batch.set(
+                    firebase.db.collection(Transaction.COLLECTION_NAME).document(transaction.id),
+                    transaction.to_dict(),
+                )
+            await batch.commit()
+        except REJECTED_ROW_ERRORS:
+            # ids are assigned up front, so rewriting the rows of a failed batch one by one is idempotent
+            await self.commit_rows(rows)
+
+        await cache.redis.delete(self.PROCESSING_KEY)
+        return len(payloads)
+
+    async def commit_rows(self, rows: list[tuple[bytes, Transaction]]):
+        for payload, transaction in rows:
+            try:
+                await firebase.db.collection(Transaction.COLLECTION_NAME).document(transaction.id).set(
+                    transaction.to_dict(),
+                )
+            except REJECTED_ROW_ERRORS as e:
+                logging.exception(f'Ledger row {transaction.id} was rejected, moving it to {self.DEAD_KEY}: {e}')
+                await self.reject(payload)
+
+    async def reject(self, payload: bytes):
+        async with cache.redis.pipeline(transaction=True) as pipeline:
+            pipeline.rpush(self.DEAD_KEY, payload)
+            pipeline.lrem(self.PROCESSING_KEY, 1, payload)
+            await pipeline.execute()
+
+
+ledger = Ledger()
@@ -9,6 +9,7 @@ from google.cloud.firestore_v1 import AsyncClient
 from gcloud.aio.storage import Storage, Bucket
 
 from bot.config import config
+from bot.utils.metrics import instrument_firestore, instrument_storage
 
 
 class Firebase:
@@ -36,6 +37,9 @@ class Firebase:
         self.bucket = self.storage.get_bucket(config.STORAGE_NAME.get_secret_value())
         self.auth = auth
 
+        instrument_firestore(self.db._firestore_api)
+        instrument_storage(self.storage)
+
     async def close(self):
         if self.db:
             self.db.close()
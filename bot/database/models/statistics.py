@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class DailyStatistics:
+    COLLECTION_NAME = 'daily_statistics'
+
+    id: str
+    date: datetime
+    count_active_users: Optional[int]
+    count_paid_users: int
+    count_users: dict[str, int]
+    transactions: dict[str, dict]
+    count_incomes: int
+    incomes: dict[str, dict]
+    expenses: dict[str, dict]
+    user_expenses: dict[str, dict]
+    created_at: datetime
+    edited_at: datetime
+
+    def __init__(
+        self,
+        id: str,
+        date: datetime,
+        count_active_users=None,
+        count_paid_users=0,
+        count_users=None,
+        transactions=None,
+        count_incomes=0,
+        incomes=None,
+        expenses=None,
+        user_expenses=None,
+        created_at=None,
+        edited_at=None,
+        **kwargs,
+    ):
+        self.id = id
+        self.date = date
+        self.count_active_users = count_active_users
+        self.count_paid_users = count_paid_users
+        self.count_users = {} if count_users is None else count_users
+        self.transactions = {} if transactions is None else transactions
+        self.count_incomes = count_incomes
+        self.incomes = {} if incomes is None else incomes
+        self.expenses = {} if expenses is None else expenses
+        self.user_expenses = {} if user_expenses is None else user_expenses
+
+        current_time = datetime.now(timezone.utc)
+        self.created_at = created_at if created_at is not None else current_time
+        self.edited_at = edited_at if edited_at is not None else current_time
+
+    def to_dict(self):
+        return vars(self)
@@ -94,6 +94,7 @@ class User:
     balance: int
     subscription_id: Optional[str]
     last_subscription_limit_update: datetime
+    last_usage_at: Optional[datetime]
     had_subscription: bool
     daily_limits: dict
     additional_usage_quota: dict
@@ -346,6 +347,7 @@ class User:
         balance=0,
         subscription_id='',
         last_subscription_limit_update=None,
+        last_usage_at=None,
         had_subscription=False,
         daily_limits=None,
         additional_usage_quota=None,
@@ -385,6 +387,7 @@ class User:
         current_time = datetime.now(timezone.utc)
         self.last_subscription_limit_update = last_subscription_limit_update \
             if last_subscription_limit_update is not None else current_time
+        self.last_usage_at = last_usage_at
         self.created_at = created_at if created_at is not None else current_time
         self.edited_at = edited_at if edited_at is not None else current_time
 
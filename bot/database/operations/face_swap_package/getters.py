@@ -3,6 +3,7 @@ from typing import Optional
 
 from google.cloud.firestore_v1 import FieldFilter, Query
 
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.face_swap_package import FaceSwapPackage, FaceSwapPackageStatus, UsedFaceSwapPackage
 from bot.database.models.user import UserGender
@@ -53,19 +54,36 @@ async def get_face_swap_packages_by_gender(
     end_date: Optional[datetime] = None,
     status: Optional[FaceSwapPackageStatus] = None
 ) -> list[FaceSwapPackage]:
-    face_swap_packages_query = firebase.db.collection(FaceSwapPackage.COLLECTION_NAME) \
-        .where(filter=FieldFilter('gender', '==', gender))
-
-    if start_date:
-        face_swap_packages_query = face_swap_packages_query.where(filter=FieldFilter('created_at', '>=', start_date))
-    if end_date:
-        face_swap_packages_query = face_swap_packages_query.where(filter=FieldFilter('created_at', '<=', end_date))
-    if status:
-        face_swap_packages_query = face_swap_packages_query.where(filter=FieldFilter('status', '==', status))
+    async def load_face_swap_packages():
+        face_swap_packages_query = firebase.db.collection(FaceSwapPackage.COLLECTION_NAME) \
+            .where(filter=FieldFilter('gender', '==', gender))
+
+        if start_date:
+            face_swap_packages_query = face_swap_packages_query.where(
+                filter=FieldFilter('created_at', '>=', start_date)
+            )
+        if end_date:
+            face_swap_packages_query = face_swap_packages_query.where(
+                filter=FieldFilter('created_at', '<=', end_date)
+            )
+        if status:
+            face_swap_packages_query = face_swap_packages_query.where(filter=FieldFilter('status', '==', status))
+
+        face_swap_packages = face_swap_packages_query.order_by('created_at', direction=Query.ASCENDING).stream()
+        return [
+            face_swap_package.to_dict() async for face_swap_package in face_swap_packages
+        ]
+
+    if start_date or end_date:
+        face_swap_packages_data = await load_face_swap_packages()
+    else:
+        face_swap_packages_data = await cache.get_or_load(
+            f'catalog:{FaceSwapPackage.COLLECTION_NAME}:{gender}:{status or "ALL"}',
+            load_face_swap_packages,
+        )
 
-    face_swap_packages = face_swap_packages_query.order_by('created_at', direction=Query.ASCENDING).stream()
     return [
-        FaceSwapPackage(**face_swap_package.to_dict()) async for face_swap_package in face_swap_packages
+        FaceSwapPackage(**face_swap_package_data) for face_swap_package_data in face_swap_packages_data
     ]
 
 
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.face_swap_package import FaceSwapPackage, UsedFaceSwapPackage
 
@@ -11,6 +12,8 @@ async def update_face_swap_package(face_swap_package_id: str, data: dict):
 
     await face_swap_package_ref.update(data)
 
+    await cache.invalidate(f'catalog:{FaceSwapPackage.COLLECTION_NAME}:')
+
 
 async def update_used_face_swap_package(used_face_swap_package_id: str, data: dict):
     used_face_swap_package_ref = firebase.db.collection(UsedFaceSwapPackage.COLLECTION_NAME) \
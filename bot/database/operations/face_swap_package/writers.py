@@ -1,3 +1,4 @@
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.face_swap_package import (
     FaceSwapPackage,
@@ -24,6 +25,8 @@ async def write_face_swap_package(
         face_swap_package.to_dict()
     )
 
+    await cache.invalidate(f'catalog:{FaceSwapPackage.COLLECTION_NAME}:')
+
     return face_swap_package
 
 
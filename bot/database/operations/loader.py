@@ -0,0 +1,37 @@
+from typing import Generic, Iterable, Optional, TypeVar
+
+from bot.config import config
+from bot.database.main import firebase
+
+Model = TypeVar('Model')
+
+
+class Loader(Generic[Model]):
+    model: type[Model]
+    items: dict[str, Optional[Model]]
+
+    def __init__(self, model: type[Model]):
+        self.model = model
+        self.items = {}
+
+    async def load_many(self, ids: Iterable[str]) -> dict[str, Optional[Model]]:
+        ids = {str(id) for id in ids if id}
+
+        missing_ids = [id for id in ids if id not in self.items]
+        for i in range(0, len(missing_ids), config.BATCH_SIZE):
+            chunk_ids = missing_ids[i:i + config.BATCH_SIZE]
+            for id in chunk_ids:
+                self.items[id] = None
+
+            refs = [firebase.db.collection(self.model.COLLECTION_NAME).document(id) for id in chunk_ids]
+            async for doc in firebase.db.get_all(refs):
+                if doc.exists:
+                    self.items[doc.id] = self.model(**doc.to_dict())
+
+        return {id: self.items[id] for id in ids}
+
+    async def load(self, id: str) -> Optional[Model]:
+        if not id:
+            return None
+
+        return (await self.load_many([id])).get(str(id))
@@ -3,29 +3,48 @@ from typing import Optional
 
 from google.cloud.firestore_v1 import FieldFilter, Query
 
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.common import Quota
 from bot.database.models.product import Product, ProductType, ProductCategory
 
 
 async def get_product(product_id: str) -> Optional[Product]:
-    product_ref = firebase.db.collection(Product.COLLECTION_NAME).document(str(product_id))
-    product = await product_ref.get()
+    async def load_product():
+        product_ref = firebase.db.collection(Product.COLLECTION_NAME).document(str(product_id))
+        product = await product_ref.get()
 
-    if product.exists:
-        return Product(**product.to_dict())
+        if product.exists:
+            return product.to_dict()
+
+    product_data = await cache.get_or_load(f'catalog:{Product.COLLECTION_NAME}:{product_id}', load_product)
+    if product_data:
+        return Product(**product_data)
+
+
+async def get_product_id_by_quota(
+    quota: Quota,
+) -> Optional[str]:
+    async def load_quota_index():
+        product_stream = firebase.db.collection(Product.COLLECTION_NAME).stream()
+
+        quota_index = {}
+        async for product in product_stream:
+            product_quota = (product.to_dict().get('details') or {}).get('quota')
+            if product_quota:
+                quota_index.setdefault(product_quota, product.id)
+        return quota_index
+
+    quota_index = await cache.get_or_load(f'catalog:{Product.COLLECTION_NAME}:quota_index', load_quota_index)
+    return quota_index.get(quota)
 
 
 async def get_product_by_quota(
     quota: Quota,
 ) -> Optional[Product]:
-    product_stream = firebase.db.collection(Product.COLLECTION_NAME) \
-        .where(filter=FieldFilter('details.quota', '==', quota)) \
-        .limit(1) \
-        .stream()
-
-    async for product in product_stream:
-        return Product(**product.to_dict())
+    product_id = await get_product_id_by_quota(quota)
+    if product_id:
+        return await get_product(product_id)
 
 
 async def get_active_products_by_product_type_and_category(
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.product import Product
 
@@ -10,3 +11,5 @@ async def update_product(product_id: str, data: dict):
 
     await product_ref.update(data)
 
+    await cache.invalidate(f'catalog:{Product.COLLECTION_NAME}:')
+
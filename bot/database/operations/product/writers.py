@@ -1,3 +1,4 @@
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.product import ProductType, Product, ProductCategory
 from bot.database.operations.product.helpers import create_product_object
@@ -32,4 +33,6 @@ async def write_product(
     )
     await firebase.db.collection(Product.COLLECTION_NAME).document(product.id).set(product.to_dict())
 
+    await cache.invalidate(f'catalog:{Product.COLLECTION_NAME}:')
+
     return product
@@ -2,17 +2,23 @@ from typing import Optional
 
 from google.cloud.firestore_v1 import FieldFilter, Query
 
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.common import ModelType
 from bot.database.models.prompt import Prompt, PromptCategory, PromptSubCategory
 
 
 async def get_prompt(prompt_id: str) -> Optional[Prompt]:
-    prompt_ref = firebase.db.collection(Prompt.COLLECTION_NAME).document(str(prompt_id))
-    prompt = await prompt_ref.get()
+    async def load_prompt():
+        prompt_ref = firebase.db.collection(Prompt.COLLECTION_NAME).document(str(prompt_id))
+        prompt = await prompt_ref.get()
 
-    if prompt.exists:
-        return Prompt(**prompt.to_dict())
+        if prompt.exists:
+            return prompt.to_dict()
+
+    prompt_data = await cache.get_or_load(f'catalog:{Prompt.COLLECTION_NAME}:{prompt_id}', load_prompt)
+    if prompt_data:
+        return Prompt(**prompt_data)
 
 
 async def get_prompt_category(prompt_category_id: str) -> Optional[PromptCategory]:
@@ -35,13 +41,22 @@ async def get_prompt_subcategory(prompt_subcategory_id: str) -> Optional[PromptS
 async def get_prompt_categories_by_model_type(
     model_type: ModelType,
 ) -> list[PromptCategory]:
-    prompt_categories = firebase.db.collection(PromptCategory.COLLECTION_NAME) \
-        .where(filter=FieldFilter('type', '==', model_type)) \
-        .order_by('created_at', direction=Query.DESCENDING) \
-        .stream()
-
+    async def load_prompt_categories():
+        prompt_categories = firebase.db.collection(PromptCategory.COLLECTION_NAME) \
+            .where(filter=FieldFilter('type', '==', model_type)) \
+            .order_by('created_at', direction=Query.DESCENDING) \
+            .stream()
+
+        return [
+            prompt_category.to_dict() async for prompt_category in prompt_categories
+        ]
+
+    prompt_categories_data = await cache.get_or_load(
+        f'catalog:{PromptCategory.COLLECTION_NAME}:{model_type}',
+        load_prompt_categories,
+    )
     return [
-        PromptCategory(**prompt_category.to_dict()) async for prompt_category in prompt_categories
+        PromptCategory(**prompt_category_data) for prompt_category_data in prompt_categories_data
     ]
 
 
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.prompt import Prompt, PromptCategory, PromptSubCategory
 
@@ -10,6 +11,8 @@ async def update_prompt(prompt_id: str, data: dict):
 
     await prompt_ref.update(data)
 
+    await cache.invalidate(f'catalog:{Prompt.COLLECTION_NAME}:')
+
 
 async def update_prompt_category(prompt_category_id: str, data: dict):
     prompt_category_ref = firebase.db.collection(PromptCategory.COLLECTION_NAME).document(prompt_category_id)
@@ -17,6 +20,8 @@ async def update_prompt_category(prompt_category_id: str, data: dict):
 
     await prompt_category_ref.update(data)
 
+    await cache.invalidate(f'catalog:{PromptCategory.COLLECTION_NAME}:')
+
 
 async def update_prompt_subcategory(prompt_subcategory_id: str, data: dict):
     prompt_subcategory_ref = firebase.db.collection(PromptSubCategory.COLLECTION_NAME).document(prompt_subcategory_id)
@@ -1,3 +1,4 @@
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.common import ModelType
 from bot.database.models.prompt import Prompt, PromptCategory, PromptSubCategory
@@ -29,6 +30,8 @@ async def write_prompt(
         .document(prompt.id) \
         .set(prompt.to_dict())
 
+    await cache.invalidate(f'catalog:{Prompt.COLLECTION_NAME}:')
+
     return prompt
 
 
@@ -44,6 +47,8 @@ async def write_prompt_category(
         .document(prompt_category.id) \
         .set(prompt_category.to_dict())
 
+    await cache.invalidate(f'catalog:{PromptCategory.COLLECTION_NAME}:')
+
     return prompt_category
 
 
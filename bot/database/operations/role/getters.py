@@ -3,30 +3,46 @@ from typing import Optional
 
 from google.cloud.firestore_v1 import FieldFilter, Query
 
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.role import Role
 
 
 async def get_role(role_id: str) -> Optional[Role]:
-    role_ref = firebase.db.collection(Role.COLLECTION_NAME).document(role_id)
-    role = await role_ref.get()
+    async def load_role():
+        role_ref = firebase.db.collection(Role.COLLECTION_NAME).document(role_id)
+        role = await role_ref.get()
 
-    if role.exists:
-        return Role(**role.to_dict())
+        if role.exists:
+            return role.to_dict()
+
+    role_data = await cache.get_or_load(f'catalog:{Role.COLLECTION_NAME}:{role_id}', load_role)
+    if role_data:
+        return Role(**role_data)
 
 
 async def get_roles(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
 ) -> list[Role]:
-    roles_query = firebase.db.collection(Role.COLLECTION_NAME)
+    async def load_roles():
+        roles_query = firebase.db.collection(Role.COLLECTION_NAME)
+
+        if start_date:
+            roles_query = roles_query.where(filter=FieldFilter('created_at', '>=', start_date))
+        if end_date:
+            roles_query = roles_query.where(filter=FieldFilter('created_at', '<=', end_date))
+
+        roles = roles_query.order_by('created_at', direction=Query.ASCENDING).stream()
+        return [
+            role.to_dict() async for role in roles
+        ]
 
-    if start_date:
-        roles_query = roles_query.where(filter=FieldFilter('created_at', '>=', start_date))
-    if end_date:
-        roles_query = roles_query.where(filter=FieldFilter('created_at', '<=', end_date))
+    if start_date or end_date:
+        roles_data = await load_roles()
+    else:
+        roles_data = await cache.get_or_load(f'catalog:{Role.COLLECTION_NAME}:all', load_roles)
 
-    roles = roles_query.order_by('created_at', direction=Query.ASCENDING).stream()
     return [
-        Role(**role.to_dict()) async for role in roles
+        Role(**role_data) for role_data in roles_data
     ]
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.role import Role
 
@@ -9,3 +10,5 @@ async def update_role(role_id: str, data: dict):
     data['edited_at'] = datetime.now(timezone.utc)
 
     await role_ref.update(data)
+
+    await cache.invalidate(f'catalog:{Role.COLLECTION_NAME}:')
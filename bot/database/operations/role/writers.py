@@ -1,3 +1,4 @@
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.role import Role
 from bot.database.operations.role.helpers import create_role_object
@@ -13,4 +14,6 @@ async def write_role(
     role = await create_role_object(translated_names, translated_descriptions, translated_instructions, photo)
     await firebase.db.collection(Role.COLLECTION_NAME).document(role.id).set(role.to_dict())
 
+    await cache.invalidate(f'catalog:{Role.COLLECTION_NAME}:')
+
     return role
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Optional
+
+from google.cloud.firestore_v1 import FieldFilter
+
+from bot.database.cache import cache
+from bot.database.main import firebase
+from bot.database.models.statistics import DailyStatistics
+from bot.database.operations.statistics.helpers import get_active_users_key
+
+
+async def get_daily_statistics(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> list[DailyStatistics]:
+    daily_statistics_query = firebase.db.collection(DailyStatistics.COLLECTION_NAME).order_by('date')
+
+    if start_date:
+        daily_statistics_query = daily_statistics_query.where(filter=FieldFilter('date', '>=', start_date))
+    if end_date:
+        daily_statistics_query = daily_statistics_query.where(filter=FieldFilter('date', '<=', end_date))
+
+    daily_statistics = daily_statistics_query.stream()
+    return [
+        DailyStatistics(**daily_statistics_item.to_dict()) async for daily_statistics_item in daily_statistics
+    ]
+
+
+async def get_count_of_unique_users(keys: list[str]) -> int:
+    if not keys:
+        return 0
+
+    return await cache.redis.pfcount(*keys)
+
+
+async def get_days_without_users(daily_statistics: list[DailyStatistics]) -> list[DailyStatistics]:
+    # rollups written before the users were counted, or whose counters redis lost, have to be compacted again
+    days_with_users = [
+        daily_statistics_item for daily_statistics_item in daily_statistics
+        if daily_statistics_item.count_active_users
+    ]
+    async with cache.redis.pipeline(transaction=False) as pipeline:
+        for daily_statistics_item in days_with_users:
+            pipeline.exists(get_active_users_key(daily_statistics_item.id))
+        are_users_kept = await pipeline.execute()
+
+    return [
+        daily_statistics_item for daily_statistics_item in daily_statistics
+        if daily_statistics_item.count_active_users is None
+    ] + [
+        daily_statistics_item for daily_statistics_item, is_kept in zip(days_with_users, are_users_kept)
+        if not is_kept
+    ]
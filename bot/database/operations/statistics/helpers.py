@@ -0,0 +1,12 @@
+from typing import Optional
+
+
+def get_active_users_key(date_id: str, subscription_key: Optional[str] = None) -> str:
+    if subscription_key:
+        return f'statistics:users:{date_id}:{subscription_key}'
+
+    return f'statistics:users:{date_id}'
+
+
+def get_paid_users_key(date_id: str) -> str:
+    return f'statistics:paid_users:{date_id}'
@@ -0,0 +1,34 @@
+from bot.database.cache import cache
+from bot.database.main import firebase
+from bot.database.models.statistics import DailyStatistics
+from bot.database.operations.statistics.helpers import get_active_users_key, get_paid_users_key
+
+
+async def write_daily_statistics(daily_statistics: DailyStatistics) -> DailyStatistics:
+    await firebase.db.collection(DailyStatistics.COLLECTION_NAME).document(daily_statistics.id).set(
+        daily_statistics.to_dict(),
+    )
+
+    return daily_statistics
+
+
+async def write_daily_users(date_id: str, users: dict[str, str], paid_users: set[str]):
+    # a day's users are kept as hyperloglogs, so unique counts over a period cost a few kb per day in redis
+    # instead of one rollup field per user
+    users_by_subscription: dict[str, list[str]] = {}
+    for user_id, subscription_key in users.items():
+        users_by_subscription.setdefault(subscription_key, []).append(user_id)
+
+    async with cache.redis.pipeline(transaction=True) as pipeline:
+        pipeline.delete(
+            get_active_users_key(date_id),
+            get_paid_users_key(date_id),
+            *[get_active_users_key(date_id, subscription_key) for subscription_key in users_by_subscription],
+        )
+        if users:
+            pipeline.pfadd(get_active_users_key(date_id), *users)
+        if paid_users:
+            pipeline.pfadd(get_paid_users_key(date_id), *paid_users)
+        for subscription_key, user_ids in users_by_subscription.items():
+            pipeline.pfadd(get_active_users_key(date_id, subscription_key), *user_ids)
+        await pipeline.execute()
@@ -154,3 +154,21 @@ async def get_subscriptions_by_status(
     return [
         Subscription(**subscription.to_dict()) async for subscription in subscriptions
     ]
+
+
+async def get_subscriptions_by_end_date(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> list[Subscription]:
+    subscriptions_query = firebase.db.collection(Subscription.COLLECTION_NAME)
+
+    if start_date:
+        subscriptions_query = subscriptions_query.where(filter=FieldFilter('end_date', '>=', start_date))
+    if end_date:
+        subscriptions_query = subscriptions_query.where(filter=FieldFilter('end_date', '<=', end_date))
+
+    subscriptions = subscriptions_query.stream()
+
+    return [
+        Subscription(**subscription.to_dict()) async for subscription in subscriptions
+    ]
@@ -3,6 +3,7 @@ from typing import Optional
 
 from google.cloud.firestore_v1 import FieldFilter, Query
 
+from bot.config import config
 from bot.database.main import firebase
 from bot.database.models.transaction import Transaction
 
@@ -15,6 +16,47 @@ async def get_transaction(transaction_id: str) -> Optional[Transaction]:
         return Transaction(**transaction.to_dict())
 
 
+async def get_first_transaction() -> Optional[Transaction]:
+    transaction_stream = firebase.db.collection(Transaction.COLLECTION_NAME) \
+        .order_by('created_at') \
+        .limit(1) \
+        .stream()
+
+    async for transaction_doc in transaction_stream:
+        return Transaction(**transaction_doc.to_dict())
+
+
+async def get_transactions(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> list[Transaction]:
+    transactions_query = firebase.db.collection(Transaction.COLLECTION_NAME).order_by('created_at')
+
+    if start_date:
+        transactions_query = transactions_query.where(filter=FieldFilter('created_at', '>=', start_date))
+    if end_date:
+        transactions_query = transactions_query.where(filter=FieldFilter('created_at', '<=', end_date))
+
+    transactions_query = transactions_query.limit(config.BATCH_SIZE)
+
+    transactions = []
+    last_doc = None
+    while True:
+        if last_doc:
+            transactions_query = transactions_query.start_after(last_doc)
+
+        count = 0
+        async for doc in transactions_query.stream():
+            count += 1
+            last_doc = doc
+            transactions.append(Transaction(**doc.to_dict()))
+
+        if count < config.BATCH_SIZE:
+            break
+
+    return transactions
+
+
 async def get_last_transaction_by_user(user_id: str) -> Optional[Transaction]:
     transaction_stream = firebase.db.collection(Transaction.COLLECTION_NAME) \
         .where(filter=FieldFilter('user_id', '==', user_id)) \
@@ -1,3 +1,4 @@
+from bot.database.ledger import ledger
 from bot.database.main import firebase
 from bot.database.models.common import Currency
 from bot.database.models.transaction import Transaction, TransactionType
@@ -26,7 +27,7 @@ async def write_transaction(
         details,
         created_at,
     )
-    await firebase.db.collection(Transaction.COLLECTION_NAME).document(transaction.id).set(transaction.to_dict())
+    await ledger.enqueue(transaction)
 
     return transaction
 
@@ -1,20 +1,37 @@
+import copy
 from datetime import datetime
 from typing import Optional
 
+from cachetools import TTLCache
 from google.cloud.firestore_v1 import FieldFilter
 
+from bot.config import config
 from bot.database.main import firebase
-from bot.database.models.common import UTM
+from bot.database.models.common import UTM, Quota
 from bot.database.models.user import User
 from bot.locales.types import LanguageCode
 
 
-async def get_user(user_id: str) -> Optional[User]:
-    user_ref = firebase.db.collection(User.COLLECTION_NAME).document(user_id)
-    user = await user_ref.get()
+user_cache = TTLCache(maxsize=config.USER_CACHE_MAX_SIZE, ttl=config.USER_CACHE_TTL_SECONDS)
 
-    if user.exists:
-        return User(**user.to_dict())
+
+def invalidate_user_cache(user_id: str):
+    user_cache.pop(user_id, None)
+
+
+async def get_user(user_id: str, use_cache=True) -> Optional[User]:
+    user_data = user_cache.get(user_id) if use_cache else None
+    if user_data is None:
+        user_ref = firebase.db.collection(User.COLLECTION_NAME).document(user_id)
+        user = await user_ref.get()
+        if not user.exists:
+            return
+
+        user_data = user.to_dict()
+        user_cache[user_id] = user_data
+
+    # handlers mutate the returned user in place, so the cached data is never shared
+    return User(**copy.deepcopy(user_data))
 
 
 async def get_users(
@@ -132,11 +149,77 @@ async def get_count_of_users_by_referral(referred_by: str) -> int:
     return int(users_query[0][0].value)
 
 
-async def get_users_by_language_code(language_code: LanguageCode) -> list[User]:
-    users_stream = firebase.db.collection(User.COLLECTION_NAME) \
-        .where(filter=FieldFilter('interface_language_code', '==', language_code)) \
-        .stream()
+async def get_users_by_language_code(
+    language_code: LanguageCode,
+    start_after_user_id: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list[User]:
+    users_query = firebase.db.collection(User.COLLECTION_NAME) \
+        .where(filter=FieldFilter('interface_language_code', '==', language_code))
+
+    if start_after_user_id:
+        last_user = await firebase.db.collection(User.COLLECTION_NAME).document(start_after_user_id).get()
+        if last_user.exists:
+            users_query = users_query.start_after(last_user)
+    if limit:
+        users_query = users_query.limit(limit)
+
+    users_stream = users_query.stream()
 
     return [
         User(**user.to_dict()) async for user in users_stream
     ]
+
+
+async def get_user_ids_by_last_usage(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    subscription_id: Optional[str] = None,
+) -> list[str]:
+    users_query = firebase.db.collection(User.COLLECTION_NAME)
+
+    if start_date:
+        users_query = users_query.where(filter=FieldFilter('last_usage_at', '>=', start_date))
+    if end_date:
+        users_query = users_query.where(filter=FieldFilter('last_usage_at', '<', end_date))
+    if subscription_id is not None:
+        users_query = users_query.where(filter=FieldFilter('subscription_id', '==', subscription_id))
+
+    users = users_query.select(['id']).stream()
+    return [
+        user.id async for user in users
+    ]
+
+
+async def get_unused_user_ids(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    subscription_id: Optional[str] = None,
+) -> list[str]:
+    users_query = firebase.db.collection(User.COLLECTION_NAME) \
+        .where(filter=FieldFilter('last_usage_at', '==', None))
+
+    if start_date:
+        users_query = users_query.where(filter=FieldFilter('created_at', '>=', start_date))
+    if end_date:
+        users_query = users_query.where(filter=FieldFilter('created_at', '<', end_date))
+    if subscription_id is not None:
+        users_query = users_query.where(filter=FieldFilter('subscription_id', '==', subscription_id))
+
+    users = users_query.select(['id']).stream()
+    return [
+        user.id async for user in users
+    ]
+
+
+async def get_user_ids_by_additional_usage_quota(quota: Quota, subscription_id: Optional[str] = None) -> list[str]:
+    users_query = firebase.db.collection(User.COLLECTION_NAME) \
+        .where(filter=FieldFilter(f'additional_usage_quota.{quota}', '==', True))
+
+    if subscription_id is not None:
+        users_query = users_query.where(filter=FieldFilter('subscription_id', '==', subscription_id))
+
+    users = users_query.select(['id']).stream()
+    return [
+        user.id async for user in users
+    ]
@@ -188,6 +188,7 @@ def create_user_object(
         balance=user_data.get('balance', 100 if is_referred_by_user else 75),
         subscription_id=user_data.get('subscription_id', ''),
         last_subscription_limit_update=user_data.get('last_subscription_limit_update', datetime.now(timezone.utc)),
+        last_usage_at=user_data.get('last_usage_at', None),
         daily_limits=user_data.get('daily_limits', SUBSCRIPTION_FREE_LIMITS),
         additional_usage_quota=user_data.get('additional_usage_quota', default_additional_quota),
         settings=user_data.get('settings', default_settings),
@@ -1,8 +1,6 @@
 from typing import Optional
 
-import stripe
 from firebase_admin.exceptions import AlreadyExistsError
-from google.cloud import firestore
 
 from bot.database.main import firebase
 from bot.database.models.common import Quota
@@ -10,9 +8,11 @@ from bot.database.models.user import User
 from bot.database.operations.cart.writers import write_cart_in_transaction
 from bot.database.operations.chat.writers import write_chat_in_transaction
 from bot.database.operations.user.writers import write_user_in_transaction
+from bot.database.transactional import transactional
+from bot.helpers.billing.get_stripe import get_stripe
 
 
-@firestore.async_transactional
+@transactional
 async def initialize_user_for_the_first_time(
     transaction,
     telegram_user: User,
@@ -28,7 +28,7 @@ async def initialize_user_for_the_first_time(
     if telegram_user.last_name:
         full_name += f' {telegram_user.last_name}'
     # create user in stripe
-    stripe_customer = await stripe.Customer.create_async(
+    stripe_customer = await get_stripe().Customer.create_async(
         name=full_name,
     )
 
@@ -2,6 +2,8 @@ from datetime import datetime, timezone
 
 from bot.database.main import firebase
 from bot.database.models.user import User
+from bot.database.operations.user.getters import invalidate_user_cache
+from bot.database.transactional import on_commit
 
 
 async def update_user(user_id: str, data: dict):
@@ -12,8 +14,13 @@ async def update_user(user_id: str, data: dict):
         data['edited_at'] = datetime.now(timezone.utc)
         await user_ref.update(data)
 
+    invalidate_user_cache(user_id)
+
 
 async def update_user_in_transaction(transaction, user_id: str, data: dict):
     data['edited_at'] = datetime.now(timezone.utc)
 
     transaction.update(firebase.db.collection(User.COLLECTION_NAME).document(user_id), data)
+
+    # a read before the commit would cache the old user again, so the cache is only dropped once it landed
+    on_commit(transaction, lambda: invalidate_user_cache(user_id))
@@ -5,7 +5,9 @@ from aiogram.types import User as TelegramUser
 from bot.database.main import firebase
 from bot.database.models.common import Quota
 from bot.database.models.user import User
+from bot.database.operations.user.getters import invalidate_user_cache
 from bot.database.operations.user.helpers import create_user_object
+from bot.database.transactional import on_commit
 
 
 async def write_user_in_transaction(
@@ -38,4 +40,6 @@ async def write_user_in_transaction(
 
     transaction.set(user_ref, created_user.to_dict())
 
+    on_commit(transaction, lambda: invalidate_user_cache(created_user.id))
+
     return created_user
@@ -0,0 +1,33 @@
+import functools
+from typing import Awaitable, Callable
+
+from google.cloud import firestore
+
+
+def transactional(to_wrap: Callable[..., Awaitable]):
+    """
+    Same as @firestore.async_transactional, but also runs the callbacks registered with on_commit once the
+    transaction has committed.
+    """
+
+    @functools.wraps(to_wrap)
+    async def attempt(transaction, *args, **kwargs):
+        # an aborted attempt is run again from the start, so its callbacks are dropped with it
+        transaction.commit_callbacks = []
+        return await to_wrap(transaction, *args, **kwargs)
+
+    run_in_transaction = firestore.async_transactional(attempt)
+
+    @functools.wraps(to_wrap)
+    async def wrapper(transaction, *args, **kwargs):
+        result = await run_in_transaction(transaction, *args, **kwargs)
+        for callback in transaction.commit_callbacks:
+            callback()
+
+        return result
+
+    return wrapper
+
+
+def on_commit(transaction, callback: Callable[[], None]):
+    transaction.commit_callbacks.append(callback)
@@ -13,7 +13,7 @@ from bot.keyboards.admin.blast import (
     build_blast_confirmation_keyboard,
 )
 from bot.keyboards.common.common import build_cancel_keyboard
-from bot.locales.main import get_localization, localization_classes, get_user_language
+from bot.locales.main import get_localization, localization_modules, get_user_language
 from bot.locales.types import LanguageCode
 from bot.states.admin.blast import Blast
 
@@ -94,7 +94,7 @@ async def blast_letter_sent(message: Message, state: FSMContext):
     if blast_language != 'all':
         blast_letters[blast_language] = message.text
     else:
-        for language_code in localization_classes.keys():
+        for language_code in localization_modules.keys():
             if language_code == LanguageCode.RU:
                 blast_letters[language_code] = message.text
             else:
@@ -128,7 +128,7 @@ async def handle_blast_confirmation_selection(callback_query: CallbackQuery, sta
 
         tasks = []
         if blast_language == 'all':
-            for language_code in localization_classes.keys():
+            for language_code in localization_modules.keys():
                 tasks.append(
                     send_message_to_users(
                         bot=callback_query.bot,
@@ -14,7 +14,7 @@ from bot.keyboards.admin.catalog import (
     build_manage_catalog_edit_keyboard,
 )
 from bot.keyboards.common.common import build_cancel_keyboard
-from bot.locales.main import get_localization, localization_classes, get_user_language
+from bot.locales.main import get_localization, localization_modules, get_user_language
 from bot.locales.types import LanguageCode
 from bot.states.common.catalog import Catalog
 
@@ -129,7 +129,7 @@ async def catalog_manage_create_role_name_sent(message: Message, state: FSMConte
     user_language_code = await get_user_language(str(message.from_user.id), state.storage)
 
     role_names = {}
-    for language_code in localization_classes.keys():
+    for language_code in localization_modules.keys():
         if language_code == LanguageCode.RU:
             role_names[language_code] = message.text
         else:
@@ -153,7 +153,7 @@ async def catalog_manage_create_role_description_sent(message: Message, state: F
     user_language_code = await get_user_language(str(message.from_user.id), state.storage)
 
     role_descriptions = {}
-    for language_code in localization_classes.keys():
+    for language_code in localization_modules.keys():
         if language_code == LanguageCode.RU:
             role_descriptions[language_code] = message.text
         else:
@@ -177,7 +177,7 @@ async def catalog_manage_create_role_instruction_sent(message: Message, state: F
     user_language_code = await get_user_language(str(message.from_user.id), state.storage)
 
     role_instructions = {}
-    for language_code in localization_classes.keys():
+    for language_code in localization_modules.keys():
         if language_code == LanguageCode.RU:
             role_instructions[language_code] = message.text
         else:
@@ -252,7 +252,7 @@ async def catalog_manage_edit_role_sent(message: Message, state: FSMContext):
     user_data = await state.get_data()
 
     role_info = {}
-    for language_code in localization_classes.keys():
+    for language_code in localization_modules.keys():
         if language_code == LanguageCode.RU:
             role_info[language_code] = message.text
         else:
@@ -36,7 +36,7 @@ from bot.keyboards.admin.face_swap import (
     build_manage_face_swap_edit_choose_package_keyboard,
 )
 from bot.keyboards.common.common import build_cancel_keyboard
-from bot.locales.main import get_localization, localization_classes, get_user_language
+from bot.locales.main import get_localization, localization_modules, get_user_language
 from bot.locales.types import LanguageCode
 from bot.states.ai.face_swap import FaceSwap
 
@@ -127,7 +127,7 @@ async def face_swap_manage_name_sent(message: Message, state: FSMContext):
     user_data = await state.get_data()
 
     face_swap_package_names = {}
-    for language_code in localization_classes.keys():
+    for language_code in localization_modules.keys():
         if language_code == LanguageCode.RU:
             face_swap_package_names[language_code] = message.text
         else:
@@ -7,30 +7,31 @@ from aiogram import Router, F
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery
 from aiogram.utils.chat_action import ChatActionSender
-from google.cloud.firestore_v1 import FieldFilter
 
 from bot.config import config, MessageSticker
-from bot.database.main import firebase
 from bot.database.models.common import Currency
 from bot.database.models.feedback import FeedbackStatus
 from bot.database.models.game import GameType
 from bot.database.models.generation import GenerationReaction
 from bot.database.models.product import ProductType, ProductCategory, Product
 from bot.database.models.subscription import SubscriptionStatus
-from bot.database.models.transaction import Transaction, TransactionType, ServiceType
+from bot.database.models.transaction import TransactionType, ServiceType
 from bot.database.operations.feedback.getters import get_count_of_feedbacks
 from bot.database.operations.game.getters import get_count_of_games, get_sum_of_games_reward
 from bot.database.operations.generation.getters import get_count_of_generations
 from bot.database.operations.product.getters import get_products
 from bot.database.operations.promo_code.getters import get_count_of_used_promo_codes
-from bot.database.operations.subscription.getters import get_count_of_subscriptions, get_subscription
+from bot.database.operations.statistics.getters import get_count_of_unique_users
+from bot.database.operations.statistics.helpers import get_active_users_key, get_paid_users_key
+from bot.database.operations.subscription.getters import get_count_of_subscriptions
 from bot.database.operations.transaction.writers import write_transaction
 from bot.database.operations.user.getters import (
-    get_user,
     get_count_of_users,
     get_count_of_users_referred_by,
     get_count_of_users_campaign_by,
 )
+from bot.helpers.getters.get_daily_statistics_by_period import get_daily_statistics_by_period
+from bot.helpers.updaters.update_daily_statistics import update_daily_statistics
 from bot.keyboards.admin.admin import build_admin_keyboard
 from bot.keyboards.common.common import build_cancel_keyboard
 from bot.states.admin.statistics import Statistics
@@ -77,15 +78,13 @@ async def get_statistics_by_transactions_query(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
 ):
-    subscription_users = {
-        product.id: set() for product in products if product.type == ProductType.SUBSCRIPTION
+    subscription_users_keys = {
+        product.id: [] for product in products if product.type == ProductType.SUBSCRIPTION
     }
-    subscription_users[ServiceType.FREE] = set()
+    subscription_users_keys[ServiceType.FREE] = []
 
-    paid_users = set()
-    activated_users = set()
-
-    user_cache = {}
+    activated_users_keys = []
+    paid_users_keys = []
 
     default_transaction_nested_dict = {
         'SUCCESS': 0,
@@ -155,114 +154,47 @@ async def get_statistics_by_transactions_query(
         if product.type == ProductType.PACKAGE and product.category == ProductCategory.OTHER
     ]
 
-    transactions_query = firebase.db.collection(Transaction.COLLECTION_NAME).order_by('created_at')
-
-    if start_date:
-        transactions_query = transactions_query.where(filter=FieldFilter('created_at', '>=', start_date))
-    if end_date:
-        transactions_query = transactions_query.where(filter=FieldFilter('created_at', '<=', end_date))
-
-    transactions_query = transactions_query.limit(config.BATCH_SIZE)
-
-    is_running = True
-    last_doc = None
-
-    while is_running:
-        if last_doc:
-            transactions_query = transactions_query.start_after(last_doc)
-
-        docs = transactions_query.stream()
-
-        count = 0
-        async for doc in docs:
-            count += 1
-
-            transaction = Transaction(**doc.to_dict())
-
-            if transaction.user_id not in user_cache:
-                transaction_user = await get_user(transaction.user_id)
-                user_cache[transaction.user_id] = transaction_user
-            else:
-                transaction_user = user_cache[transaction.user_id]
-
-            if not transaction_user.subscription_id:
-                subscription_users[ServiceType.FREE].add(transaction_user.id)
-            else:
-                transaction_user_subscription = await get_subscription(transaction_user.subscription_id)
-                subscription_users[transaction_user_subscription.product_id].add(transaction_user.id)
-            activated_users.add(transaction.user_id)
-
-            if transaction.type == TransactionType.INCOME:
-                count_income_money_total += 1
-                transaction_net = transaction.clear_amount
-                if transaction.currency == Currency.USD:
-                    transaction_net *= 100
-                elif transaction.currency == Currency.XTR:
-                    transaction_net *= 2
-
-                count_income_money[transaction.product_id][transaction.currency] += transaction.clear_amount
-                count_income_money[transaction.product_id]['net'] += transaction_net
-                if transaction.product_id in service_subscriptions:
-                    count_income_money['SUBSCRIPTION_ALL'] += transaction_net
-                elif transaction.product_id in service_packages:
-                    count_income_money['PACKAGES_ALL'] += transaction_net
-                count_income_money['ALL'] += transaction_net
-
-                count_all_transactions[transaction.product_id]['BONUS'] += 1 \
-                    if transaction.details.get('is_bonus', False) \
-                    else 0
-
-                if transaction_net > 0:
-                    paid_users.add(transaction.user_id)
-            elif transaction.type == TransactionType.EXPENSE:
-                has_error = transaction.details.get('has_error', False)
-                is_suggestion = transaction.details.get('is_suggestion', False)
-
-                count_all_transactions[transaction.product_id]['SUCCESS'] += transaction.quantity \
-                    if not has_error \
-                    else 0
-                count_all_transactions[transaction.product_id]['FAIL'] += transaction.quantity \
-                    if has_error \
-                    else 0
-                count_all_transactions[transaction.product_id]['EXAMPLE'] += transaction.quantity \
-                    if is_suggestion \
-                    else 0
-                count_all_transactions[transaction.product_id]['ALL'] += transaction.quantity
-
-                count_expense_money[transaction.product_id]['AVERAGE_EXAMPLE_PRICE'] += transaction.amount \
-                    if is_suggestion \
-                    else 0
-                count_expense_money[transaction.product_id]['EXAMPLE_ALL'] += transaction.amount \
-                    if is_suggestion \
-                    else 0
-                count_expense_money[transaction.product_id]['AVERAGE_PRICE'] += transaction.amount \
-                    if not is_suggestion \
-                    else 0
-                count_expense_money[transaction.product_id]['ALL'] += transaction.amount
-                count_expense_money['ALL'] += transaction.amount
-
-                is_super_admin = transaction.user_id == config.SUPER_ADMIN_ID
-                if not is_super_admin:
-                    for key, value in subscription_users.items():
-                        if transaction.user_id in value:
-                            if transaction.product_id in text_products:
-                                count_expense_money[key]['TEXT'] += transaction.amount
-                            elif transaction.product_id in summary_products:
-                                count_expense_money[key]['SUMMARY'] += transaction.amount
-                            elif transaction.product_id in image_products:
-                                count_expense_money[key]['IMAGE'] += transaction.amount
-                            elif transaction.product_id in music_products:
-                                count_expense_money[key]['MUSIC'] += transaction.amount
-                            elif transaction.product_id in video_products:
-                                count_expense_money[key]['VIDEO'] += transaction.amount
-                            count_expense_money[key]['ALL'] += transaction.amount
-                            break
-
-        if count < config.BATCH_SIZE:
-            is_running = False
-            break
-
-        last_doc = doc
+    for daily_statistics in await get_daily_statistics_by_period(start_date, end_date):
+        activated_users_keys.append(get_active_users_key(daily_statistics.id))
+        paid_users_keys.append(get_paid_users_key(daily_statistics.id))
+        for subscription_key in daily_statistics.count_users:
+            subscription_users_keys[subscription_key].append(get_active_users_key(daily_statistics.id, subscription_key))
+
+        for product_id, count_transactions in daily_statistics.transactions.items():
+            for key, value in count_transactions.items():
+                count_all_transactions[product_id][key] += value
+
+        count_income_money_total += daily_statistics.count_incomes
+        for product_id, count_incomes in daily_statistics.incomes.items():
+            for key, value in count_incomes.items():
+                count_income_money[product_id][key] += value
+
+            if product_id in service_subscriptions:
+                count_income_money['SUBSCRIPTION_ALL'] += count_incomes['net']
+            elif product_id in service_packages:
+                count_income_money['PACKAGES_ALL'] += count_incomes['net']
+            count_income_money['ALL'] += count_incomes['net']
+
+        for product_id, count_expenses in daily_statistics.expenses.items():
+            count_expense_money[product_id]['AVERAGE_EXAMPLE_PRICE'] += count_expenses['EXAMPLE_ALL']
+            count_expense_money[product_id]['EXAMPLE_ALL'] += count_expenses['EXAMPLE_ALL']
+            count_expense_money[product_id]['AVERAGE_PRICE'] += count_expenses['REQUEST_ALL']
+            count_expense_money[product_id]['ALL'] += count_expenses['ALL']
+            count_expense_money['ALL'] += count_expenses['ALL']
+
+        for subscription_key, user_expenses in daily_statistics.user_expenses.items():
+            for product_id, amount in user_expenses.items():
+                if product_id in text_products:
+                    count_expense_money[subscription_key]['TEXT'] += amount
+                elif product_id in summary_products:
+                    count_expense_money[subscription_key]['SUMMARY'] += amount
+                elif product_id in image_products:
+                    count_expense_money[subscription_key]['IMAGE'] += amount
+                elif product_id in music_products:
+                    count_expense_money[subscription_key]['MUSIC'] += amount
+                elif product_id in video_products:
+                    count_expense_money[subscription_key]['VIDEO'] += amount
+                count_expense_money[subscription_key]['ALL'] += amount
 
     for service in service_ai_models:
         successes = count_all_transactions[service]['SUCCESS']
@@ -277,13 +209,15 @@ async def get_statistics_by_transactions_query(
             if total > 0 else 0
         count_expense_money[service]['AVERAGE_EXAMPLE_PRICE'] = average_example_price / examples \
             if examples > 0 else 0
-    for key, value in subscription_users.items():
+    for key, users_keys in subscription_users_keys.items():
+        # a user who switched subscriptions within the period counts towards each of them
+        count_users = await get_count_of_unique_users(users_keys)
         count_expense_money[key]['AVERAGE_PRICE'] = (
-            count_expense_money[key]['ALL'] / len(value)
-        ) if len(value) else 0
+            count_expense_money[key]['ALL'] / count_users
+        ) if count_users else 0
     return (
-        paid_users,
-        activated_users,
+        await get_count_of_unique_users(paid_users_keys),
+        await get_count_of_unique_users(activated_users_keys),
         count_all_transactions,
         count_income_money_total,
         count_income_money,
@@ -633,8 +567,8 @@ async def handle_get_statistics(language_code: LanguageCode, period: str):
 
     # transactions
     (
-        paid_users,
-        activated_users,
+        count_paid_users,
+        count_activated_users,
         count_all_transactions,
         count_income_money_total,
         count_income_money,
@@ -650,8 +584,8 @@ async def handle_get_statistics(language_code: LanguageCode, period: str):
         end_date=end_date,
     )
     (
-        paid_users_before,
-        activated_users_before,
+        count_paid_users_before,
+        count_activated_users_before,
         count_all_transactions_before,
         count_income_money_total_before,
         count_income_money_before,
@@ -667,11 +601,6 @@ async def handle_get_statistics(language_code: LanguageCode, period: str):
         end_date=end_date_before,
     )
 
-    count_activated_users = len(activated_users)
-    count_activated_users_before = len(activated_users_before)
-    count_paid_users = len(paid_users)
-    count_paid_users_before = len(paid_users_before)
-
     count_games = {
         key: 0 for key in list(GameType.__members__.keys())
     }
@@ -1116,6 +1045,7 @@ async def statistics_service_date_sent(message: Message, state: FSMContext):
             quantity=service_quantity,
             created_at=service_date,
         )
+        await update_daily_statistics(service_date)
         await message.answer(text=get_localization(user_language_code).ADMIN_STATISTICS_WRITE_TRANSACTION_SUCCESSFUL)
 
         await state.clear()
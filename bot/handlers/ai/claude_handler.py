@@ -1,16 +1,13 @@
 import asyncio
-import base64
 from datetime import datetime, timezone
 
 import anthropic
-import httpx
 from aiogram import Router
 from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.chat_action import ChatActionSender
-from filetype import filetype
 
 from bot.config import config, MessageEffect, MessageSticker
 from bot.database.main import firebase
@@ -20,7 +17,7 @@ from bot.database.models.user import UserSettings, User
 from bot.database.operations.chat.getters import get_chat
 from bot.database.operations.message.getters import get_messages_by_chat_id
 from bot.database.operations.message.writers import write_message
-from bot.database.operations.product.getters import get_product_by_quota
+from bot.database.operations.product.getters import get_product_id_by_quota
 from bot.database.operations.role.getters import get_role
 from bot.database.operations.transaction.writers import write_transaction
 from bot.database.operations.user.getters import get_user
@@ -29,10 +26,11 @@ from bot.helpers.creaters.create_new_message_and_update_user import create_new_m
 from bot.helpers.getters.get_history_without_duplicates import get_history_without_duplicates
 from bot.helpers.getters.get_quota_by_model import get_quota_by_model
 from bot.helpers.getters.get_switched_to_ai_model import get_switched_to_ai_model
+from bot.helpers.getters.get_vision_attachments import get_vision_attachments
 from bot.helpers.reply_with_voice import reply_with_voice
 from bot.helpers.senders.send_error_info import send_error_info
-from bot.helpers.senders.send_ai_message import send_ai_message
-from bot.integrations.anthropic import get_response_message
+from bot.helpers.senders.send_ai_message import StreamingAIMessage, send_ai_message
+from bot.integrations.anthropic import get_response_message, get_response_message_stream
 from bot.keyboards.ai.claude import build_claude_keyboard
 from bot.keyboards.ai.model import build_switched_to_ai_keyboard
 from bot.keyboards.common.common import (
@@ -193,6 +191,11 @@ async def handle_claude(
 
     system_prompt = role.translated_instructions.get(user_language_code) or \
                     role.translated_instructions.get(LanguageCode.EN)
+    vision_attachments = await get_vision_attachments([
+        f'users/vision/{user.id}/{photo_filename}'
+        for sorted_message in sorted_messages if can_work_with_photos or can_work_with_documents
+        for photo_filename in sorted_message.photo_filenames or []
+    ])
     history = []
     for sorted_message in sorted_messages:
         content = []
@@ -204,30 +207,20 @@ async def handle_claude(
 
         if sorted_message.photo_filenames and (can_work_with_photos or can_work_with_documents):
             for photo_filename in sorted_message.photo_filenames:
-                photo_path = f'users/vision/{user.id}/{photo_filename}'
-                photo = await firebase.bucket.get_blob(photo_path)
-                photo_link = firebase.get_public_url(photo.name)
-
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(photo_link)
-                    response_content = response.content
-
-                kind = await asyncio.to_thread(lambda: filetype.guess(response_content))
-                if kind:
-                    media_type = kind.mime
-                else:
+                vision_attachment = vision_attachments[f'users/vision/{user.id}/{photo_filename}']
+                media_type = vision_attachment['media_type']
+                if media_type in [None, 'text/plain']:
                     media_type = 'image/jpeg'
 
                 if not can_work_with_documents and not media_type.startswith('image') and not single_mode:
                     continue
 
-                data = await asyncio.to_thread(lambda: base64.b64encode(response_content).decode('utf-8'))
                 content.append({
                     'type': 'image' if media_type.startswith('image') else 'document',
                     'source': {
                         'type': 'base64',
                         'media_type': media_type,
-                        'data': data,
+                        'data': vision_attachment['data'],
                     },
                 })
 
@@ -253,11 +246,28 @@ async def handle_claude(
         try:
             history = get_history_without_duplicates(history)
 
-            response = await get_response_message(
-                user.settings[user.current_model][UserSettings.VERSION],
-                system_prompt,
-                history,
-            )
+            if user.settings[user.current_model][UserSettings.TURN_ON_VOICE_MESSAGES]:
+                response = await get_response_message(
+                    user.settings[user.current_model][UserSettings.VERSION],
+                    system_prompt,
+                    history,
+                )
+            else:
+                chat_info = f'💬 {chat.title}\n' if (
+                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_CHATS]
+                ) else ''
+                role_info = f'{role.translated_names.get(user_language_code) or role.translated_names.get(LanguageCode.EN)}\n' if (
+                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_ROLES]
+                ) else ''
+                header_text = f'{chat_info}{role_info}\n' if chat_info or role_info else ''
+                ai_message = StreamingAIMessage(message, header_text)
+                response = await ai_message.stream(
+                    get_response_message_stream(
+                        user.settings[user.current_model][UserSettings.VERSION],
+                        system_prompt,
+                        history,
+                    ),
+                )
             response_message = response['message']
 
             if user_quota == Quota.CLAUDE_3_HAIKU:
@@ -270,14 +280,14 @@ async def handle_claude(
                 input_price = response['input_tokens'] * PRICE_CLAUDE_3_OPUS_INPUT
                 output_price = response['output_tokens'] * PRICE_CLAUDE_3_OPUS_OUTPUT
 
-            product = await get_product_by_quota(user_quota)
+            product_id = await get_product_id_by_quota(user_quota)
 
             total_price = round(input_price + output_price, 6)
             message_role, message_content = 'assistant', response_message
             await write_transaction(
                 user_id=user.id,
                 type=TransactionType.EXPENSE,
-                product_id=product.id,
+                product_id=product_id,
                 amount=total_price,
                 clear_amount=total_price,
                 currency=Currency.USD,
@@ -305,20 +315,12 @@ async def handle_claude(
                     voice=user.settings[user.current_model][UserSettings.VOICE],
                 )
             else:
-                chat_info = f'💬 {chat.title}\n' if (
-                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_CHATS]
-                ) else ''
-                role_info = f'{role.translated_names.get(user_language_code) or role.translated_names.get(LanguageCode.EN)}\n' if (
-                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_ROLES]
-                ) else ''
-                header_text = f'{chat_info}{role_info}\n' if chat_info or role_info else ''
                 footer_text = f'\n\n✉️ {user.daily_limits[user_quota] + user.additional_usage_quota[user_quota] + 1}' \
                     if user.settings[user.current_model][UserSettings.SHOW_USAGE_QUOTA] and \
                        user.daily_limits[user_quota] != float('inf') else ''
                 reply_markup = build_continue_generating_keyboard(user_language_code)
                 full_text = f'{header_text}{message_content}{footer_text}'
-                await send_ai_message(
-                    message=message,
+                await ai_message.finish(
                     text=full_text,
                     reply_markup=reply_markup if response['finish_reason'] == 'max_tokens' else None,
                 )
@@ -424,7 +426,7 @@ async def handle_claude_3_sonnet_example(
             response = await get_response_message(ClaudeGPTVersion.V3_Sonnet, system_prompt, history)
             response_message = response['message']
 
-            product = await get_product_by_quota(Quota.CLAUDE_3_SONNET)
+            product_id = await get_product_id_by_quota(Quota.CLAUDE_3_SONNET)
 
             input_price = response['input_tokens'] * PRICE_CLAUDE_3_SONNET_INPUT
             output_price = response['output_tokens'] * PRICE_CLAUDE_3_SONNET_OUTPUT
@@ -434,7 +436,7 @@ async def handle_claude_3_sonnet_example(
             await write_transaction(
                 user_id=user.id,
                 type=TransactionType.EXPENSE,
-                product_id=product.id,
+                product_id=product_id,
                 amount=total_price,
                 clear_amount=total_price,
                 currency=Currency.USD,
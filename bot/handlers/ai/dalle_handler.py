@@ -22,6 +22,7 @@ from bot.integrations.open_ai import get_response_image, get_cost_for_image
 from bot.keyboards.ai.model import build_switched_to_ai_keyboard, build_model_limit_exceeded_keyboard
 from bot.keyboards.common.common import build_error_keyboard
 from bot.locales.main import get_localization, get_user_language
+from bot.utils.update_registry import run_checkpoint
 
 dall_e_router = Router()
 
@@ -90,12 +91,12 @@ async def handle_dall_e(message: Message, state: FSMContext, user: User):
             quality = user.settings[Model.DALL_E][UserSettings.QUALITY]
             cost = get_cost_for_image(quality, resolution)
 
-            response_url = await get_response_image(
+            response_url = await run_checkpoint('dall_e:get_response_image', lambda: get_response_image(
                 version,
                 text,
                 resolution,
                 quality,
-            )
+            ))
 
             product = await get_product_by_quota(Quota.DALL_E)
 
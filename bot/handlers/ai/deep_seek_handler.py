@@ -17,7 +17,7 @@ from bot.database.models.user import UserSettings, User
 from bot.database.operations.chat.getters import get_chat
 from bot.database.operations.message.getters import get_messages_by_chat_id
 from bot.database.operations.message.writers import write_message
-from bot.database.operations.product.getters import get_product_by_quota
+from bot.database.operations.product.getters import get_product_id_by_quota
 from bot.database.operations.role.getters import get_role
 from bot.database.operations.transaction.writers import write_transaction
 from bot.database.operations.user.getters import get_user
@@ -28,8 +28,8 @@ from bot.helpers.getters.get_quota_by_model import get_quota_by_model
 from bot.helpers.getters.get_switched_to_ai_model import get_switched_to_ai_model
 from bot.helpers.reply_with_voice import reply_with_voice
 from bot.helpers.senders.send_error_info import send_error_info
-from bot.helpers.senders.send_ai_message import send_ai_message
-from bot.integrations.deep_seek import get_response_message
+from bot.helpers.senders.send_ai_message import StreamingAIMessage, send_ai_message
+from bot.integrations.deep_seek import get_response_message, get_response_message_stream
 from bot.keyboards.ai.deep_seek import build_deep_seek_keyboard
 from bot.keyboards.ai.model import build_switched_to_ai_keyboard
 from bot.keyboards.common.common import (
@@ -204,8 +204,23 @@ async def handle_deep_seek(message: Message, state: FSMContext, user: User, user
 
     async with chat_action_sender(bot=message.bot, chat_id=message.chat.id):
         try:
-            response = await get_response_message(user.settings[user.current_model][UserSettings.VERSION], history)
-            response_message = response['message']
+            if user.settings[user.current_model][UserSettings.TURN_ON_VOICE_MESSAGES]:
+                response = await get_response_message(user.settings[user.current_model][UserSettings.VERSION], history)
+                message_role, message_content = response['message'].role, response['message'].content
+            else:
+                chat_info = f'💬 {chat.title}\n' if (
+                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_CHATS]
+                ) else ''
+                role_info = f'{role.translated_names.get(user_language_code) or role.translated_names.get(LanguageCode.EN)}\n' if (
+                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_ROLES]
+                ) else ''
+                header_text = f'{chat_info}{role_info}\n' if chat_info or role_info else ''
+                ai_message = StreamingAIMessage(message, header_text)
+                response = await ai_message.stream(
+                    get_response_message_stream(user.settings[user.current_model][UserSettings.VERSION], history),
+                )
+                message_role, message_content = 'assistant', response['message']
+
             if user_quota == Quota.DEEP_SEEK_V3:
                 input_price = response['input_tokens'] * PRICE_DEEP_SEEK_V3_INPUT
                 output_price = response['output_tokens'] * PRICE_DEEP_SEEK_V3_OUTPUT
@@ -213,14 +228,13 @@ async def handle_deep_seek(message: Message, state: FSMContext, user: User, user
                 input_price = response['input_tokens'] * PRICE_DEEP_SEEK_R1_INPUT
                 output_price = response['output_tokens'] * PRICE_DEEP_SEEK_R1_OUTPUT
 
-            product = await get_product_by_quota(user_quota)
+            product_id = await get_product_id_by_quota(user_quota)
 
             total_price = round(input_price + output_price, 6)
-            message_role, message_content = response_message.role, response_message.content
             await write_transaction(
                 user_id=user.id,
                 type=TransactionType.EXPENSE,
-                product_id=product.id,
+                product_id=product_id,
                 amount=total_price,
                 clear_amount=total_price,
                 currency=Currency.USD,
@@ -248,20 +262,12 @@ async def handle_deep_seek(message: Message, state: FSMContext, user: User, user
                     voice=user.settings[user.current_model][UserSettings.VOICE],
                 )
             else:
-                chat_info = f'💬 {chat.title}\n' if (
-                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_CHATS]
-                ) else ''
-                role_info = f'{role.translated_names.get(user_language_code) or role.translated_names.get(LanguageCode.EN)}\n' if (
-                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_ROLES]
-                ) else ''
-                header_text = f'{chat_info}{role_info}\n' if chat_info or role_info else ''
                 footer_text = f'\n\n✉️ {user.daily_limits[user_quota] + user.additional_usage_quota[user_quota] + 1}' \
                     if user.settings[user.current_model][UserSettings.SHOW_USAGE_QUOTA] and \
                        user.daily_limits[user_quota] != float('inf') else ''
                 reply_markup = build_continue_generating_keyboard(user_language_code)
                 full_text = f"{header_text}{message_content}{footer_text}"
-                await send_ai_message(
-                    message=message,
+                await ai_message.finish(
                     text=full_text,
                     reply_markup=reply_markup if response['finish_reason'] == 'length' else None,
                 )
@@ -340,7 +346,7 @@ async def handle_deep_seek_r1_example(
             response = await get_response_message(DeepSeekVersion.R1, history)
             response_message = response['message']
 
-            product = await get_product_by_quota(Quota.DEEP_SEEK_R1)
+            product_id = await get_product_id_by_quota(Quota.DEEP_SEEK_R1)
             input_price = response['input_tokens'] * PRICE_DEEP_SEEK_R1_INPUT
             output_price = response['output_tokens'] * PRICE_DEEP_SEEK_R1_OUTPUT
 
@@ -349,7 +355,7 @@ async def handle_deep_seek_r1_example(
             await write_transaction(
                 user_id=user.id,
                 type=TransactionType.EXPENSE,
-                product_id=product.id,
+                product_id=product_id,
                 amount=total_price,
                 clear_amount=total_price,
                 currency=Currency.USD,
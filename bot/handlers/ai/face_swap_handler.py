@@ -15,7 +15,7 @@ from aiogram.utils.chat_action import ChatActionSender
 
 from bot.config import config, MessageEffect, MessageSticker
 from bot.database.main import firebase
-from bot.database.models.common import Model, Quota, SendType, Currency
+from bot.database.models.common import Model, Quota
 from bot.database.models.face_swap_package import (
     FaceSwapPackage,
     FaceSwapPackageStatus,
@@ -24,7 +24,6 @@ from bot.database.models.face_swap_package import (
 )
 from bot.database.models.generation import GenerationStatus
 from bot.database.models.request import RequestStatus
-from bot.database.models.transaction import TransactionType
 from bot.database.models.user import User, UserGender, UserSettings
 from bot.database.operations.face_swap_package.getters import (
     get_face_swap_package,
@@ -41,14 +40,13 @@ from bot.database.operations.product.getters import get_product_by_quota
 from bot.database.operations.request.getters import get_started_requests_by_user_id_and_product_id
 from bot.database.operations.request.updaters import update_request
 from bot.database.operations.request.writers import write_request
-from bot.database.operations.transaction.writers import write_transaction
 from bot.database.operations.user.getters import get_user
 from bot.database.operations.user.updaters import update_user
 from bot.helpers.getters.get_quota_by_model import get_quota_by_model
 from bot.helpers.getters.get_switched_to_ai_model import get_switched_to_ai_model
+from bot.helpers.pollers.poll_scheduler import poll_scheduler, PollJobKind
 from bot.helpers.senders.send_error_info import send_error_info
-from bot.helpers.updaters.update_user_usage_quota import update_user_usage_quota
-from bot.integrations.face_swap import generate_face_swap_video, get_face_swap_video_generation
+from bot.integrations.face_swap import generate_face_swap_video
 from bot.integrations.replicate_ai import create_face_swap_images, create_flux_face_swap_image
 from bot.keyboards.ai.face_swap import (
     build_face_swap_keyboard,
@@ -64,11 +62,11 @@ from bot.locales.translate_text import translate_text
 from bot.locales.types import LanguageCode
 from bot.states.ai.face_swap import FaceSwap
 from bot.states.common.profile import Profile
+from bot.utils.update_registry import run_checkpoint
 
 face_swap_router = Router()
 
 PRICE_FACE_SWAP = 0.0014
-PRICE_FACE_SWAP_VIDEO = 0.02
 
 
 def count_active_files(files_list: list[FaceSwapFileData]) -> int:
@@ -415,77 +413,32 @@ async def handle_face_swap_video(
         )
 
         try:
-            result_id = await generate_face_swap_video(
+            result_id = await run_checkpoint('face_swap:generate_face_swap_video', lambda: generate_face_swap_video(
                 user_photo_link,
                 video_link,
-            )
+            ))
 
-            generation = await write_generation(
+            await write_generation(
                 id=result_id,
                 request_id=request.id,
                 product_id=product.id,
                 has_error=result_id is None,
                 details={
                     'video_link': video_link,
+                    'video_duration': video_duration,
+                    'message_id': message.message_id,
                 }
             )
 
-            for i in range(10):
-                await asyncio.sleep(30)
-
-                video_generation = await get_face_swap_video_generation(result_id)
-                if video_generation.get('progress') == 100:
-                    video_result_url = video_generation.get('output')[0]
-                    footer_text = f'\n\n📹 {user.daily_limits[Quota.FACE_SWAP] + user.additional_usage_quota[Quota.FACE_SWAP]}' \
-                        if user.settings[Model.FACE_SWAP][UserSettings.SHOW_USAGE_QUOTA] and \
-                           user.daily_limits[Quota.FACE_SWAP] != float('inf') else ''
-                    if user.settings[Model.FACE_SWAP][UserSettings.SEND_TYPE] == SendType.DOCUMENT:
-                        await message.reply_document(
-                            caption=f'{get_localization(user_language_code).GENERATION_VIDEO_SUCCESS}{footer_text}',
-                            document=video_result_url,
-                            allow_sending_without_reply=True,
-                        )
-                    else:
-                        await message.reply_video(
-                            caption=f'{get_localization(user_language_code).GENERATION_VIDEO_SUCCESS}{footer_text}',
-                            video=video_result_url,
-                            allow_sending_without_reply=True,
-                        )
-
-                    total_price = PRICE_FACE_SWAP_VIDEO * video_generation.get('need_credits')
-                    update_tasks = [
-                        update_generation(generation.id, {
-                            'status': GenerationStatus.FINISHED,
-                            'result': video_result_url,
-                        }),
-                        update_request(request.id, {
-                            'status': RequestStatus.FINISHED,
-                        }),
-                        write_transaction(
-                            user_id=user.id,
-                            type=TransactionType.EXPENSE,
-                            product_id=generation.product_id,
-                            amount=total_price,
-                            clear_amount=total_price,
-                            currency=Currency.USD,
-                            quantity=1,
-                            details={
-                                'result': video_result_url,
-                                'video_link': video_link,
-                                'has_error': False,
-                            },
-                        ),
-                        update_user_usage_quota(
-                            user,
-                            Quota.FACE_SWAP,
-                            video_duration,
-                        ),
-                    ]
-
-                    await asyncio.gather(*update_tasks)
-                    break
-            else:
-                raise TimeoutError('Timeout Error')
+            await poll_scheduler.schedule(
+                PollJobKind.FACE_SWAP_VIDEO,
+                result_id,
+                {
+                    'id': result_id,
+                },
+                interval=30,
+                timeout=10 * 30,
+            )
         except Exception as e:
             await message.answer_sticker(
                 sticker=config.MESSAGE_STICKERS.get(MessageSticker.ERROR),
@@ -1,17 +1,13 @@
 import asyncio
-import base64
 from datetime import datetime, timezone
 
-import httpx
 from aiogram import Router
 from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.chat_action import ChatActionSender
-from filetype import filetype
 from google.api_core.exceptions import ResourceExhausted
-from google.generativeai.types import StopCandidateException, BlockedPromptException
 
 from bot.config import config, MessageEffect, MessageSticker
 from bot.database.main import firebase
@@ -21,7 +17,7 @@ from bot.database.models.user import UserSettings, User
 from bot.database.operations.chat.getters import get_chat
 from bot.database.operations.message.getters import get_messages_by_chat_id
 from bot.database.operations.message.writers import write_message
-from bot.database.operations.product.getters import get_product_by_quota
+from bot.database.operations.product.getters import get_product_id_by_quota
 from bot.database.operations.role.getters import get_role
 from bot.database.operations.transaction.writers import write_transaction
 from bot.database.operations.user.getters import get_user
@@ -29,10 +25,11 @@ from bot.database.operations.user.updaters import update_user
 from bot.helpers.creaters.create_new_message_and_update_user import create_new_message_and_update_user
 from bot.helpers.getters.get_quota_by_model import get_quota_by_model
 from bot.helpers.getters.get_switched_to_ai_model import get_switched_to_ai_model
+from bot.helpers.getters.get_vision_attachments import get_vision_attachments
 from bot.helpers.reply_with_voice import reply_with_voice
-from bot.helpers.senders.send_ai_message import send_ai_message
+from bot.helpers.senders.send_ai_message import StreamingAIMessage, send_ai_message
 from bot.helpers.senders.send_error_info import send_error_info
-from bot.integrations.google import get_response_message
+from bot.integrations.google import get_blocked_response_errors, get_response_message, get_response_message_stream
 from bot.keyboards.ai.gemini import build_gemini_keyboard
 from bot.keyboards.ai.model import build_switched_to_ai_keyboard
 from bot.keyboards.common.common import (
@@ -191,6 +188,11 @@ async def handle_gemini(
         sorted_messages = [sorted_messages[-1]]
     system_prompt = role.translated_instructions.get(user_language_code) or \
                     role.translated_instructions.get(LanguageCode.EN)
+    vision_attachments = await get_vision_attachments([
+        f'users/vision/{user.id}/{photo_filename}'
+        for sorted_message in sorted_messages
+        for photo_filename in sorted_message.photo_filenames or []
+    ])
     history = []
     for sorted_message in sorted_messages:
         parts = []
@@ -199,31 +201,15 @@ async def handle_gemini(
 
         if sorted_message.photo_filenames:
             for photo_filename in sorted_message.photo_filenames:
-                photo_path = f'users/vision/{user.id}/{photo_filename}'
-                photo = await firebase.bucket.get_blob(photo_path)
-                photo_link = firebase.get_public_url(photo.name)
-
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(photo_link)
-                    response_content = response.content
-
-                kind = await asyncio.to_thread(lambda: filetype.guess(response_content))
-                if kind:
-                    media_type = kind.mime
-                else:
-                    try:
-                        response_content.decode('utf-8')
-                        media_type = 'text/plain'
-                    except UnicodeDecodeError:
-                        media_type = 'image/jpeg'
+                vision_attachment = vision_attachments[f'users/vision/{user.id}/{photo_filename}']
+                media_type = vision_attachment['media_type'] or 'image/jpeg'
 
                 if not media_type.startswith('image') and not single_mode:
                     continue
 
-                data = await asyncio.to_thread(lambda: base64.b64encode(response_content).decode('utf-8'))
                 parts.append({
                     'mime_type': media_type,
-                    'data': data,
+                    'data': vision_attachment['data'],
                 })
 
         if parts:
@@ -247,18 +233,44 @@ async def handle_gemini(
 
     async with chat_action_sender(bot=message.bot, chat_id=message.chat.id):
         try:
-            try:
-                response = await get_response_message(
-                    model_version=user.settings[user.current_model][UserSettings.VERSION],
-                    system_prompt=system_prompt,
-                    history=history,
-                )
-            except ResourceExhausted:
-                response = await get_response_message(
-                    model_version=GeminiGPTVersion.V1_Pro,
-                    system_prompt=system_prompt,
-                    history=history,
-                )
+            if user.settings[user.current_model][UserSettings.TURN_ON_VOICE_MESSAGES]:
+                try:
+                    response = await get_response_message(
+                        model_version=user.settings[user.current_model][UserSettings.VERSION],
+                        system_prompt=system_prompt,
+                        history=history,
+                    )
+                except ResourceExhausted:
+                    response = await get_response_message(
+                        model_version=GeminiGPTVersion.V1_Pro,
+                        system_prompt=system_prompt,
+                        history=history,
+                    )
+            else:
+                chat_info = f'💬 {chat.title}\n' if (
+                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_CHATS]
+                ) else ''
+                role_info = f'{role.translated_names.get(user_language_code) or role.translated_names.get(LanguageCode.EN)}\n' if (
+                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_ROLES]
+                ) else ''
+                header_text = f'{chat_info}{role_info}\n' if chat_info or role_info else ''
+                ai_message = StreamingAIMessage(message, header_text)
+                try:
+                    response = await ai_message.stream(
+                        get_response_message_stream(
+                            model_version=user.settings[user.current_model][UserSettings.VERSION],
+                            system_prompt=system_prompt,
+                            history=history,
+                        ),
+                    )
+                except ResourceExhausted:
+                    response = await ai_message.stream(
+                        get_response_message_stream(
+                            model_version=GeminiGPTVersion.V1_Pro,
+                            system_prompt=system_prompt,
+                            history=history,
+                        ),
+                    )
 
             response_message = response['message']
             if user_quota == Quota.GEMINI_2_FLASH:
@@ -271,14 +283,14 @@ async def handle_gemini(
                 input_price = response['input_tokens'] * PRICE_GEMINI_1_ULTRA_INPUT
                 output_price = response['output_tokens'] * PRICE_GEMINI_1_ULTRA_OUTPUT
 
-            product = await get_product_by_quota(user_quota)
+            product_id = await get_product_id_by_quota(user_quota)
 
             total_price = round(input_price + output_price, 6)
             message_role, message_content = 'assistant', response_message
             await write_transaction(
                 user_id=user.id,
                 type=TransactionType.EXPENSE,
-                product_id=product.id,
+                product_id=product_id,
                 amount=total_price,
                 clear_amount=total_price,
                 currency=Currency.USD,
@@ -306,24 +318,16 @@ async def handle_gemini(
                     voice=user.settings[user.current_model][UserSettings.VOICE],
                 )
             else:
-                chat_info = f'💬 {chat.title}\n' if (
-                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_CHATS]
-                ) else ''
-                role_info = f'{role.translated_names.get(user_language_code) or role.translated_names.get(LanguageCode.EN)}\n' if (
-                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_ROLES]
-                ) else ''
-                header_text = f'{chat_info}{role_info}\n' if chat_info or role_info else ''
                 footer_text = f'\n\n✉️ {user.daily_limits[user_quota] + user.additional_usage_quota[user_quota] + 1}' \
                     if user.settings[user.current_model][UserSettings.SHOW_USAGE_QUOTA] and \
                        user.daily_limits[user_quota] != float('inf') else ''
                 reply_markup = build_continue_generating_keyboard(user_language_code)
                 full_text = f'{header_text}{message_content}{footer_text}'
-                await send_ai_message(
-                    message=message,
+                await ai_message.finish(
                     text=full_text,
                     reply_markup=reply_markup if response['finish_reason'] == 'MAX_TOKENS' else None,
                 )
-        except (StopCandidateException, BlockedPromptException):
+        except get_blocked_response_errors():
             await message.answer_sticker(
                 sticker=config.MESSAGE_STICKERS.get(MessageSticker.FEAR),
             )
@@ -388,7 +392,7 @@ async def handle_gemini_2_pro_example(
             )
             response_message = response['message']
 
-            product = await get_product_by_quota(Quota.GEMINI_2_PRO)
+            product_id = await get_product_id_by_quota(Quota.GEMINI_2_PRO)
 
             input_price = response['input_tokens'] * PRICE_GEMINI_2_PRO_INPUT
             output_price = response['output_tokens'] * PRICE_GEMINI_2_PRO_OUTPUT
@@ -398,7 +402,7 @@ async def handle_gemini_2_pro_example(
             await write_transaction(
                 user_id=user.id,
                 type=TransactionType.EXPENSE,
-                product_id=product.id,
+                product_id=product_id,
                 amount=total_price,
                 clear_amount=total_price,
                 currency=Currency.USD,
@@ -6,7 +6,6 @@ from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
 from aiogram.utils.chat_action import ChatActionSender
-from google.generativeai.types import StopCandidateException, BlockedPromptException
 
 from bot.config import config, MessageEffect, MessageSticker
 from bot.database.models.common import Model, Quota, Currency
@@ -22,7 +21,7 @@ from bot.helpers.reply_with_voice import reply_with_voice
 from bot.helpers.senders.send_ai_message import send_ai_message
 from bot.helpers.senders.send_error_info import send_error_info
 from bot.helpers.updaters.update_user_usage_quota import update_user_usage_quota
-from bot.integrations.google import get_response_video_summary
+from bot.integrations.google import get_blocked_response_errors, get_response_video_summary
 from bot.keyboards.ai.model import build_switched_to_ai_keyboard
 from bot.keyboards.common.common import build_error_keyboard
 from bot.locales.main import get_user_language, get_localization
@@ -161,7 +160,7 @@ async def handle_gemini_video(message: Message, state: FSMContext, user: User, v
                 )
 
             await update_user_usage_quota(user, Quota.GEMINI_VIDEO, 1)
-        except (StopCandidateException, BlockedPromptException):
+        except get_blocked_response_errors():
             await message.answer_sticker(
                 sticker=config.MESSAGE_STICKERS.get(MessageSticker.FEAR),
             )
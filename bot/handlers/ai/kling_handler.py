@@ -30,6 +30,7 @@ from bot.keyboards.common.common import build_error_keyboard
 from bot.locales.main import get_user_language, get_localization
 from bot.locales.translate_text import translate_text
 from bot.locales.types import LanguageCode
+from bot.utils.update_registry import run_checkpoint
 
 kling_router = Router()
 
@@ -122,14 +123,14 @@ async def handle_kling(
         try:
             if prompt and user_language_code != LanguageCode.EN:
                 prompt = await translate_text(prompt, user_language_code, LanguageCode.EN)
-            result_id = await generate_video(
+            result_id = await run_checkpoint('kling:generate_video', lambda: generate_video(
                 prompt,
                 user.settings[Model.KLING][UserSettings.VERSION],
                 user.settings[Model.KLING][UserSettings.MODE],
                 user.settings[Model.KLING][UserSettings.DURATION],
                 user.settings[Model.KLING][UserSettings.ASPECT_RATIO],
                 video_frame_link,
-            )
+            ))
 
             await write_generation(
                 id=result_id,
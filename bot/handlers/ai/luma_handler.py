@@ -33,6 +33,7 @@ from bot.keyboards.common.common import build_error_keyboard
 from bot.locales.main import get_user_language, get_localization
 from bot.locales.translate_text import translate_text
 from bot.locales.types import LanguageCode
+from bot.utils.update_registry import run_checkpoint
 
 luma_router = Router()
 
@@ -141,11 +142,11 @@ async def handle_luma_photon(
         try:
             if prompt and user_language_code != LanguageCode.EN:
                 prompt = await translate_text(prompt, user_language_code, LanguageCode.EN)
-            result_id = await get_response_image(
+            result_id = await run_checkpoint('luma:get_response_image', lambda: get_response_image(
                 prompt,
                 user.settings[Model.LUMA_PHOTON][UserSettings.ASPECT_RATIO],
                 image_link,
-            )
+            ))
 
             await write_generation(
                 id=result_id,
@@ -290,14 +291,14 @@ async def handle_luma_ray(
         try:
             if prompt and user_language_code != LanguageCode.EN:
                 prompt = await translate_text(prompt, user_language_code, LanguageCode.EN)
-            result_id = await get_response_video(
+            result_id = await run_checkpoint('luma:get_response_video', lambda: get_response_video(
                 prompt,
                 user.settings[Model.LUMA_RAY][UserSettings.VERSION],
                 user.settings[Model.LUMA_RAY][UserSettings.ASPECT_RATIO],
                 user.settings[Model.LUMA_RAY][UserSettings.DURATION],
                 user.settings[Model.LUMA_RAY][UserSettings.QUALITY],
                 video_frame_link,
-            )
+            ))
 
             await write_generation(
                 id=result_id,
@@ -14,7 +14,7 @@ from bot.database.models.user import User, UserSettings
 from bot.database.operations.chat.getters import get_chat
 from bot.database.operations.message.getters import get_messages_by_chat_id
 from bot.database.operations.message.writers import write_message
-from bot.database.operations.product.getters import get_product_by_quota
+from bot.database.operations.product.getters import get_product_id_by_quota
 from bot.database.operations.role.getters import get_role
 from bot.database.operations.transaction.writers import write_transaction
 from bot.database.operations.user.getters import get_user
@@ -23,10 +23,11 @@ from bot.helpers.creaters.create_new_message_and_update_user import create_new_m
 from bot.helpers.getters.get_history_without_duplicates import get_history_without_duplicates
 from bot.helpers.getters.get_quota_by_model import get_quota_by_model
 from bot.helpers.getters.get_switched_to_ai_model import get_switched_to_ai_model
+from bot.helpers.getters.get_vision_history import get_vision_history
 from bot.helpers.reply_with_voice import reply_with_voice
-from bot.helpers.senders.send_ai_message import send_ai_message
+from bot.helpers.senders.send_ai_message import StreamingAIMessage
 from bot.helpers.senders.send_error_info import send_error_info
-from bot.integrations.perplexity import get_response_message
+from bot.integrations.perplexity import get_response_message, get_response_message_stream
 from bot.keyboards.ai.model import build_switched_to_ai_keyboard
 from bot.keyboards.common.common import build_continue_generating_keyboard, build_error_keyboard
 from bot.locales.main import get_user_language, get_localization
@@ -109,32 +110,7 @@ async def handle_perplexity(message: Message, state: FSMContext, user: User, pho
     )
     role = await get_role(chat.role_id)
     sorted_messages = sorted(messages, key=lambda m: m.created_at)
-    history = []
-
-    for sorted_message in sorted_messages:
-        content = []
-        if sorted_message.content:
-            content.append({
-                'type': 'text',
-                'text': sorted_message.content,
-            })
-
-        if sorted_message.photo_filenames:
-            for photo_filename in sorted_message.photo_filenames:
-                photo_path = f'users/vision/{user.id}/{photo_filename}'
-                photo = await firebase.bucket.get_blob(photo_path)
-                photo_link = firebase.get_public_url(photo.name)
-                content.append({
-                    'type': 'image_url',
-                    'image_url': {
-                        'url': photo_link,
-                    },
-                })
-
-        history.append({
-            'role': sorted_message.sender,
-            'content': content,
-        })
+    history = get_vision_history(user.id, sorted_messages)
 
     processing_sticker = await message.answer_sticker(
         sticker=config.MESSAGE_STICKERS.get(MessageSticker.TEXT_GENERATION),
@@ -157,8 +133,23 @@ async def handle_perplexity(message: Message, state: FSMContext, user: User, pho
                            role.translated_instructions.get(LanguageCode.EN),
             }] + get_history_without_duplicates(history)
 
-            response = await get_response_message(user.settings[user.current_model][UserSettings.VERSION], history)
-            response_message = response['message']
+            if user.settings[user.current_model][UserSettings.TURN_ON_VOICE_MESSAGES]:
+                response = await get_response_message(user.settings[user.current_model][UserSettings.VERSION], history)
+                response_message = response['message'].content
+            else:
+                chat_info = f'💬 {chat.title}\n' if (
+                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_CHATS]
+                ) else ''
+                role_info = f'{role.translated_names.get(user_language_code) or role.translated_names.get(LanguageCode.EN)}\n' if (
+                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_ROLES]
+                ) else ''
+                header_text = f'{chat_info}{role_info}\n' if chat_info or role_info else ''
+                ai_message = StreamingAIMessage(message, header_text)
+                response = await ai_message.stream(
+                    get_response_message_stream(user.settings[user.current_model][UserSettings.VERSION], history),
+                )
+                response_message = response['message']
+
             if user.settings[user.current_model][UserSettings.VERSION] == PerplexityGPTVersion.Sonar:
                 input_price = response['input_tokens'] * PRICE_PERPLEXITY_SOLAR_INPUT_TOKEN
                 output_price = response['output_tokens'] * PRICE_PERPLEXITY_SOLAR_OUTPUT_TOKEN
@@ -166,18 +157,18 @@ async def handle_perplexity(message: Message, state: FSMContext, user: User, pho
                 input_price = response['input_tokens'] * PRICE_PERPLEXITY_SOLAR_PRO_INPUT_TOKEN
                 output_price = response['output_tokens'] * PRICE_PERPLEXITY_SOLAR_PRO_OUTPUT_TOKEN
 
-            product = await get_product_by_quota(Quota.PERPLEXITY)
+            product_id = await get_product_id_by_quota(Quota.PERPLEXITY)
 
             total_price = round(input_price + output_price + PRICE_PERPLEXITY_REQUEST, 6)
             response_message_with_citations = replace_citations_with_links(
-                response_message.content,
+                response_message,
                 response['citations'],
             )
-            message_role, message_content = response_message.role, response_message_with_citations
+            message_role, message_content = 'assistant', response_message_with_citations
             await write_transaction(
                 user_id=user.id,
                 type=TransactionType.EXPENSE,
-                product_id=product.id,
+                product_id=product_id,
                 amount=total_price,
                 clear_amount=total_price,
                 currency=Currency.USD,
@@ -205,20 +196,12 @@ async def handle_perplexity(message: Message, state: FSMContext, user: User, pho
                     voice=user.settings[user.current_model][UserSettings.VOICE],
                 )
             else:
-                chat_info = f'💬 {chat.title}\n' if (
-                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_CHATS]
-                ) else ''
-                role_info = f'{role.translated_names.get(user_language_code) or role.translated_names.get(LanguageCode.EN)}\n' if (
-                    user.settings[user.current_model][UserSettings.SHOW_THE_NAME_OF_THE_ROLES]
-                ) else ''
-                header_text = f'{chat_info}{role_info}\n' if chat_info or role_info else ''
                 footer_text = f'\n\n✉️ {user.daily_limits[Quota.GROK_2] + user.additional_usage_quota[Quota.GROK_2] + 1}' \
                     if user.settings[user.current_model][UserSettings.SHOW_USAGE_QUOTA] and \
                        user.daily_limits[Quota.GROK_2] != float('inf') else ''
                 reply_markup = build_continue_generating_keyboard(user_language_code)
                 full_text = f"{header_text}{message_content}{footer_text}"
-                await send_ai_message(
-                    message=message,
+                await ai_message.finish(
                     text=full_text,
                     reply_markup=reply_markup if response['finish_reason'] == 'length' else None,
                 )
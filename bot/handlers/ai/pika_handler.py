@@ -30,6 +30,7 @@ from bot.keyboards.common.common import build_error_keyboard
 from bot.locales.main import get_user_language, get_localization
 from bot.locales.translate_text import translate_text
 from bot.locales.types import LanguageCode
+from bot.utils.update_registry import run_checkpoint
 
 pika_router = Router()
 
@@ -124,12 +125,12 @@ async def handle_pika(
         try:
             if prompt and user_language_code != LanguageCode.EN:
                 prompt = await translate_text(prompt, user_language_code, LanguageCode.EN)
-            result_id = await generate_video(
+            result_id = await run_checkpoint('pika:generate_video', lambda: generate_video(
                 prompt,
                 user.settings[Model.PIKA][UserSettings.VERSION],
                 user.settings[Model.PIKA][UserSettings.ASPECT_RATIO],
                 video_frame_link,
-            )
+            ))
 
             await write_generation(
                 id=result_id,
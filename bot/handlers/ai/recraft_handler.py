@@ -21,6 +21,7 @@ from bot.integrations.recraft import get_response_image
 from bot.keyboards.ai.model import build_switched_to_ai_keyboard
 from bot.keyboards.common.common import build_error_keyboard
 from bot.locales.main import get_localization, get_user_language
+from bot.utils.update_registry import run_checkpoint
 
 recraft_router = Router()
 
@@ -100,11 +101,11 @@ async def handle_recraft(message: Message, state: FSMContext, user: User):
 
     async with ChatActionSender.upload_photo(bot=message.bot, chat_id=message.chat.id):
         try:
-            response_url = await get_response_image(
+            response_url = await run_checkpoint('recraft:get_response_image', lambda: get_response_image(
                 text,
                 user.settings[Model.RECRAFT][UserSettings.VERSION],
                 user.settings[Model.RECRAFT][UserSettings.ASPECT_RATIO],
-            )
+            ))
 
             product = await get_product_by_quota(Quota.RECRAFT)
 
@@ -10,28 +10,30 @@ from aiogram.types import Message
 from aiogram.utils.chat_action import ChatActionSender
 
 from bot.config import config, MessageEffect, MessageSticker
-from bot.database.models.common import Model, Quota, Currency, SendType
-from bot.database.models.transaction import TransactionType
+from bot.database.models.common import Model, Quota
+from bot.database.models.request import RequestStatus
 from bot.database.models.user import UserSettings, User
+from bot.database.operations.generation.writers import write_generation
 from bot.database.operations.product.getters import get_product_by_quota
-from bot.database.operations.transaction.writers import write_transaction
+from bot.database.operations.request.getters import get_started_requests_by_user_id_and_product_id
+from bot.database.operations.request.updaters import update_request
+from bot.database.operations.request.writers import write_request
 from bot.database.operations.user.getters import get_user
 from bot.database.operations.user.updaters import update_user
 from bot.helpers.getters.get_quota_by_model import get_quota_by_model
 from bot.helpers.getters.get_switched_to_ai_model import get_switched_to_ai_model
+from bot.helpers.pollers.poll_scheduler import poll_scheduler, PollJobKind
 from bot.helpers.senders.send_error_info import send_error_info
-from bot.helpers.updaters.update_user_usage_quota import update_user_usage_quota
-from bot.integrations.runway import get_response_video, get_cost_for_video
+from bot.integrations.runway import generate_video
 from bot.keyboards.ai.model import build_switched_to_ai_keyboard
 from bot.keyboards.common.common import build_error_keyboard
 from bot.locales.main import get_user_language, get_localization
 from bot.locales.translate_text import translate_text
 from bot.locales.types import LanguageCode
+from bot.utils.update_registry import run_checkpoint
 
 runway_router = Router()
 
-PRICE_RUNWAY = 0.25
-
 
 @runway_router.message(Command('runway'))
 async def runway(message: Message, state: FSMContext):
@@ -102,13 +104,28 @@ async def handle_runway(message: Message, state: FSMContext, user: User, video_f
     )
 
     async with ChatActionSender.upload_video(bot=message.bot, chat_id=message.chat.id):
+        product = await get_product_by_quota(Quota.RUNWAY)
+
+        user_not_finished_requests = await get_started_requests_by_user_id_and_product_id(user.id, product.id)
+
+        if len(user_not_finished_requests):
+            await message.reply(
+                text=get_localization(user_language_code).MODEL_ALREADY_MAKE_REQUEST,
+                allow_sending_without_reply=True,
+            )
+
+            await processing_sticker.delete()
+            await processing_message.delete()
+            await state.update_data(is_processing=False)
+            return
+
+        request = None
+        is_scheduled = False
         try:
             model_version = user.settings[Model.RUNWAY][UserSettings.VERSION]
             resolution = user.settings[Model.RUNWAY][UserSettings.RESOLUTION]
             duration = user.settings[Model.RUNWAY][UserSettings.DURATION]
 
-            cost = get_cost_for_video(duration)
-
             if prompt and user_language_code != LanguageCode.EN:
                 prompt = await translate_text(prompt, user_language_code, LanguageCode.EN)
 
@@ -119,52 +136,44 @@ async def handle_runway(message: Message, state: FSMContext, user: User, video_f
                 )
                 return
 
-            response = await get_response_video(
+            request = await write_request(
+                user_id=user.id,
+                processing_message_ids=[processing_sticker.message_id, processing_message.message_id],
+                product_id=product.id,
+                requested=1,
+            )
+
+            task_id = await run_checkpoint('runway:generate_video', lambda: generate_video(
                 model_version,
                 prompt,
                 video_frame_link,
                 resolution,
                 duration,
-            )
+            ))
 
-            product = await get_product_by_quota(Quota.RUNWAY)
-
-            total_price = PRICE_RUNWAY * cost
-            await write_transaction(
-                user_id=user.id,
-                type=TransactionType.EXPENSE,
+            await write_generation(
+                id=task_id,
+                request_id=request.id,
                 product_id=product.id,
-                amount=total_price,
-                clear_amount=total_price,
-                currency=Currency.USD,
-                quantity=1,
                 details={
-                    'prompt_text': prompt,
+                    'prompt': prompt,
                     'prompt_image': video_frame_link,
                     'resolution': resolution,
                     'duration': duration,
-                    'has_error': False,
+                    'message_id': message.message_id,
                 },
             )
 
-            footer_text = f'\n\n📹 {user.daily_limits[Quota.RUNWAY] + user.additional_usage_quota[Quota.RUNWAY]}' \
-                if user.settings[Model.RUNWAY][UserSettings.SHOW_USAGE_QUOTA] and \
-                   user.daily_limits[Quota.RUNWAY] != float('inf') else ''
-
-            if user.settings[Model.RUNWAY][UserSettings.SEND_TYPE] == SendType.DOCUMENT:
-                await message.reply_document(
-                    caption=f'{get_localization(user_language_code).GENERATION_VIDEO_SUCCESS}{footer_text}',
-                    document=response.get('result', [])[0],
-                    allow_sending_without_reply=True,
-                )
-            else:
-                await message.reply_video(
-                    caption=f'{get_localization(user_language_code).GENERATION_VIDEO_SUCCESS}{footer_text}',
-                    video=response.get('result', [])[0],
-                    allow_sending_without_reply=True,
-                )
-
-            await update_user_usage_quota(user, Quota.RUNWAY, cost)
+            await poll_scheduler.schedule(
+                PollJobKind.RUNWAY_VIDEO,
+                task_id,
+                {
+                    'id': task_id,
+                },
+                interval=10,
+                timeout=10 * 60,
+            )
+            is_scheduled = True
         except runwayml.RateLimitError:
             await message.reply(
                 text=get_localization(user_language_code).ERROR_SERVER_OVERLOADED,
@@ -218,6 +227,12 @@ async def handle_runway(message: Message, state: FSMContext, user: User, video_f
                 hashtags=['runway'],
             )
         finally:
-            await processing_sticker.delete()
-            await processing_message.delete()
+            if not is_scheduled:
+                if request:
+                    await update_request(request.id, {
+                        'status': RequestStatus.FINISHED,
+                    })
+
+                await processing_sticker.delete()
+                await processing_message.delete()
             await state.update_data(is_processing=False)
@@ -37,6 +37,7 @@ from bot.locales.main import get_user_language, get_localization
 from bot.locales.translate_text import translate_text
 from bot.locales.types import LanguageCode
 from bot.states.ai.suno import Suno
+from bot.utils.update_registry import run_checkpoint
 
 suno_router = Router()
 
@@ -208,7 +209,7 @@ async def suno_prompt_sent(message: Message, state: FSMContext):
             )
 
             try:
-                task_id = await generate_song(user.settings[Model.SUNO][UserSettings.VERSION], prompt)
+                task_id = await run_checkpoint('suno:generate_song', lambda: generate_song(user.settings[Model.SUNO][UserSettings.VERSION], prompt))
                 if task_id:
                     tasks = [
                         write_generation(
@@ -441,13 +442,13 @@ async def suno_genres_sent(message: Message, state: FSMContext):
                     },
                 )
 
-                task_id = await generate_song(
+                task_id = await run_checkpoint('suno:generate_song', lambda: generate_song(
                     user.settings[Model.SUNO][UserSettings.VERSION],
                     lyrics,
                     False,
                     True,
                     genres,
-                )
+                ))
                 if task_id:
                     tasks = [
                         write_generation(
@@ -9,29 +9,26 @@ from aiogram.types import Message, File
 
 from bot.database.main import firebase
 from bot.database.models.common import Model, ClaudeGPTVersion, GeminiGPTVersion, Quota
-from bot.database.models.user import UserSettings
-from bot.database.operations.user.getters import get_user
+from bot.database.models.user import UserSettings, User
 from bot.handlers.ai.claude_handler import handle_claude
 from bot.handlers.ai.gemini_handler import handle_gemini
 from bot.handlers.common.photo_handler import handle_photo, handle_album
 from bot.keyboards.common.common import build_buy_motivation_keyboard
 from bot.locales.main import get_localization, get_user_language
 from bot.middlewares.AlbumMiddleware import AlbumMiddleware
-from bot.utils.is_already_processing import is_already_processing
-from bot.utils.is_messages_limit_exceeded import is_messages_limit_exceeded
-from bot.utils.is_time_limit_exceeded import is_time_limit_exceeded
+from bot.utils.is_request_rejected import is_request_rejected
 
 document_router = Router()
 document_router.message.middleware(AlbumMiddleware())
 
 
 @document_router.message(F.document)
-async def document(message: Message, state: FSMContext, album: list[Message]):
+async def document(message: Message, state: FSMContext, user: User, album: list[Message]):
     if len(album):
-        await handle_album(message, state, album)
+        await handle_album(message, state, user, album)
     elif message.document.mime_type.startswith('image') and message.document.thumbnail:
         photo_file = await message.bot.get_file(message.document.file_id)
-        await handle_photo(message, state, photo_file)
+        await handle_photo(message, state, user, photo_file)
     elif (
         message.document.mime_type == 'application/pdf' or
         message.document.mime_type == 'application/x-javascript' or
@@ -49,7 +46,7 @@ async def document(message: Message, state: FSMContext, album: list[Message]):
         message.document.mime_type == 'text/rtf'
     ):
         document_file = await message.bot.get_file(message.document.file_id)
-        await handle_document(message, state, document_file)
+        await handle_document(message, state, user, document_file)
     else:
         user_id = str(message.from_user.id)
         user_language_code = await get_user_language(user_id, state.storage)
@@ -60,9 +57,8 @@ async def document(message: Message, state: FSMContext, album: list[Message]):
         )
 
 
-async def handle_document(message: Message, state: FSMContext, document_file: File):
-    user_id = str(message.from_user.id)
-    user = await get_user(user_id)
+async def handle_document(message: Message, state: FSMContext, user: User, document_file: File):
+    user_id = user.id
     user_language_code = await get_user_language(user_id, state.storage)
 
     if (
@@ -92,14 +88,9 @@ async def handle_document(message: Message, state: FSMContext, document_file: Fi
             )
 
         current_time = time.time()
-        need_exit = (
-            await is_already_processing(message, state, current_time) or
-            await is_messages_limit_exceeded(message, state, user, quota) or
-            await is_time_limit_exceeded(message, state, user, current_time)
-        )
+        need_exit = await is_request_rejected(message, state, user, quota, current_time)
         if need_exit:
             return
-        await state.update_data(last_request_time=current_time)
 
         document_data_io = await message.bot.download_file(document_file.file_path, timeout=300)
         document_data = await asyncio.to_thread(document_data_io.read)
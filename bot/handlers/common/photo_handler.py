@@ -22,7 +22,7 @@ from bot.database.models.common import (
     PhotoshopAIAction,
 )
 from bot.database.models.face_swap_package import FaceSwapPackageStatus
-from bot.database.models.user import UserSettings
+from bot.database.models.user import UserSettings, User
 from bot.database.operations.face_swap_package.getters import (
     get_face_swap_package,
     get_used_face_swap_packages_by_user_id,
@@ -32,7 +32,6 @@ from bot.database.operations.generation.writers import write_generation
 from bot.database.operations.product.getters import get_product_by_quota
 from bot.database.operations.request.getters import get_started_requests_by_user_id_and_product_id
 from bot.database.operations.request.writers import write_request
-from bot.database.operations.user.getters import get_user
 from bot.handlers.admin.face_swap_handler import handle_manage_face_swap
 from bot.handlers.ai.chat_gpt_handler import handle_chatgpt
 from bot.handlers.ai.claude_handler import handle_claude
@@ -57,17 +56,14 @@ from bot.states.common.catalog import Catalog
 from bot.states.ai.face_swap import FaceSwap
 from bot.states.ai.photoshop_ai import PhotoshopAI
 from bot.states.common.profile import Profile
-from bot.utils.is_already_processing import is_already_processing
-from bot.utils.is_messages_limit_exceeded import is_messages_limit_exceeded
-from bot.utils.is_time_limit_exceeded import is_time_limit_exceeded
+from bot.utils.is_request_rejected import is_request_rejected
 
 photo_router = Router()
 photo_router.message.middleware(AlbumMiddleware())
 
 
-async def handle_photo(message: Message, state: FSMContext, photo_file: File):
-    user_id = str(message.from_user.id)
-    user = await get_user(user_id)
+async def handle_photo(message: Message, state: FSMContext, user: User, photo_file: File):
+    user_id = user.id
     user_language_code = await get_user_language(user_id, state.storage)
 
     current_state = await state.get_state()
@@ -278,11 +274,7 @@ async def handle_photo(message: Message, state: FSMContext, photo_file: File):
             )
 
         current_time = time.time()
-        need_exit = (
-            await is_already_processing(message, state, current_time) or
-            await is_messages_limit_exceeded(message, state, user, quota) or
-            await is_time_limit_exceeded(message, state, user, current_time)
-        )
+        need_exit = await is_request_rejected(message, state, user, quota, current_time, update_last_request_time=False)
         if need_exit:
             return
 
@@ -312,14 +304,9 @@ async def handle_photo(message: Message, state: FSMContext, photo_file: File):
         current_time = time.time()
 
         user_quota = get_quota_by_model(user.current_model, user.settings[user.current_model][UserSettings.VERSION])
-        need_exit = (
-            await is_already_processing(message, state, current_time) or
-            await is_messages_limit_exceeded(message, state, user, user_quota) or
-            await is_time_limit_exceeded(message, state, user, current_time)
-        )
+        need_exit = await is_request_rejected(message, state, user, user_quota, current_time)
         if need_exit:
             return
-        await state.update_data(last_request_time=current_time)
 
         photo_data_io = await message.bot.download_file(photo_file.file_path, timeout=300)
         photo_data = await asyncio.to_thread(photo_data_io.read)
@@ -419,14 +406,9 @@ async def handle_photo(message: Message, state: FSMContext, photo_file: File):
         current_time = time.time()
 
         user_quota = get_quota_by_model(user.current_model, user.settings[user.current_model][UserSettings.VERSION])
-        need_exit = (
-            await is_already_processing(message, state, current_time) or
-            await is_messages_limit_exceeded(message, state, user, user_quota) or
-            await is_time_limit_exceeded(message, state, user, current_time)
-        )
+        need_exit = await is_request_rejected(message, state, user, user_quota, current_time)
         if need_exit:
             return
-        await state.update_data(last_request_time=current_time)
 
         photo_data_io = await message.bot.download_file(photo_file.file_path, timeout=300)
         photo_data = await asyncio.to_thread(photo_data_io.read)
@@ -453,9 +435,8 @@ async def handle_photo(message: Message, state: FSMContext, photo_file: File):
         )
 
 
-async def handle_album(message: Message, state: FSMContext, album: list[Message]):
-    user_id = str(message.from_user.id)
-    user = await get_user(user_id)
+async def handle_album(message: Message, state: FSMContext, user: User, album: list[Message]):
+    user_id = user.id
     user_language_code = await get_user_language(user_id, state.storage)
 
     if (
@@ -502,11 +483,7 @@ async def handle_album(message: Message, state: FSMContext, album: list[Message]
             )
 
         current_time = time.time()
-        need_exit = (
-            await is_already_processing(message, state, current_time) or
-            await is_messages_limit_exceeded(message, state, user, quota) or
-            await is_time_limit_exceeded(message, state, user, current_time)
-        )
+        need_exit = await is_request_rejected(message, state, user, quota, current_time, update_last_request_time=False)
         if need_exit:
             return
 
@@ -562,9 +539,9 @@ async def handle_album(message: Message, state: FSMContext, album: list[Message]
 
 
 @photo_router.message(F.photo)
-async def photo(message: Message, state: FSMContext, album: list[Message]):
+async def photo(message: Message, state: FSMContext, user: User, album: list[Message]):
     if len(album):
-        await handle_album(message, state, album)
+        await handle_album(message, state, user, album)
     else:
         photo_file = await message.bot.get_file(message.photo[-1].file_id)
-        await handle_photo(message, state, photo_file)
+        await handle_photo(message, state, user, photo_file)
@@ -8,8 +8,7 @@ from bot.database.models.common import (
     Model,
     MidjourneyAction,
 )
-from bot.database.models.user import UserSettings
-from bot.database.operations.user.getters import get_user
+from bot.database.models.user import UserSettings, User
 from bot.handlers.ai.chat_gpt_handler import handle_chatgpt
 from bot.handlers.ai.claude_handler import handle_claude
 from bot.handlers.ai.dalle_handler import handle_dall_e
@@ -33,17 +32,13 @@ from bot.handlers.ai.stable_diffusion_handler import handle_stable_diffusion
 from bot.handlers.ai.suno_handler import handle_suno
 from bot.handlers.common.common_handler import handle_help
 from bot.helpers.getters.get_quota_by_model import get_quota_by_model
-from bot.utils.is_already_processing import is_already_processing
-from bot.utils.is_messages_limit_exceeded import is_messages_limit_exceeded
-from bot.utils.is_time_limit_exceeded import is_time_limit_exceeded
+from bot.utils.is_request_rejected import is_request_rejected
 
 text_router = Router()
 
 
 @text_router.message(F.text, ~F.text.startswith('/'))
-async def handle_text(message: Message, state: FSMContext):
-    user = await get_user(str(message.from_user.id))
-
+async def handle_text(message: Message, state: FSMContext, user: User):
     current_time = time.time()
 
     user_quota = get_quota_by_model(user.current_model, user.settings[user.current_model][UserSettings.VERSION])
@@ -52,14 +47,9 @@ async def handle_text(message: Message, state: FSMContext):
             f'User Model Is Not Found: {user.current_model}, {user.settings[user.current_model][UserSettings.VERSION]}'
         )
 
-    need_exit = (
-        await is_already_processing(message, state, current_time) or
-        await is_messages_limit_exceeded(message, state, user, user_quota) or
-        await is_time_limit_exceeded(message, state, user, current_time)
-    )
+    need_exit = await is_request_rejected(message, state, user, user_quota, current_time)
     if need_exit:
         return
-    await state.update_data(last_request_time=current_time)
 
     if user.current_model == Model.CHAT_GPT:
         await handle_chatgpt(message, state, user, user_quota)
@@ -9,37 +9,29 @@ from aiogram.types import Message, Video
 from bot.config import config, MessageSticker
 from bot.database.main import firebase
 from bot.database.models.common import Model, Quota
-from bot.database.operations.user.getters import get_user
+from bot.database.models.user import User
 from bot.handlers.ai.face_swap_handler import handle_face_swap_video
 from bot.handlers.ai.gemini_video_handler import handle_gemini_video
 from bot.keyboards.ai.model import build_model_limit_exceeded_keyboard
 from bot.locales.main import get_user_language, get_localization
-from bot.utils.is_already_processing import is_already_processing
-from bot.utils.is_messages_limit_exceeded import is_messages_limit_exceeded
-from bot.utils.is_time_limit_exceeded import is_time_limit_exceeded
+from bot.utils.is_request_rejected import is_request_rejected
 
 video_router = Router()
 
 
 @video_router.message(F.video)
-async def video(message: Message, state: FSMContext):
-    await handle_video(message, state, message.video)
+async def video(message: Message, state: FSMContext, user: User):
+    await handle_video(message, state, user, message.video)
 
 
-async def handle_video(message: Message, state: FSMContext, video_file: Video):
-    user_id = str(message.from_user.id)
-    user = await get_user(user_id)
+async def handle_video(message: Message, state: FSMContext, user: User, video_file: Video):
+    user_id = user.id
     user_language_code = await get_user_language(user_id, state.storage)
 
     current_time = time.time()
-    need_exit = (
-        await is_already_processing(message, state, current_time) or
-        await is_messages_limit_exceeded(message, state, user, Quota.GEMINI_VIDEO) or
-        await is_time_limit_exceeded(message, state, user, current_time)
-    )
+    need_exit = await is_request_rejected(message, state, user, Quota.GEMINI_VIDEO, current_time)
     if need_exit:
         return
-    await state.update_data(last_request_time=current_time)
 
     if user.current_model == Model.GEMINI_VIDEO:
         if video_file.duration > 3600:
@@ -20,9 +20,8 @@ from bot.database.models.common import (
 )
 from bot.database.models.transaction import TransactionType
 from bot.database.models.user import UserSettings, User
-from bot.database.operations.product.getters import get_product_by_quota
+from bot.database.operations.product.getters import get_product_id_by_quota
 from bot.database.operations.transaction.writers import write_transaction
-from bot.database.operations.user.getters import get_user
 from bot.handlers.ai.chat_gpt_handler import handle_chatgpt
 from bot.handlers.ai.claude_handler import handle_claude
 from bot.handlers.ai.dalle_handler import handle_dall_e
@@ -49,9 +48,7 @@ from bot.integrations.open_ai import get_response_speech_to_text
 from bot.keyboards.common.common import build_buy_motivation_keyboard
 from bot.locales.main import get_localization, get_user_language
 from bot.locales.types import LanguageCode
-from bot.utils.is_already_processing import is_already_processing
-from bot.utils.is_messages_limit_exceeded import is_messages_limit_exceeded
-from bot.utils.is_time_limit_exceeded import is_time_limit_exceeded
+from bot.utils.is_request_rejected import is_request_rejected
 
 voice_router = Router()
 
@@ -91,13 +88,13 @@ async def process_voice_message(bot: Bot, voice: File, user: User, user_language
         text = await get_response_speech_to_text(audio_file)
         await asyncio.to_thread(audio_file.close)
 
-        product = await get_product_by_quota(Quota.VOICE_MESSAGES)
+        product_id = await get_product_id_by_quota(Quota.VOICE_MESSAGES)
 
         total_price = 0.0001 * math.ceil(audio_in_seconds)
         await write_transaction(
             user_id=user.id,
             type=TransactionType.EXPENSE,
-            product_id=product.id,
+            product_id=product_id,
             amount=total_price,
             clear_amount=total_price,
             currency=Currency.USD,
@@ -113,9 +110,8 @@ async def process_voice_message(bot: Bot, voice: File, user: User, user_language
 
 
 @voice_router.message(F.voice | F.audio | F.video_note)
-async def handle_voice(message: Message, state: FSMContext):
-    user_id = str(message.from_user.id)
-    user = await get_user(user_id)
+async def handle_voice(message: Message, state: FSMContext, user: User):
+    user_id = user.id
     user_language_code = await get_user_language(user_id, state.storage)
 
     if not (user.daily_limits[Quota.VOICE_MESSAGES] or user.additional_usage_quota[Quota.VOICE_MESSAGES]):
@@ -133,11 +129,7 @@ async def handle_voice(message: Message, state: FSMContext):
             f'User Model Is Not Found: {user.current_model}, {user.settings[user.current_model][UserSettings.VERSION]}'
         )
 
-    need_exit = (
-        await is_already_processing(message, state, current_time) or
-        await is_messages_limit_exceeded(message, state, user, user_quota) or
-        await is_time_limit_exceeded(message, state, user, current_time)
-    )
+    need_exit = await is_request_rejected(message, state, user, user_quota, current_time, update_last_request_time=False)
     if need_exit:
         return
 
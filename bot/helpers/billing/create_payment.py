@@ -4,7 +4,6 @@ import uuid
 from typing import Optional
 
 import aiohttp
-import stripe
 from aiohttp import BasicAuth
 from pydantic import BaseModel
 from yookassa import Configuration
@@ -13,11 +12,11 @@ from bot.config import config
 from bot.database.models.common import Currency, PaymentMethod
 from bot.database.models.product import Product
 from bot.database.models.user import User
+from bot.helpers.billing.get_stripe import get_stripe
 from bot.locales.types import LanguageCode
 
 Configuration.account_id = config.YOOKASSA_ACCOUNT_ID.get_secret_value()
 Configuration.secret_key = config.YOOKASSA_SECRET_KEY.get_secret_value()
-stripe.api_key = config.STRIPE_SECRET_KEY.get_secret_value()
 
 
 class OrderItem(BaseModel):
@@ -88,6 +87,7 @@ async def create_payment(
                 if response.ok:
                     return body
     elif payment_method == PaymentMethod.STRIPE:
+        stripe = get_stripe()
         items = []
         for order_item in order_items:
             product, price, quantity = order_item.product, order_item.price, order_item.quantity
@@ -0,0 +1,11 @@
+from types import ModuleType
+
+from bot.config import config
+
+
+def get_stripe() -> ModuleType:
+    # stripe takes over a second to import, so it is loaded by the first payment rather than on a cold start
+    import stripe
+
+    stripe.api_key = config.STRIPE_SECRET_KEY.get_secret_value()
+    return stripe
@@ -1,12 +1,21 @@
 import os
+from typing import Optional
 
 from google.cloud import bigquery
 from google.oauth2 import service_account
 
 from bot.config import config
 
-credentials = service_account.Credentials.from_service_account_file(
-    os.path.join(config.BASE_DIR, config.CERTIFICATE_NAME.get_secret_value())
-)
+client: Optional[bigquery.Client] = None
 
-client = bigquery.Client(credentials=credentials, project=credentials.project_id)
+
+def get_client() -> bigquery.Client:
+    global client
+    if client is None:
+        # the expenses report is the only reader, so the service account is not parsed on every cold start
+        credentials = service_account.Credentials.from_service_account_file(
+            os.path.join(config.BASE_DIR, config.CERTIFICATE_NAME.get_secret_value())
+        )
+        client = bigquery.Client(credentials=credentials, project=credentials.project_id)
+
+    return client
@@ -1,6 +1,5 @@
 from datetime import timedelta
 
-import stripe
 from aiogram import Bot
 from google.cloud import firestore
 
@@ -8,6 +7,7 @@ from bot.database.models.common import PaymentMethod
 from bot.database.models.subscription import Subscription, SubscriptionStatus, SubscriptionPeriod
 from bot.database.operations.product.getters import get_product
 from bot.database.operations.subscription.updaters import update_subscription_in_transaction
+from bot.helpers.billing.get_stripe import get_stripe
 from bot.helpers.senders.send_message_to_admins import send_message_to_admins
 from bot.locales.main import get_localization
 from bot.locales.types import LanguageCode
@@ -31,7 +31,7 @@ async def resubscribe(transaction, old_subscription: Subscription, bot: Bot):
     })
 
     if old_subscription.payment_method == PaymentMethod.STRIPE:
-        await stripe.Subscription.modify_async(
+        await get_stripe().Subscription.modify_async(
             old_subscription.stripe_id,
             cancel_at_period_end=False
         )
@@ -1,7 +1,6 @@
 import logging
 from datetime import datetime, timezone
 
-import stripe
 from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest
 from google.cloud import firestore
@@ -10,6 +9,7 @@ from bot.database.models.common import PaymentMethod
 from bot.database.models.subscription import Subscription, SubscriptionStatus
 from bot.database.operations.product.getters import get_product
 from bot.database.operations.subscription.updaters import update_subscription_in_transaction
+from bot.helpers.billing.get_stripe import get_stripe
 from bot.helpers.senders.send_message_to_admins import send_message_to_admins
 from bot.locales.main import get_localization
 from bot.locales.types import LanguageCode
@@ -29,7 +29,7 @@ async def unsubscribe(transaction, old_subscription: Subscription, bot: Bot):
     })
 
     if old_subscription.payment_method == PaymentMethod.STRIPE:
-        await stripe.Subscription.modify_async(
+        await get_stripe().Subscription.modify_async(
             old_subscription.stripe_id,
             cancel_at_period_end=True,
         )
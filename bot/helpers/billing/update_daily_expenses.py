@@ -5,7 +5,7 @@ from bot.database.models.common import Currency
 from bot.database.models.transaction import TransactionType, ServiceType
 from bot.database.operations.transaction.getters import get_transactions_by_product_id_and_created_time
 from bot.database.operations.transaction.writers import write_transaction
-from bot.helpers.billing.main import client
+from bot.helpers.billing.main import get_client
 
 
 async def update_daily_expenses(date: datetime):
@@ -35,7 +35,7 @@ GROUP BY
   service
 """
 
-    query_job = client.query(query)
+    query_job = get_client().query(query)
     server_expenses = 0
     database_expenses = 0
 
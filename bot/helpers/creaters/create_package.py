@@ -1,14 +1,13 @@
-from google.cloud import firestore
-
 from bot.database.models.package import PackageStatus
 from bot.database.operations.package.getters import get_package
 from bot.database.operations.package.updaters import update_package_in_transaction
 from bot.database.operations.product.getters import get_product
 from bot.database.operations.user.getters import get_user
 from bot.database.operations.user.updaters import update_user_in_transaction
+from bot.database.transactional import transactional
 
 
-@firestore.async_transactional
+@transactional
 async def create_package(
     transaction,
     package_id: str,
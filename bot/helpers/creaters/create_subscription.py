@@ -2,7 +2,6 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from aiogram import Bot
-from google.cloud import firestore
 
 from bot.database.models.subscription import SubscriptionStatus
 from bot.database.operations.product.getters import get_product
@@ -10,10 +9,11 @@ from bot.database.operations.subscription.getters import get_subscription, get_s
 from bot.database.operations.subscription.updaters import update_subscription_in_transaction
 from bot.database.operations.user.getters import get_user
 from bot.database.operations.user.updaters import update_user_in_transaction
+from bot.database.transactional import transactional
 from bot.helpers.billing.unsubscribe import unsubscribe
 
 
-@firestore.async_transactional
+@transactional
 async def create_subscription(
     transaction,
     bot: Bot,
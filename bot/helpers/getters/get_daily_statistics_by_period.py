@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from bot.database.models.statistics import DailyStatistics
+from bot.database.models.subscription import Subscription
+from bot.database.models.user import User
+from bot.database.operations.loader import Loader
+from bot.database.operations.statistics.getters import get_daily_statistics, get_days_without_users
+from bot.database.operations.transaction.getters import get_first_transaction
+from bot.helpers.updaters.update_daily_statistics import (
+    build_daily_statistics,
+    get_start_of_day,
+    update_daily_statistics,
+)
+
+
+async def get_daily_statistics_by_period(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> list[DailyStatistics]:
+    today = get_start_of_day(datetime.now(timezone.utc))
+
+    if not start_date:
+        first_transaction = await get_first_transaction()
+        if not first_transaction:
+            return []
+        start_date = first_transaction.created_at
+    start_date = get_start_of_day(start_date)
+    end_date = min(get_start_of_day(end_date), today) if end_date else today
+
+    daily_statistics = {
+        daily_statistics_item.id: daily_statistics_item
+        for daily_statistics_item in await get_daily_statistics(start_date, end_date)
+    }
+    for daily_statistics_item in await get_days_without_users(list(daily_statistics.values())):
+        daily_statistics.pop(daily_statistics_item.id)
+
+    users = Loader(User)
+    subscriptions = Loader(Subscription)
+    date = start_date
+    while date <= end_date:
+        date_id = date.strftime('%Y-%m-%d')
+        if date >= today:
+            # the current day is still being written to, so it is never served from a rollup
+            daily_statistics[date_id] = await build_daily_statistics(date, users, subscriptions)
+        elif date_id not in daily_statistics:
+            daily_statistics[date_id] = (await update_daily_statistics(date))[0]
+        date += timedelta(days=1)
+
+    return [daily_statistics[date_id] for date_id in sorted(daily_statistics)]
@@ -0,0 +1,78 @@
+import asyncio
+import base64
+import logging
+import pickle
+from typing import Optional
+
+from cachetools import LRUCache
+from filetype import filetype
+from redis.exceptions import RedisError
+
+from bot.config import config
+from bot.database.cache import cache
+from bot.database.main import firebase
+from bot.integrations.http_sessions import http_sessions
+
+# vision blobs are written once under a random name, so a path always points to the same bytes
+vision_attachment_cache = LRUCache(
+    maxsize=config.VISION_CACHE_MAX_BYTES,
+    getsizeof=lambda attachment: len(attachment['data']),
+)
+
+
+def read_vision_attachment(content: bytes) -> dict:
+    kind = filetype.guess(content)
+    if kind:
+        media_type = kind.mime
+    else:
+        try:
+            content.decode('utf-8')
+            media_type = 'text/plain'
+        except UnicodeDecodeError:
+            media_type = None
+
+    return {
+        'media_type': media_type,
+        'data': base64.b64encode(content).decode('utf-8'),
+    }
+
+
+async def get_vision_attachment(path: str) -> dict:
+    attachment = vision_attachment_cache.get(path)
+    if attachment is not None:
+        return attachment
+
+    key = f'vision:{path}'
+    payload: Optional[bytes] = None
+    if config.VISION_CACHE_REDIS_TTL_SECONDS:
+        try:
+            payload = await cache.redis.get(key)
+        except RedisError as e:
+            logging.warning(f'Vision cache get failed for {path}: {e}')
+
+    if payload is not None:
+        attachment = pickle.loads(payload)
+    else:
+        url = firebase.get_public_url(path)
+        async with http_sessions.get(url).get(url) as response:
+            response.raise_for_status()
+            content = await response.read()
+
+        attachment = await asyncio.to_thread(read_vision_attachment, content)
+        if config.VISION_CACHE_REDIS_TTL_SECONDS:
+            try:
+                await cache.redis.set(key, pickle.dumps(attachment), ex=config.VISION_CACHE_REDIS_TTL_SECONDS)
+            except RedisError as e:
+                logging.warning(f'Vision cache set failed for {path}: {e}')
+
+    if len(attachment['data']) <= vision_attachment_cache.maxsize:
+        vision_attachment_cache[path] = attachment
+
+    return attachment
+
+
+async def get_vision_attachments(paths: list[str]) -> dict[str, dict]:
+    unique_paths = list(dict.fromkeys(paths))
+    attachments = await asyncio.gather(*[get_vision_attachment(path) for path in unique_paths])
+
+    return dict(zip(unique_paths, attachments))
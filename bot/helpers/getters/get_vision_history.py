@@ -0,0 +1,34 @@
+from typing import Optional
+
+from bot.database.main import firebase
+from bot.database.models.message import Message
+
+
+def get_vision_history(user_id: str, messages: list[Message], allowed_extensions: Optional[list[str]] = None) -> list:
+    history = []
+    for message in messages:
+        content = []
+        if message.content:
+            content.append({
+                'type': 'text',
+                'text': message.content,
+            })
+
+        for photo_filename in message.photo_filenames:
+            if allowed_extensions and photo_filename.split('.')[-1] not in allowed_extensions:
+                continue
+
+            # vision blobs are public, so the url is derived from the path without asking storage
+            content.append({
+                'type': 'image_url',
+                'image_url': {
+                    'url': firebase.get_public_url(f'users/vision/{user_id}/{photo_filename}'),
+                },
+            })
+
+        history.append({
+            'role': message.sender,
+            'content': content,
+        })
+
+    return history
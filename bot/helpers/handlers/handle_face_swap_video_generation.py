@@ -0,0 +1,123 @@
+import asyncio
+
+from aiogram import Bot, Dispatcher
+
+from bot.config import config, MessageSticker
+from bot.database.models.common import Quota, Model, SendType, Currency
+from bot.database.models.generation import GenerationStatus
+from bot.database.models.request import RequestStatus
+from bot.database.models.transaction import TransactionType
+from bot.database.models.user import UserSettings
+from bot.database.operations.generation.getters import get_generation
+from bot.database.operations.generation.updaters import update_generation
+from bot.database.operations.request.getters import get_request
+from bot.database.operations.request.updaters import update_request
+from bot.database.operations.transaction.writers import write_transaction
+from bot.database.operations.user.getters import get_user
+from bot.helpers.senders.send_error_info import send_error_info
+from bot.helpers.updaters.update_user_usage_quota import update_user_usage_quota
+from bot.keyboards.common.common import build_error_keyboard
+from bot.locales.main import get_user_language, get_localization
+
+PRICE_FACE_SWAP_VIDEO = 0.02
+
+
+async def handle_face_swap_video_generation(bot: Bot, dp: Dispatcher, body: dict):
+    generation = await get_generation(body.get('id'))
+    if not generation:
+        return
+    elif generation.status == GenerationStatus.FINISHED:
+        return
+
+    request = await get_request(generation.request_id)
+    user = await get_user(request.user_id)
+
+    user_language_code = await get_user_language(user.id, dp.storage)
+
+    video_link = generation.details.get('video_link')
+    if body.get('progress') == 100 and body.get('output'):
+        video_result_url = body.get('output')[0]
+        footer_text = f'\n\n📹 {user.daily_limits[Quota.FACE_SWAP] + user.additional_usage_quota[Quota.FACE_SWAP]}' \
+            if user.settings[Model.FACE_SWAP][UserSettings.SHOW_USAGE_QUOTA] and \
+               user.daily_limits[Quota.FACE_SWAP] != float('inf') else ''
+        if user.settings[Model.FACE_SWAP][UserSettings.SEND_TYPE] == SendType.DOCUMENT:
+            await bot.send_document(
+                chat_id=user.telegram_chat_id,
+                caption=f'{get_localization(user_language_code).GENERATION_VIDEO_SUCCESS}{footer_text}',
+                document=video_result_url,
+                reply_to_message_id=generation.details.get('message_id'),
+                allow_sending_without_reply=True,
+            )
+        else:
+            await bot.send_video(
+                chat_id=user.telegram_chat_id,
+                caption=f'{get_localization(user_language_code).GENERATION_VIDEO_SUCCESS}{footer_text}',
+                video=video_result_url,
+                reply_to_message_id=generation.details.get('message_id'),
+                allow_sending_without_reply=True,
+            )
+
+        total_price = PRICE_FACE_SWAP_VIDEO * body.get('need_credits')
+        update_tasks = [
+            update_generation(generation.id, {
+                'status': GenerationStatus.FINISHED,
+                'result': video_result_url,
+            }),
+            update_request(request.id, {
+                'status': RequestStatus.FINISHED,
+            }),
+            write_transaction(
+                user_id=user.id,
+                type=TransactionType.EXPENSE,
+                product_id=generation.product_id,
+                amount=total_price,
+                clear_amount=total_price,
+                currency=Currency.USD,
+                quantity=1,
+                details={
+                    'result': video_result_url,
+                    'video_link': video_link,
+                    'has_error': False,
+                },
+            ),
+            update_user_usage_quota(
+                user,
+                Quota.FACE_SWAP,
+                generation.details.get('video_duration'),
+            ),
+        ]
+
+        await asyncio.gather(*update_tasks)
+    else:
+        await bot.send_sticker(
+            chat_id=user.telegram_chat_id,
+            sticker=config.MESSAGE_STICKERS.get(MessageSticker.ERROR),
+        )
+
+        await bot.send_message(
+            chat_id=user.telegram_chat_id,
+            text=get_localization(user_language_code).ERROR,
+            reply_markup=build_error_keyboard(user_language_code),
+        )
+        await send_error_info(
+            bot=bot,
+            user_id=user.id,
+            info=str(body.get('message') or 'Timeout Error'),
+            hashtags=['face_swap'],
+        )
+
+        await asyncio.gather(
+            update_request(request.id, {
+                'status': RequestStatus.FINISHED
+            }),
+            update_generation(generation.id, {
+                'status': GenerationStatus.FINISHED,
+                'has_error': True,
+            }),
+        )
+
+    for processing_message_id in request.processing_message_ids:
+        try:
+            await bot.delete_message(user.telegram_chat_id, processing_message_id)
+        except Exception:
+            continue
@@ -27,8 +27,10 @@ from bot.integrations.kling import Kling
 from bot.keyboards.common.common import build_reaction_keyboard, build_error_keyboard
 from bot.locales.main import get_user_language, get_localization
 from bot.locales.types import LanguageCode
+from bot.utils.metrics import observe_webhook
 
 
+@observe_webhook('kling')
 async def handle_kling_webhook(bot: Bot, dp: Dispatcher, body: dict):
     body = body.get('data')
     if body.get('status') == 'processing':
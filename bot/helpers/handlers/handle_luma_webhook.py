@@ -28,8 +28,10 @@ from bot.integrations.luma import get_cost_for_video
 from bot.keyboards.common.common import build_reaction_keyboard, build_error_keyboard
 from bot.locales.main import get_user_language, get_localization
 from bot.locales.types import LanguageCode
+from bot.utils.metrics import observe_webhook
 
 
+@observe_webhook('luma')
 async def handle_luma_webhook(bot: Bot, dp: Dispatcher, body: dict):
     if body.get('state') == 'queued' or body.get('state') == 'dreaming':
         return
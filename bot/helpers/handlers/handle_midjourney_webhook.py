@@ -26,8 +26,10 @@ from bot.keyboards.ai.midjourney import build_midjourney_keyboard
 from bot.keyboards.common.common import build_reaction_keyboard, build_error_keyboard, build_buy_motivation_keyboard
 from bot.locales.main import get_localization, get_user_language
 from bot.locales.types import LanguageCode
+from bot.utils.metrics import observe_webhook
 
 
+@observe_webhook('midjourney')
 async def handle_midjourney_webhook(bot: Bot, dp: Dispatcher, body: dict):
     body = body.get('data')
     if body.get('status') == 'processing':
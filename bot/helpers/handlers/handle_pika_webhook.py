@@ -24,8 +24,10 @@ from bot.helpers.senders.send_video import send_video
 from bot.helpers.updaters.update_user_usage_quota import update_user_usage_quota
 from bot.keyboards.common.common import build_error_keyboard, build_reaction_keyboard
 from bot.locales.main import get_user_language, get_localization
+from bot.utils.metrics import observe_webhook
 
 
+@observe_webhook('pika')
 async def handle_pika_webhook(bot: Bot, dp: Dispatcher, body: dict):
     generation = await get_generation(body.get('task_id'))
     if not generation:
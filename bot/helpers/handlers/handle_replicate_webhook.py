@@ -40,8 +40,10 @@ from bot.keyboards.ai.face_swap import build_face_swap_upload_photo_keyboard
 from bot.keyboards.common.common import build_reaction_keyboard, build_error_keyboard, build_buy_motivation_keyboard
 from bot.locales.main import get_user_language, get_localization
 from bot.locales.types import LanguageCode
+from bot.utils.metrics import observe_webhook
 
 
+@observe_webhook('replicate')
 async def handle_replicate_webhook(bot: Bot, dp: Dispatcher, prediction: dict):
     generation = await get_generation(prediction.get('id'))
     if not generation:
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+
+from aiogram import Bot, Dispatcher
+
+from bot.config import config, MessageSticker
+from bot.database.models.common import Quota, Model, SendType, Currency
+from bot.database.models.generation import GenerationStatus, Generation
+from bot.database.models.request import Request, RequestStatus
+from bot.database.models.transaction import TransactionType
+from bot.database.models.user import User, UserSettings
+from bot.database.operations.generation.getters import get_generation
+from bot.database.operations.generation.updaters import update_generation
+from bot.database.operations.request.getters import get_request
+from bot.database.operations.request.updaters import update_request
+from bot.database.operations.transaction.writers import write_transaction
+from bot.database.operations.user.getters import get_user
+from bot.helpers.senders.send_error_info import send_error_info
+from bot.helpers.updaters.update_user_usage_quota import update_user_usage_quota
+from bot.integrations.runway import get_cost_for_video
+from bot.keyboards.common.common import build_error_keyboard
+from bot.locales.main import get_user_language, get_localization
+from bot.locales.types import LanguageCode
+
+PRICE_RUNWAY = 0.25
+
+
+async def handle_runway_generation(bot: Bot, dp: Dispatcher, body: dict):
+    generation = await get_generation(body.get('id'))
+    if not generation:
+        return
+    elif generation.status == GenerationStatus.FINISHED:
+        return
+
+    request = await get_request(generation.request_id)
+    user = await get_user(request.user_id)
+
+    user_language_code = await get_user_language(user.id, dp.storage)
+
+    generation_error = body.get('failure_code') or body.get('failure') or ''
+    generation_result = (body.get('result') or [None])[0] if body.get('status') == 'SUCCEEDED' else None
+
+    generation.status = GenerationStatus.FINISHED
+    if not generation_result:
+        generation.has_error = True
+        await update_generation(generation.id, {
+            'status': generation.status,
+            'has_error': generation.has_error,
+        })
+
+        if 'safety' in generation_error.lower():
+            await bot.send_sticker(
+                chat_id=user.telegram_chat_id,
+                sticker=config.MESSAGE_STICKERS.get(MessageSticker.FEAR),
+            )
+            await bot.send_message(
+                chat_id=user.telegram_chat_id,
+                text=get_localization(user_language_code).ERROR_REQUEST_FORBIDDEN,
+            )
+
+            generation.has_error = False
+        else:
+            await send_error_info(
+                bot=bot,
+                user_id=user.id,
+                info=generation_error or body.get('status'),
+                hashtags=['runway'],
+            )
+            logging.exception(f'Error in runway_generation: {generation_error or body.get("status")}')
+    else:
+        generation.result = generation_result
+        await update_generation(generation.id, {
+            'status': generation.status,
+            'result': generation.result,
+        })
+
+    await handle_runway(bot, user, user_language_code, request, generation)
+
+
+async def handle_runway(
+    bot: Bot,
+    user: User,
+    user_language_code: LanguageCode,
+    request: Request,
+    generation: Generation,
+):
+    if generation.result:
+        footer_text = f'\n\n📹 {user.daily_limits[Quota.RUNWAY] + user.additional_usage_quota[Quota.RUNWAY]}' \
+            if user.settings[Model.RUNWAY][UserSettings.SHOW_USAGE_QUOTA] and \
+               user.daily_limits[Quota.RUNWAY] != float('inf') else ''
+        caption = f'{get_localization(user_language_code).GENERATION_VIDEO_SUCCESS}{footer_text}'
+
+        if user.settings[Model.RUNWAY][UserSettings.SEND_TYPE] == SendType.DOCUMENT:
+            await bot.send_document(
+                chat_id=user.telegram_chat_id,
+                caption=caption,
+                document=generation.result,
+                reply_to_message_id=generation.details.get('message_id'),
+                allow_sending_without_reply=True,
+            )
+        else:
+            await bot.send_video(
+                chat_id=user.telegram_chat_id,
+                caption=caption,
+                video=generation.result,
+                reply_to_message_id=generation.details.get('message_id'),
+                allow_sending_without_reply=True,
+            )
+    elif generation.has_error:
+        await bot.send_sticker(
+            chat_id=user.telegram_chat_id,
+            sticker=config.MESSAGE_STICKERS.get(MessageSticker.ERROR),
+        )
+
+        await bot.send_message(
+            chat_id=user.telegram_chat_id,
+            text=get_localization(user_language_code).ERROR,
+            reply_markup=build_error_keyboard(user_language_code),
+        )
+
+    if request.status != RequestStatus.FINISHED:
+        request.status = RequestStatus.FINISHED
+        await update_request(request.id, {
+            'status': request.status
+        })
+
+        if generation.result:
+            cost = get_cost_for_video(generation.details.get('duration'))
+            total_price = PRICE_RUNWAY * cost
+            update_tasks = [
+                write_transaction(
+                    user_id=user.id,
+                    type=TransactionType.EXPENSE,
+                    product_id=generation.product_id,
+                    amount=total_price,
+                    clear_amount=total_price,
+                    currency=Currency.USD,
+                    quantity=1,
+                    details={
+                        'prompt_text': generation.details.get('prompt'),
+                        'prompt_image': generation.details.get('prompt_image'),
+                        'resolution': generation.details.get('resolution'),
+                        'duration': generation.details.get('duration'),
+                        'has_error': False,
+                    },
+                ),
+                update_user_usage_quota(user, Quota.RUNWAY, cost),
+            ]
+
+            await asyncio.gather(*update_tasks)
+
+        for processing_message_id in request.processing_message_ids:
+            try:
+                await bot.delete_message(user.telegram_chat_id, processing_message_id)
+            except Exception:
+                continue
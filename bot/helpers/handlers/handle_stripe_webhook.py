@@ -43,6 +43,7 @@ from bot.keyboards.ai.model import build_switched_to_ai_keyboard
 from bot.keyboards.common.common import build_buy_motivation_keyboard
 from bot.locales.main import get_user_language, get_localization
 from bot.locales.types import LanguageCode
+from bot.utils.metrics import observe_webhook
 
 
 def get_net(amount: float):
@@ -55,6 +56,7 @@ def get_net(amount: float):
     return round(net, 2)
 
 
+@observe_webhook('stripe')
 async def handle_stripe_webhook(request: dict, bot: Bot, dp: Dispatcher):
     request_type = request.get('type', '')
     request_object = request.get('data', {}).get('object', {})
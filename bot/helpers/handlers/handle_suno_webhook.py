@@ -28,8 +28,10 @@ from bot.helpers.updaters.update_user_usage_quota import get_user_with_updated_q
 from bot.keyboards.ai.suno import build_suno_keyboard
 from bot.keyboards.common.common import build_reaction_keyboard, build_error_keyboard
 from bot.locales.main import get_user_language, get_localization
+from bot.utils.metrics import observe_webhook
 
 
+@observe_webhook('suno')
 async def handle_suno_webhook(bot: Bot, dp: Dispatcher, body: dict):
     first_generation = await get_generation(f'{body.get("task_id")}-1')
     second_generation = await get_generation(f'{body.get("task_id")}-2')
@@ -197,7 +199,8 @@ async def handle_suno_webhook(bot: Bot, dp: Dispatcher, body: dict):
             ),
             update_user(user.id, {
                 'daily_limits': user.daily_limits,
-                'additional_usage_quota': user.additional_usage_quota
+                'additional_usage_quota': user.additional_usage_quota,
+                'last_usage_at': user.last_usage_at,
             }),
         ]
 
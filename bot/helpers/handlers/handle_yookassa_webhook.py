@@ -45,8 +45,10 @@ from bot.keyboards.ai.model import build_switched_to_ai_keyboard
 from bot.keyboards.common.common import build_buy_motivation_keyboard
 from bot.locales.main import get_localization, get_user_language
 from bot.locales.types import LanguageCode
+from bot.utils.metrics import observe_webhook
 
 
+@observe_webhook('yookassa')
 async def handle_yookassa_webhook(request: dict, bot: Bot, dp: Dispatcher):
     notification_object = WebhookNotification(request)
     payment = notification_object.object
@@ -9,7 +9,7 @@ from bot.database.models.user import User
 from bot.database.operations.product.getters import get_product
 from bot.database.operations.subscription.getters import get_subscription
 from bot.helpers.checkers.check_user_last_activity import check_user_last_activity
-from bot.helpers.senders.send_message_to_users import send_message_to_user
+from bot.helpers.senders.send_message_to_users import DeliveryStatus, send_message_to_user
 from bot.helpers.senders.send_sticker import send_sticker
 from bot.keyboards.common.common import build_notify_about_quota_keyboard
 from bot.locales.main import get_user_language, get_localization
@@ -30,11 +30,14 @@ async def notify_user_about_quota(bot: Bot, user: User, storage: BaseStorage):
         else:
             subscription_limits = SUBSCRIPTION_FREE_LIMITS
 
-        await send_sticker(
+        sticker_status = await send_sticker(
             bot,
             user.id,
             config.MESSAGE_STICKERS.get(MessageSticker.HELLO),
         )
+        if sticker_status == DeliveryStatus.BLOCKED:
+            return
+
         await send_message_to_user(
             bot,
             user,
@@ -0,0 +1,13 @@
+from aiogram import Bot, Dispatcher
+
+from bot.helpers.handlers.handle_face_swap_video_generation import handle_face_swap_video_generation
+from bot.integrations.face_swap import get_face_swap_video_generation
+
+
+async def poll_face_swap_video(bot: Bot, dp: Dispatcher, payload: dict, is_last_attempt: bool) -> bool:
+    video_generation = await get_face_swap_video_generation(payload['id'])
+    if video_generation.get('progress') != 100 and not is_last_attempt:
+        return False
+
+    await handle_face_swap_video_generation(bot, dp, {**video_generation, 'id': payload['id']})
+    return True
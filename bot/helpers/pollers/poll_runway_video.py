@@ -0,0 +1,13 @@
+from aiogram import Bot, Dispatcher
+
+from bot.helpers.handlers.handle_runway_generation import handle_runway_generation
+from bot.integrations.runway import get_video_generation
+
+
+async def poll_runway_video(bot: Bot, dp: Dispatcher, payload: dict, is_last_attempt: bool) -> bool:
+    video_generation = await get_video_generation(payload['id'])
+    if video_generation.get('status') not in ['SUCCEEDED', 'FAILED', 'CANCELLED'] and not is_last_attempt:
+        return False
+
+    await handle_runway_generation(bot, dp, video_generation)
+    return True
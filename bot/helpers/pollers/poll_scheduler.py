@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import pickle
+import time
+from enum import StrEnum
+from typing import Awaitable, Callable, Optional
+
+from aiogram import Bot, Dispatcher
+
+from bot.config import config
+from bot.database.cache import cache
+from bot.utils.lease import Lease
+
+
+class PollJobKind(StrEnum):
+    RUNWAY_VIDEO = 'RUNWAY_VIDEO'
+    FACE_SWAP_VIDEO = 'FACE_SWAP_VIDEO'
+
+
+Poller = Callable[[Bot, Dispatcher, dict, bool], Awaitable[bool]]
+
+
+class PollScheduler:
+    KEY = 'poll:jobs'
+    PAYLOADS_KEY = 'poll:jobs:payloads'
+    LEASE_SECONDS = 60
+
+    bot: Optional[Bot]
+    dp: Optional[Dispatcher]
+    pollers: dict[str, Poller]
+    poll_task: Optional[asyncio.Task]
+
+    def __init__(self):
+        self.bot = None
+        self.dp = None
+        self.pollers = {}
+        self.poll_task = None
+
+    async def init(self, bot: Bot, dp: Dispatcher, pollers: dict[str, Poller]):
+        self.bot = bot
+        self.dp = dp
+        self.pollers = pollers
+        # jobs scheduled by a previous process are picked up on the first tick
+        self.poll_task = asyncio.create_task(self.run())
+
+    async def close(self):
+        if self.poll_task:
+            self.poll_task.cancel()
+            try:
+                await self.poll_task
+            except asyncio.CancelledError:
+                pass
+            self.poll_task = None
+
+    async def schedule(self, kind: str, job_id: str, payload: dict, interval: int, timeout: int):
+        job_id = f'{kind}:{job_id}'
+        async with cache.redis.pipeline(transaction=True) as pipeline:
+            pipeline.hset(self.PAYLOADS_KEY, job_id, pickle.dumps({
+                'kind': kind,
+                'payload': payload,
+                'interval': interval,
+                'deadline': time.time() + timeout,
+            }))
+            pipeline.zadd(self.KEY, {job_id: time.time() + interval})
+            await pipeline.execute()
+
+    async def run(self):
+        while True:
+            try:
+                while await self.tick():
+                    pass
+            except Exception as e:
+                logging.exception(f'Poll scheduler tick failed: {e}')
+
+            await asyncio.sleep(config.POLL_SCHEDULER_INTERVAL_SECONDS)
+
+    async def tick(self) -> int:
+        job_ids = await cache.redis.zrangebyscore(self.KEY, 0, time.time(), start=0, num=config.BATCH_SIZE)
+
+        leases = {}
+        for job_id in job_ids:
+            # the lease, not the zset entry, owns the job, so a crashed worker's jobs come back after it expires
+            lease = Lease(f'{self.KEY}:lease:{job_id.decode()}', self.LEASE_SECONDS)
+            if await lease.acquire():
+                leases[job_id.decode()] = lease
+
+        await asyncio.gather(*[self.poll(job_id, lease) for job_id, lease in leases.items()])
+        return len(leases)
+
+    async def poll(self, job_id: str, lease: Lease):
+        try:
+            job = await cache.redis.hget(self.PAYLOADS_KEY, job_id)
+            if not job:
+                await cache.redis.zrem(self.KEY, job_id)
+                return
+
+            job = pickle.loads(job)
+            is_last_attempt = time.time() >= job['deadline']
+            try:
+                is_finished = await self.pollers[job['kind']](self.bot, self.dp, job['payload'], is_last_attempt)
+            except Exception as e:
+                logging.exception(f'Poll job {job_id} failed: {e}')
+                is_finished = is_last_attempt
+
+            async with cache.redis.pipeline(transaction=True) as pipeline:
+                if is_finished:
+                    pipeline.zrem(self.KEY, job_id)
+                    pipeline.hdel(self.PAYLOADS_KEY, job_id)
+                else:
+                    pipeline.zadd(self.KEY, {job_id: time.time() + job['interval']})
+                await pipeline.execute()
+        finally:
+            await lease.release()
+
+
+poll_scheduler = PollScheduler()
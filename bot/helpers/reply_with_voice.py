@@ -5,7 +5,7 @@ from aiogram.types import Message, InlineKeyboardMarkup, BufferedInputFile
 
 from bot.database.models.common import Currency, Quota
 from bot.database.models.transaction import TransactionType
-from bot.database.operations.product.getters import get_product_by_quota
+from bot.database.operations.product.getters import get_product_id_by_quota
 from bot.database.operations.transaction.writers import write_transaction
 from bot.integrations.open_ai import get_response_text_to_speech
 
@@ -19,13 +19,13 @@ async def reply_with_voice(
 ):
     audio_content = await get_response_text_to_speech(text, voice)
 
-    product = await get_product_by_quota(Quota.VOICE_MESSAGES)
+    product_id = await get_product_id_by_quota(Quota.VOICE_MESSAGES)
 
     total_price = 0.000015 * len(text)
     await write_transaction(
         user_id=user_id,
         type=TransactionType.EXPENSE,
-        product_id=product.id,
+        product_id=product_id,
         amount=total_price,
         clear_amount=total_price,
         currency=Currency.USD,
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import pickle
+import time
+import traceback
+import uuid
+from enum import StrEnum
+from typing import Awaitable, Callable, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter, TelegramNetworkError
+from aiogram.types import InputMediaPhoto, URLInputFile
+from aiohttp import ClientOSError
+from redis.exceptions import ConnectionError
+
+from bot.config import config
+from bot.database.cache import cache
+from bot.database.operations.user.updaters import update_user
+from bot.utils.lease import Lease
+from bot.utils.telegram_rate_limiter import telegram_rate_limiter
+
+
+class OutboxKind(StrEnum):
+    TEXT = 'TEXT'
+    PHOTO = 'PHOTO'
+    MEDIA_GROUP = 'MEDIA_GROUP'
+    DOCUMENT = 'DOCUMENT'
+    UPDATE = 'UPDATE'
+
+
+Sender = Callable[[Bot, dict], Awaitable]
+
+
+async def send_text(bot: Bot, payload: dict):
+    await bot.send_message(**payload)
+
+
+async def send_photo(bot: Bot, payload: dict):
+    extension = payload['photo'].rsplit('.', 1)[-1]
+    await bot.send_photo(**{
+        **payload,
+        'photo': URLInputFile(payload['photo'], filename=f'{uuid.uuid4()}.{extension}', timeout=300),
+    })
+
+
+async def send_media_group(bot: Bot, payload: dict):
+    await bot.send_media_group(
+        chat_id=payload['chat_id'],
+        media=[InputMediaPhoto(media=image) for image in payload['images']],
+    )
+
+
+async def send_document(bot: Bot, payload: dict):
+    extension = payload['document'].rsplit('.', 1)[-1]
+    await bot.send_document(**{
+        **payload,
+        'document': URLInputFile(payload['document'], filename=f'{uuid.uuid4()}.{extension}', timeout=300),
+    })
+
+
+class Outbox:
+    KEY = 'outbox:jobs'
+    PAYLOADS_KEY = 'outbox:jobs:payloads'
+    DEAD_KEY = 'outbox:dead'
+    LEASE_SECONDS = 60
+    DEAD_TTL_SECONDS = 7 * 24 * 60 * 60
+    NETWORK_RETRY_SECONDS = 60
+
+    bot: Optional[Bot]
+    senders: dict[str, Sender]
+    run_task: Optional[asyncio.Task]
+
+    def __init__(self):
+        self.bot = None
+        self.senders = {
+            OutboxKind.TEXT: send_text,
+            OutboxKind.PHOTO: send_photo,
+            OutboxKind.MEDIA_GROUP: send_media_group,
+            OutboxKind.DOCUMENT: send_document,
+        }
+        self.run_task = None
+
+    async def init(self, bot: Bot, senders: dict[str, Sender]):
+        self.bot = bot
+        self.senders.update(senders)
+        # deliveries queued before a restart are picked up on the first tick
+        self.run_task = asyncio.create_task(self.run())
+
+    async def close(self):
+        if self.run_task:
+            self.run_task.cancel()
+            try:
+                await self.run_task
+            except asyncio.CancelledError:
+                pass
+            self.run_task = None
+
+    async def enqueue(self, kind: str, payload: dict, delay: float, user_id: Optional[str] = None):
+        job_id = uuid.uuid4().hex
+        async with cache.redis.pipeline(transaction=True) as pipeline:
+            pipeline.hset(self.PAYLOADS_KEY, job_id, pickle.dumps({
+                'kind': kind,
+                'payload': payload,
+                'user_id': user_id,
+                'attempts': 0,
+            }))
+            pipeline.zadd(self.KEY, {job_id: time.time() + delay})
+            await pipeline.execute()
+
+    async def run(self):
+        while True:
+            try:
+                while await self.tick():
+                    pass
+            except Exception as e:
+                logging.exception(f'Outbox tick failed: {e}')
+
+            await asyncio.sleep(config.OUTBOX_INTERVAL_SECONDS)
+
+    async def tick(self) -> int:
+        job_ids = await cache.redis.zrangebyscore(self.KEY, 0, time.time(), start=0, num=config.BATCH_SIZE)
+
+        leases = {}
+        for job_id in job_ids:
+            lease = Lease(f'{self.KEY}:lease:{job_id.decode()}', self.LEASE_SECONDS)
+            if await lease.acquire():
+                leases[job_id.decode()] = lease
+
+        await asyncio.gather(*[self.deliver(job_id, lease) for job_id, lease in leases.items()])
+        return len(leases)
+
+    async def deliver(self, job_id: str, lease: Lease):
+        try:
+            payload = await cache.redis.hget(self.PAYLOADS_KEY, job_id)
+            if not payload:
+                await cache.redis.zrem(self.KEY, job_id)
+                return
+
+            try:
+                job = pickle.loads(payload)
+            except Exception as e:
+                logging.exception(f'Outbox job {job_id} is corrupt, moving it to {self.DEAD_KEY}: {e}')
+                async with cache.redis.pipeline(transaction=True) as pipeline:
+                    self.bury(pipeline, job_id, payload)
+                    await pipeline.execute()
+                return
+
+            chat_id = job['payload'].get('chat_id')
+            if chat_id:
+                await telegram_rate_limiter.acquire(str(chat_id))
+
+            retry_after, error = None, None
+            try:
+                await self.senders[job['kind']](self.bot, job['payload'])
+            except TelegramRetryAfter as e:
+                telegram_rate_limiter.pause(e.retry_after)
+                retry_after, error = e.retry_after + 30, str(e)
+            except TelegramForbiddenError as e:
+                if job['user_id']:
+                    await update_user(job['user_id'], {'is_blocked': True})
+                else:
+                    logging.error(e)
+            except (ConnectionResetError, OSError, ClientOSError, ConnectionError, TelegramNetworkError) as e:
+                retry_after, error = self.NETWORK_RETRY_SECONDS, repr(e)
+            except TelegramBadRequest as e:
+                logging.error(e)
+                error = str(e)
+            except Exception as e:
+                error_trace = traceback.format_exc()
+                logging.exception(f'Error in outbox: {error_trace}')
+                error = repr(e)
+
+            job['attempts'] += 1
+            async with cache.redis.pipeline(transaction=True) as pipeline:
+                if retry_after is not None and job['attempts'] < config.OUTBOX_MAX_ATTEMPTS:
+                    pipeline.hset(self.PAYLOADS_KEY, job_id, pickle.dumps(job))
+                    pipeline.zadd(self.KEY, {job_id: time.time() + retry_after})
+                else:
+                    if error:
+                        self.bury(pipeline, job_id, pickle.dumps({**job, 'error': error}))
+                    else:
+                        pipeline.zrem(self.KEY, job_id)
+                        pipeline.hdel(self.PAYLOADS_KEY, job_id)
+                await pipeline.execute()
+        finally:
+            await lease.release()
+
+    def bury(self, pipeline, job_id: str, payload: bytes):
+        # every dead job has its own key, so each one expires on its own schedule
+        pipeline.set(f'{self.DEAD_KEY}:{job_id}', payload, ex=self.DEAD_TTL_SECONDS)
+        pipeline.zrem(self.KEY, job_id)
+        pipeline.hdel(self.PAYLOADS_KEY, job_id)
+
+
+outbox = Outbox()
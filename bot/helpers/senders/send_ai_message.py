@@ -1,4 +1,7 @@
 import asyncio
+import logging
+import time
+from typing import AsyncIterator
 
 from aiogram.enums import ParseMode
 from aiogram.exceptions import TelegramBadRequest, TelegramNetworkError, TelegramRetryAfter
@@ -8,6 +11,7 @@ from redis.exceptions import ConnectionError
 from telegramify_markdown import markdownify, customize
 
 from bot.config import config
+from bot.helpers.senders.outbox import outbox, OutboxKind
 from bot.helpers.split_message import split_message
 
 markdown_symbol = customize.get_runtime_config().markdown_symbol
@@ -15,19 +19,6 @@ markdown_symbol.head_level_3 = '🔖'
 markdown_symbol.head_level_4 = '🔹'
 
 
-async def delayed_send_ai_message(message: Message, text: str, timeout: int, reply_markup=None):
-    await asyncio.sleep(timeout)
-
-    try:
-        await message.reply(
-            text=text,
-            reply_markup=reply_markup,
-            allow_sending_without_reply=True,
-        )
-    except TelegramRetryAfter as e:
-        asyncio.create_task(delayed_send_ai_message(message, text, e.retry_after + 30, reply_markup))
-
-
 async def send_ai_message(message: Message, text: str, reply_markup=None):
     formatted_text = markdownify(
         content=text,
@@ -52,14 +43,13 @@ async def send_ai_message(message: Message, text: str, reply_markup=None):
                         raise e
                     continue
         except TelegramRetryAfter as e:
-            asyncio.create_task(
-                delayed_send_ai_message(
-                    message,
-                    formatted_message,
-                    e.retry_after + 30,
-                    reply_markup if i == len(messages) - 1 else None,
-                )
-            )
+            await outbox.enqueue(OutboxKind.TEXT, {
+                'chat_id': message.chat.id,
+                'text': formatted_message,
+                'reply_markup': reply_markup if i == len(messages) - 1 else None,
+                'reply_to_message_id': message.message_id,
+                'allow_sending_without_reply': True,
+            }, e.retry_after + 30)
         except TelegramBadRequest as e:
             if e.message.startswith('Bad Request: can\'t parse entities'):
                 await message.reply(
@@ -82,3 +72,108 @@ async def send_ai_message(message: Message, text: str, reply_markup=None):
                 )
             else:
                 raise e
+
+
+class StreamingAIMessage:
+    message: Message
+    header_text: str
+    text: str
+    sent_messages: list[Message]
+    sent_texts: list[str]
+    next_edit_time: float
+
+    def __init__(self, message: Message, header_text=''):
+        self.message = message
+        self.header_text = header_text
+        self.text = ''
+        self.sent_messages = []
+        self.sent_texts = []
+        self.next_edit_time = 0.0
+
+    async def stream(self, response_stream: AsyncIterator[dict]) -> dict:
+        self.text = ''
+        response = {}
+        async for chunk in response_stream:
+            if 'delta' in chunk:
+                self.text += chunk['delta']
+                if time.monotonic() >= self.next_edit_time:
+                    await self.edit_in_progress()
+            else:
+                response.update(chunk)
+
+        response['message'] = self.text
+        return response
+
+    async def edit_in_progress(self):
+        try:
+            await self.render(f'{self.header_text}{self.text}')
+            self.next_edit_time = time.monotonic() + config.STREAM_EDIT_INTERVAL_SECONDS
+        except TelegramRetryAfter as e:
+            self.next_edit_time = time.monotonic() + e.retry_after
+        except (ConnectionResetError, OSError, ClientOSError, ConnectionError, TelegramNetworkError):
+            pass
+        except TelegramBadRequest as e:
+            logging.warning(f'Failed to edit a streaming message: {e}')
+            self.next_edit_time = time.monotonic() + config.STREAM_EDIT_INTERVAL_SECONDS
+
+    async def finish(self, text: str, reply_markup=None):
+        formatted_text = markdownify(
+            content=text,
+            normalize_whitespace=True,
+        )
+
+        for i in range(config.MAX_RETRIES):
+            try:
+                try:
+                    await self.render(formatted_text, ParseMode.MARKDOWN_V2, reply_markup, True)
+                except TelegramBadRequest as e:
+                    if e.message.startswith('Bad Request: can\'t parse entities'):
+                        await self.render(text, None, reply_markup, True)
+                    else:
+                        raise e
+                break
+            except TelegramRetryAfter as e:
+                if i == config.MAX_RETRIES - 1:
+                    raise e
+                await asyncio.sleep(e.retry_after)
+            except (ConnectionResetError, OSError, ClientOSError, ConnectionError, TelegramNetworkError) as e:
+                if i == config.MAX_RETRIES - 1:
+                    raise e
+
+    async def render(self, text: str, parse_mode=None, reply_markup=None, is_final=False):
+        parts = [part[:4096] for part in split_message(text) if part.strip()]
+        for i, part in enumerate(parts):
+            part_reply_markup = reply_markup if i == len(parts) - 1 else None
+            if i < len(self.sent_messages):
+                if part == self.sent_texts[i] and not is_final:
+                    continue
+
+                try:
+                    await self.sent_messages[i].edit_text(
+                        text=part,
+                        reply_markup=part_reply_markup,
+                        parse_mode=parse_mode,
+                    )
+                except TelegramBadRequest as e:
+                    if not e.message.startswith('Bad Request: message is not modified'):
+                        raise e
+            else:
+                self.sent_messages.append(
+                    await self.message.reply(
+                        text=part,
+                        reply_markup=part_reply_markup,
+                        allow_sending_without_reply=True,
+                        parse_mode=parse_mode,
+                    )
+                )
+                self.sent_texts.append(part)
+            self.sent_texts[i] = part
+
+        if is_final:
+            for sent_message in self.sent_messages[len(parts):]:
+                try:
+                    await sent_message.delete()
+                except TelegramBadRequest:
+                    pass
+            self.sent_messages = self.sent_messages[:len(parts)]
+            self.sent_texts = self.sent_texts[:len(parts)]
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import traceback
 
@@ -8,36 +7,7 @@ from aiohttp import ClientOSError
 from redis.exceptions import ConnectionError
 
 from bot.config import config
-
-
-async def delayed_send_message_to_developers(
-    bot: Bot,
-    chat_id: str,
-    text: str,
-    parse_mode: str,
-    timeout: int,
-):
-    await asyncio.sleep(timeout)
-
-    try:
-        await bot.send_message(
-            chat_id=chat_id,
-            text=text,
-            parse_mode=parse_mode,
-        )
-    except (TelegramBadRequest, TelegramForbiddenError) as error:
-        logging.error(error)
-    except TelegramRetryAfter as e:
-        asyncio.create_task(
-            delayed_send_message_to_developers(bot, chat_id, text, parse_mode, e.retry_after + 30)
-        )
-    except (ConnectionResetError, OSError, ClientOSError, ConnectionError, TelegramNetworkError):
-        asyncio.create_task(
-            delayed_send_message_to_developers(bot, chat_id, text, parse_mode, 60)
-        )
-    except Exception:
-        error_trace = traceback.format_exc()
-        logging.exception(f'Error in delayed_send_message_to_developers: {error_trace}')
+from bot.helpers.senders.outbox import outbox, OutboxKind
 
 
 async def send_message_to_developers(bot: Bot, message: str, parse_mode='HTML'):
@@ -51,13 +21,17 @@ async def send_message_to_developers(bot: Bot, message: str, parse_mode='HTML'):
         except (TelegramBadRequest, TelegramForbiddenError) as error:
             logging.error(error)
         except TelegramRetryAfter as e:
-            asyncio.create_task(
-                delayed_send_message_to_developers(bot, chat_id, message, parse_mode, e.retry_after + 30)
-            )
+            await outbox.enqueue(OutboxKind.TEXT, {
+                'chat_id': chat_id,
+                'text': message,
+                'parse_mode': parse_mode,
+            }, e.retry_after + 30)
         except (ConnectionResetError, OSError, ClientOSError, ConnectionError, TelegramNetworkError):
-            asyncio.create_task(
-                delayed_send_message_to_developers(bot, chat_id, message, parse_mode, 60)
-            )
+            await outbox.enqueue(OutboxKind.TEXT, {
+                'chat_id': chat_id,
+                'text': message,
+                'parse_mode': parse_mode,
+            }, 60)
         except Exception:
             error_trace = traceback.format_exc()
             logging.exception(f'Error in send_message_to_developers: {error_trace}')
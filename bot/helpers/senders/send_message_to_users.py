@@ -1,89 +1,274 @@
 import asyncio
 import logging
+import pickle
+import time
 import traceback
+import uuid
+from enum import StrEnum
+from typing import Awaitable, Callable, Optional
 
 from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter, TelegramForbiddenError, TelegramNetworkError
 from aiohttp import ClientOSError
 from redis.exceptions import ConnectionError
 
+from bot.config import config
+from bot.database.cache import cache
 from bot.database.models.user import User
 from bot.database.operations.user.getters import get_users_by_language_code
 from bot.database.operations.user.updaters import update_user
+from bot.helpers.senders.send_message_to_admins_and_developers import send_message_to_admins_and_developers
 from bot.locales.types import LanguageCode
+from bot.utils.lease import Lease
+from bot.utils.telegram_rate_limiter import telegram_rate_limiter
 
-BATCH_SIZE = 30
-DELAY_SECONDS = 1
+BROADCASTS_KEY = 'broadcasts:running'
+BROADCAST_TTL_SECONDS = 7 * 24 * 60 * 60
+BROADCAST_LOCK_TTL_SECONDS = 60
+BROADCAST_MAX_ATTEMPTS = 5
+NETWORK_RETRY_SECONDS = 60
 
 
-async def delayed_send_message_to_user(bot: Bot, chat_id: str, text: str, timeout: int, reply_markup=None):
-    await asyncio.sleep(timeout)
+class DeliveryStatus(StrEnum):
+    SENT = 'SENT'
+    BLOCKED = 'BLOCKED'
+    FAILED = 'FAILED'
+    RETRY = 'RETRY'
+
+
+async def deliver(user_id: str, chat_id: str, send: Callable[[], Awaitable]) -> tuple[DeliveryStatus, int]:
+    await telegram_rate_limiter.acquire(chat_id)
 
     try:
-        await bot.send_message(
-            chat_id=chat_id,
-            text=text,
-            reply_markup=reply_markup,
-            disable_notification=True,
-        )
+        await send()
+        return DeliveryStatus.SENT, 0
     except TelegramForbiddenError:
-        asyncio.create_task(update_user(chat_id, {'is_blocked': True}))
+        await update_user(user_id, {'is_blocked': True})
+        return DeliveryStatus.BLOCKED, 0
     except TelegramRetryAfter as e:
-        asyncio.create_task(
-            delayed_send_message_to_user(bot, chat_id, text, e.retry_after + 30, reply_markup)
-        )
+        telegram_rate_limiter.pause(e.retry_after)
+        return DeliveryStatus.RETRY, e.retry_after
     except (ConnectionResetError, OSError, ClientOSError, ConnectionError, TelegramNetworkError):
-        asyncio.create_task(
-            delayed_send_message_to_user(bot, chat_id, text, 60, reply_markup)
-        )
+        return DeliveryStatus.RETRY, NETWORK_RETRY_SECONDS
     except TelegramBadRequest as error:
         logging.error(error)
+        return DeliveryStatus.FAILED, 0
     except Exception:
         error_trace = traceback.format_exc()
-        logging.exception(f'Error in delayed_send_message: {error_trace}')
+        logging.exception(f'Error in deliver: {error_trace}')
+        return DeliveryStatus.FAILED, 0
+
+
+async def deliver_with_retries(user_id: str, chat_id: str, send: Callable[[], Awaitable]) -> DeliveryStatus:
+    for i in range(config.MAX_RETRIES):
+        status, retry_after = await deliver(user_id, chat_id, send)
+        if status != DeliveryStatus.RETRY or i == config.MAX_RETRIES - 1:
+            return status
+        await asyncio.sleep(retry_after)
+
+
+async def send_message_to_user(bot: Bot, user: User, message: str, reply_markup=None) -> Optional[DeliveryStatus]:
+    if user.is_blocked:
+        return
+
+    return await deliver_with_retries(
+        user.id,
+        user.telegram_chat_id,
+        lambda: bot.send_message(
+            chat_id=user.telegram_chat_id,
+            text=message,
+            reply_markup=reply_markup,
+            disable_notification=True,
+        ),
+    )
+
+
+def is_broadcast_recipient(user: User, user_type: str) -> bool:
+    return not user.is_blocked and (
+        user_type == 'all' or
+        (user_type == 'free' and not user.subscription_id) or
+        (user_type == 'paid' and user.subscription_id)
+    )
+
+
+async def send_broadcast_message(
+    bot: Bot,
+    broadcast_key: str,
+    user_id: str,
+    chat_id: str,
+    params: dict,
+) -> DeliveryStatus:
+    status, retry_after = await deliver(
+        user_id,
+        chat_id,
+        lambda: bot.send_message(
+            chat_id=chat_id,
+            text=params['message'],
+            reply_markup=params['reply_markup'],
+            disable_notification=True,
+        ),
+    )
+
+    if status == DeliveryStatus.RETRY:
+        attempts = await cache.redis.hincrby(f'{broadcast_key}:attempts', user_id, 1)
+        if attempts < BROADCAST_MAX_ATTEMPTS:
+            await cache.redis.zadd(f'{broadcast_key}:retry', {f'{user_id}:{chat_id}': time.time() + retry_after})
+        else:
+            status = DeliveryStatus.FAILED
+
+    # a recipient waiting for a retry is handled too, the retry zset owns its next attempt
+    async with cache.redis.pipeline(transaction=True) as pipeline:
+        pipeline.hincrby(broadcast_key, status.lower(), 1)
+        pipeline.sadd(f'{broadcast_key}:handled', user_id)
+        await pipeline.execute()
+
+    return status
+
+
+async def send_broadcast_page(bot: Bot, broadcast_key: str, users: list[User], params: dict):
+    recipients = [user for user in users if is_broadcast_recipient(user, params['user_type'])]
+    if not recipients:
+        return
+
+    # the cursor only moves per page, so recipients reached before a crash are skipped by the instance that resumes
+    is_handled = await cache.redis.smismember(f'{broadcast_key}:handled', [user.id for user in recipients])
+    await asyncio.gather(*[
+        send_broadcast_message(bot, broadcast_key, user.id, user.telegram_chat_id, params)
+        for user, is_user_handled in zip(recipients, is_handled) if not is_user_handled
+    ])
+
+
+async def send_due_broadcast_retries(bot: Bot, broadcast_key: str, params: dict):
+    due_members = await cache.redis.zrangebyscore(f'{broadcast_key}:retry', 0, time.time())
+    if not due_members:
+        return
+
+    await cache.redis.zrem(f'{broadcast_key}:retry', *due_members)
+    await asyncio.gather(*[
+        send_broadcast_message(bot, broadcast_key, *member.decode().split(':', 1), params)
+        for member in due_members
+    ])
+
 
+async def report_broadcast(bot: Bot, broadcast_id: str, state: dict[bytes, bytes], params: dict):
+    started_at = float(state[b'started_at'])
+    finished_at = float(state[b'finished_at'])
+    sent = int(state.get(b'sent', 0))
+    duration = max(finished_at - started_at, 1)
+
+    await send_message_to_admins_and_developers(
+        bot,
+        f'<b>Broadcast Finished</b> 📣\n\n'
+        f'🆔 {broadcast_id}\n'
+        f'🌍 {params["language_code"]}, {params["user_type"]}\n\n'
+        f'✅ Sent: {sent}\n'
+        f'⛔️ Blocked: {int(state.get(b"blocked", 0))}\n'
+        f'❌ Failed: {int(state.get(b"failed", 0))}\n'
+        f'🔁 Retried: {int(state.get(b"retry", 0))}\n\n'
+        f'⏱ Duration: {round(duration)}s\n'
+        f'🚀 Speed: {round(sent / duration, 2)} msg/s',
+    )
+
+
+async def run_broadcast(bot: Bot, broadcast_id: str) -> dict:
+    broadcast_key = f'broadcast:{broadcast_id}'
+
+    # several instances may restart at once, only one of them continues a broadcast
+    lease = Lease(f'{broadcast_key}:lock', BROADCAST_LOCK_TTL_SECONDS)
+    if not await lease.acquire():
+        return {}
 
-async def send_message_to_user(bot: Bot, user: User, message: str, reply_markup=None):
     try:
-        if not user.is_blocked:
-            await bot.send_message(
-                chat_id=user.telegram_chat_id,
-                text=message,
-                reply_markup=reply_markup,
-                disable_notification=True,
-            )
-    except TelegramForbiddenError:
-        asyncio.create_task(update_user(user.id, {'is_blocked': True}))
-    except TelegramRetryAfter as e:
-        asyncio.create_task(
-            delayed_send_message_to_user(bot, user.telegram_chat_id, message, e.retry_after + 30, reply_markup)
-        )
-    except (ConnectionResetError, OSError, ClientOSError, ConnectionError, TelegramNetworkError):
-        asyncio.create_task(
-            delayed_send_message_to_user(bot, user.telegram_chat_id, message, 60, reply_markup)
-        )
-    except TelegramBadRequest as error:
-        logging.exception(error)
+        state = await cache.redis.hgetall(broadcast_key)
+        params = pickle.loads(state[b'params'])
+        last_user_id = state[b'cursor'].decode() if state.get(b'cursor') else None
+
+        if state.get(b'status') != b'DELIVERED':
+            while True:
+                if not lease.is_held:
+                    return {}
+
+                users = await get_users_by_language_code(params['language_code'], last_user_id, config.BATCH_SIZE)
+
+                await send_broadcast_page(bot, broadcast_key, users, params)
+                await send_due_broadcast_retries(bot, broadcast_key, params)
+
+                if len(users) < config.BATCH_SIZE:
+                    break
+
+                last_user_id = users[-1].id
+                await cache.redis.hset(broadcast_key, 'cursor', last_user_id)
+
+            await cache.redis.hset(broadcast_key, 'status', 'DELIVERED')
+
+        while True:
+            if not lease.is_held:
+                return {}
+
+            await send_due_broadcast_retries(bot, broadcast_key, params)
+
+            next_retry = await cache.redis.zrange(f'{broadcast_key}:retry', 0, 0, withscores=True)
+            if not next_retry:
+                break
+
+            await asyncio.sleep(max(next_retry[0][1] - time.time(), 0))
+
+        async with cache.redis.pipeline(transaction=True) as pipeline:
+            pipeline.hset(broadcast_key, mapping={'status': 'FINISHED', 'finished_at': time.time()})
+            pipeline.srem(BROADCASTS_KEY, broadcast_id)
+            pipeline.expire(broadcast_key, BROADCAST_TTL_SECONDS)
+            pipeline.delete(f'{broadcast_key}:attempts', f'{broadcast_key}:retry', f'{broadcast_key}:handled')
+            await pipeline.execute()
+
+        state = await cache.redis.hgetall(broadcast_key)
+        await report_broadcast(bot, broadcast_id, state, params)
+
+        return {
+            status.lower(): int(state.get(status.lower().encode(), 0)) for status in DeliveryStatus
+        }
+    finally:
+        await lease.release()
+
+
+async def resume_broadcast(bot: Bot, broadcast_id: str):
+    try:
+        await run_broadcast(bot, broadcast_id)
     except Exception:
         error_trace = traceback.format_exc()
-        logging.exception(f'Error in send_message: {error_trace}')
+        logging.exception(f'Error in resume_broadcasts: {error_trace}')
+
+
+async def resume_broadcasts(bot: Bot):
+    # a broadcast whose instance died is continued by whichever instance takes its lock once the heartbeat stops
+    tasks: dict[str, asyncio.Task] = {}
+    while True:
+        try:
+            for broadcast_id in await cache.redis.smembers(BROADCASTS_KEY):
+                broadcast_id = broadcast_id.decode()
+                if broadcast_id not in tasks:
+                    tasks[broadcast_id] = asyncio.create_task(resume_broadcast(bot, broadcast_id))
+                    tasks[broadcast_id].add_done_callback(lambda _, key=broadcast_id: tasks.pop(key, None))
+        except Exception:
+            error_trace = traceback.format_exc()
+            logging.exception(f'Error in resume_broadcasts: {error_trace}')
+
+        await asyncio.sleep(config.BROADCAST_RESUME_INTERVAL_SECONDS)
 
 
 async def send_message_to_users(bot: Bot, user_type: str, language_code: LanguageCode, message: str, reply_markup=None):
-    users = await get_users_by_language_code(language_code)
-    for i in range(0, len(users), BATCH_SIZE):
-        batch_users = users[i:i + BATCH_SIZE]
-
-        tasks = []
-        for user in batch_users:
-            if (
-                user_type == 'all' or
-                (user_type == 'free' and not user.subscription_id) or
-                (user_type == 'paid' and user.subscription_id)
-            ):
-                tasks.append(send_message_to_user(bot, user, message, reply_markup))
-
-        await asyncio.gather(*tasks, return_exceptions=True)
-
-        if i + BATCH_SIZE < len(users):
-            await asyncio.sleep(DELAY_SECONDS)
+    broadcast_id = uuid.uuid4().hex
+    async with cache.redis.pipeline(transaction=True) as pipeline:
+        pipeline.hset(f'broadcast:{broadcast_id}', mapping={
+            'params': pickle.dumps({
+                'user_type': user_type,
+                'language_code': language_code,
+                'message': message,
+                'reply_markup': reply_markup,
+            }),
+            'status': 'RUNNING',
+            'started_at': time.time(),
+        })
+        pipeline.sadd(BROADCASTS_KEY, broadcast_id)
+        await pipeline.execute()
+
+    return await run_broadcast(bot, broadcast_id)
@@ -1,7 +1,8 @@
 import asyncio
 import logging
 import traceback
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
 
 from aiogram import Bot
 from aiogram.exceptions import TelegramForbiddenError
@@ -9,22 +10,36 @@ from aiogram.fsm.storage.base import BaseStorage
 from google.cloud.firestore_v1 import AsyncWriteBatch, FieldFilter
 
 from bot.config import config, MessageSticker
+from bot.database.cache import cache
 from bot.database.main import firebase
 from bot.database.models.common import Quota, PaymentMethod
+from bot.database.models.product import Product
 from bot.database.models.subscription import (
+    Subscription,
     SubscriptionStatus,
     SUBSCRIPTION_FREE_LIMITS,
 )
 from bot.database.models.user import User, UserSettings
 from bot.database.operations.chat.getters import get_chats_by_user_id
 from bot.database.operations.chat.updaters import update_chat
+from bot.database.operations.loader import Loader
 from bot.database.operations.package.getters import get_packages_by_user_id
-from bot.database.operations.product.getters import get_product
-from bot.database.operations.subscription.getters import get_subscription, get_activated_subscriptions_by_user_id
+from bot.database.operations.subscription.getters import (
+    get_activated_subscriptions_by_user_id,
+    get_subscriptions_by_end_date,
+    get_subscriptions_by_status,
+)
 from bot.database.operations.subscription.updaters import update_subscription
+from bot.database.operations.user.getters import (
+    get_user,
+    get_user_ids_by_additional_usage_quota,
+    get_user_ids_by_last_usage,
+    get_unused_user_ids,
+)
 from bot.database.operations.user.updaters import update_user
 from bot.helpers.billing.create_auto_payment import create_auto_payment
 from bot.helpers.billing.create_payment import OrderItem
+from bot.helpers.checkers.check_user_last_activity import NOTIFICATION_INTERVALS
 from bot.helpers.notifiers.notify_user_about_quota import notify_user_about_quota
 from bot.helpers.senders.send_message_to_admins_and_developers import send_message_to_admins_and_developers
 from bot.helpers.senders.send_message_to_users import send_message_to_user
@@ -32,54 +47,291 @@ from bot.helpers.senders.send_sticker import send_sticker
 from bot.keyboards.common.common import build_buy_motivation_keyboard
 from bot.locales.main import get_localization, get_user_language
 
+DAILY_LIMITS_DONE = b'DONE'
+DAILY_LIMITS_RUN_TTL_SECONDS = 2 * 24 * 60 * 60
+DAILY_LIMITS_SUBSCRIPTION_WINDOW_DAYS = 7
 
-async def update_daily_limits(bot: Bot, storage: BaseStorage):
-    users_query = firebase.db.collection(User.COLLECTION_NAME).limit(config.BATCH_SIZE)
-    is_running = True
-    last_doc = None
 
-    while is_running:
-        if last_doc:
-            users_query = users_query.start_after(last_doc)
+def get_user_id_range(shard: int, shards: int) -> tuple[Optional[str], Optional[str]]:
+    # telegram ids are numeric strings, so their two-digit prefixes split the keyspace
+    def get_boundary(index: int) -> Optional[str]:
+        if index <= 0 or index >= shards:
+            return None
+        return str(10 + 90 * index // shards)
 
-        docs = users_query.stream()
+    return get_boundary(shard), get_boundary(shard + 1)
 
-        tasks = []
-        batch = firebase.db.batch()
 
-        count = 0
-        async for doc in docs:
-            count += 1
+def is_subscription_billing_due(subscription: Optional[Subscription], current_date: datetime) -> bool:
+    if not subscription:
+        return False
 
-            user = User(**doc.to_dict())
+    return (
+        subscription.status == SubscriptionStatus.TRIAL and
+        (current_date - subscription.start_date).days >= 3
+    ) or (
+        subscription.status != SubscriptionStatus.FINISHED and
+        subscription.end_date <= current_date
+    )
 
-            await update_user_daily_limits(bot, user, batch, storage)
 
-            if not user.subscription_id:
-                tasks.append(
-                    notify_user_about_quota(
-                        bot=bot,
-                        user=user,
-                        storage=storage,
-                    )
-                )
+async def update_daily_limits(bot: Bot, storage: BaseStorage, shard=0, shards=1):
+    current_date = datetime.now(timezone.utc)
+    run_key = f'daily_limits:{current_date.strftime("%Y-%m-%d")}:{shard}:{shards}'
+    cursor_key = f'{run_key}:cursor'
+    billing_key = f'{run_key}:billing'
+    last_started_at_key = f'daily_limits:last_started_at:{shard}:{shards}'
+
+    cursor = await cache.redis.get(cursor_key)
+    if cursor == DAILY_LIMITS_DONE:
+        return
+    cursor = cursor.decode() if cursor else None
+
+    last_started_at = await cache.redis.get(last_started_at_key)
+    if last_started_at:
+        # only users who spent quota or whose subscription is due need a new document
+        user_pages = get_touched_user_pages(
+            datetime.fromisoformat(last_started_at.decode()),
+            current_date,
+            shard,
+            shards,
+            cursor,
+        )
+    else:
+        user_pages = get_all_user_pages(shard, shards, cursor)
+
+    subscriptions = Loader(Subscription)
+    products = Loader(Product)
+    semaphore = asyncio.Semaphore(config.DAILY_LIMITS_CONCURRENCY)
+    is_reading_done = asyncio.Event()
 
-        await batch.commit()
-        await asyncio.gather(*tasks, return_exceptions=True)
+    async def update_user_daily_limits_limited(user: User, batch: AsyncWriteBatch):
+        async with semaphore:
+            await update_user_daily_limits(bot, user, batch, storage, subscriptions, products)
 
-        if count < config.BATCH_SIZE:
-            is_running = False
+    billing_workers = [
+        asyncio.create_task(
+            run_billing_worker(bot, storage, billing_key, is_reading_done, subscriptions, products),
+        ) for _ in range(config.DAILY_LIMITS_BILLING_CONCURRENCY)
+    ]
+
+    next_user_page = None
+    try:
+        next_user_page = asyncio.ensure_future(anext(user_pages, None))
+        while True:
+            user_page = await next_user_page
+            if user_page is None:
+                break
+            next_user_page = asyncio.ensure_future(anext(user_pages, None))
+
+            users, users_to_notify = user_page
+
+            page_subscriptions = await subscriptions.load_many(user.subscription_id for user in users)
+            await products.load_many(
+                subscription.product_id for subscription in page_subscriptions.values() if subscription
+            )
+
+            page_date = datetime.now(timezone.utc)
+            billing_user_ids = []
+            ordinary_users = []
+            for user in users:
+                if is_subscription_billing_due(page_subscriptions.get(user.subscription_id), page_date):
+                    billing_user_ids.append(user.id)
+                else:
+                    ordinary_users.append(user)
+
+            batch = firebase.db.batch()
+            await asyncio.gather(*[
+                update_user_daily_limits_limited(user, batch) for user in ordinary_users
+            ])
+            await batch.commit()
+
+            pipeline = cache.redis.pipeline(transaction=True)
+            if billing_user_ids:
+                pipeline.rpush(billing_key, *billing_user_ids)
+                pipeline.expire(billing_key, DAILY_LIMITS_RUN_TTL_SECONDS)
+            page_user_ids = [user.id for user in users + users_to_notify]
+            if page_user_ids:
+                pipeline.set(cursor_key, max(page_user_ids), ex=DAILY_LIMITS_RUN_TTL_SECONDS)
+            await pipeline.execute()
+
+            await asyncio.gather(*[
+                notify_user_about_quota(
+                    bot=bot,
+                    user=user,
+                    storage=storage,
+                ) for user in ordinary_users + users_to_notify if not user.subscription_id
+            ], return_exceptions=True)
+    finally:
+        if next_user_page:
+            # a page prefetched before an error is never awaited by the loop
+            next_user_page.cancel()
+            await asyncio.gather(next_user_page, return_exceptions=True)
+
+        is_reading_done.set()
+        billing_results = await asyncio.gather(*billing_workers, return_exceptions=True)
+
+    for billing_result in billing_results:
+        if isinstance(billing_result, Exception):
+            logging.error(f'Daily limits billing worker failed: {billing_result!r}')
+    is_billing_failed = any(isinstance(result, Exception) or result for result in billing_results)
+    if is_billing_failed or await cache.redis.llen(billing_key):
+        # the run stays resumable from its cursor and billing queue, so the next call finishes it
+        await send_message_to_admins_and_developers(
+            bot,
+            f'<b>Daily Limits Were Not Updated Completely</b> ⚠️\n\nShard: {shard + 1}/{shards}',
+        )
+        return
+
+    pipeline = cache.redis.pipeline(transaction=True)
+    pipeline.set(cursor_key, DAILY_LIMITS_DONE, ex=DAILY_LIMITS_RUN_TTL_SECONDS)
+    pipeline.set(last_started_at_key, current_date.isoformat())
+    await pipeline.execute()
+
+    await send_message_to_admins_and_developers(
+        bot,
+        f'<b>Updated Daily Limits Successfully</b> 🎉\n\nShard: {shard + 1}/{shards}',
+    )
+
+
+async def get_all_user_pages(
+    shard: int,
+    shards: int,
+    cursor: Optional[str],
+) -> AsyncIterator[tuple[list[User], list[User]]]:
+    users_collection = firebase.db.collection(User.COLLECTION_NAME)
+    users_query = users_collection
+    lower_user_id, upper_user_id = get_user_id_range(shard, shards)
+    if lower_user_id:
+        users_query = users_query.where(filter=FieldFilter('__name__', '>=', users_collection.document(lower_user_id)))
+    if upper_user_id:
+        users_query = users_query.where(filter=FieldFilter('__name__', '<', users_collection.document(upper_user_id)))
+    users_query = users_query.limit(config.BATCH_SIZE)
+
+    last_doc = await users_collection.document(cursor).get() if cursor else None
+    while True:
+        page_query = users_query.start_after(last_doc) if last_doc else users_query
+        docs = [doc async for doc in page_query.stream()]
+        if docs:
+            yield [User(**doc.to_dict()) for doc in docs], []
+
+        if len(docs) < config.BATCH_SIZE:
             break
 
-        last_doc = doc
+        last_doc = docs[-1]
+
+
+async def get_touched_user_pages(
+    since: datetime,
+    current_date: datetime,
+    shard: int,
+    shards: int,
+    cursor: Optional[str],
+) -> AsyncIterator[tuple[list[User], list[User]]]:
+    user_ids = set(await get_user_ids_by_last_usage(start_date=since))
+    for subscription in await get_subscriptions_by_end_date(
+        start_date=current_date - timedelta(days=DAILY_LIMITS_SUBSCRIPTION_WINDOW_DAYS),
+        end_date=current_date,
+    ):
+        user_ids.add(subscription.user_id)
+    for subscription in await get_subscriptions_by_status(status=SubscriptionStatus.TRIAL):
+        user_ids.add(subscription.user_id)
+    for quota in [Quota.VOICE_MESSAGES, Quota.FAST_MESSAGES, Quota.ACCESS_TO_CATALOG]:
+        user_ids.update(await get_user_ids_by_additional_usage_quota(quota, subscription_id=''))
+
+    notify_user_ids = set()
+    for notification_interval in NOTIFICATION_INTERVALS:
+        start_date = current_date - timedelta(days=notification_interval + 2)
+        end_date = current_date - timedelta(days=notification_interval)
+        notify_user_ids.update(await get_user_ids_by_last_usage(start_date, end_date, subscription_id=''))
+        notify_user_ids.update(await get_unused_user_ids(start_date, end_date, subscription_id=''))
+
+    lower_user_id, upper_user_id = get_user_id_range(shard, shards)
+    page_user_ids = sorted(
+        user_id for user_id in user_ids | notify_user_ids
+        if (not lower_user_id or user_id >= lower_user_id) and
+        (not upper_user_id or user_id < upper_user_id) and
+        (not cursor or user_id > cursor)
+    )
 
-    await send_message_to_admins_and_developers(bot, f'<b>Updated Daily Limits Successfully</b> 🎉')
+    for i in range(0, len(page_user_ids), config.BATCH_SIZE):
+        page_users = await Loader(User).load_many(page_user_ids[i:i + config.BATCH_SIZE])
 
+        yield (
+            [user for user in page_users.values() if user and user.id in user_ids],
+            [user for user in page_users.values() if user and user.id not in user_ids],
+        )
 
-async def update_user_daily_limits(bot: Bot, user: User, batch: AsyncWriteBatch, storage: BaseStorage):
+
+async def run_billing_worker(
+    bot: Bot,
+    storage: BaseStorage,
+    billing_key: str,
+    is_reading_done: asyncio.Event,
+    subscriptions: Loader[Subscription],
+    products: Loader[Product],
+) -> int:
+    failed_count = 0
+    retry_user_ids = []
+    while True:
+        # users are popped before processing, so an interrupted run never bills anyone twice
+        user_id = await cache.redis.lpop(billing_key)
+        if not user_id:
+            if is_reading_done.is_set():
+                break
+            await asyncio.sleep(1)
+            continue
+
+        try:
+            user = await get_user(user_id.decode(), use_cache=False)
+        except Exception as e:
+            logging.exception(f'Error loading user {user_id.decode()} for billing: {e}')
+            retry_user_ids.append(user_id)
+            failed_count += 1
+            continue
+        if not user:
+            continue
+
+        try:
+            batch = firebase.db.batch()
+            await update_user_daily_limits(bot, user, batch, storage, subscriptions, products)
+            await batch.commit()
+        except Exception as e:
+            logging.exception(f'Error billing user {user.id}: {e}')
+            failed_count += 1
+            continue
+
+        if not user.subscription_id:
+            try:
+                await notify_user_about_quota(
+                    bot=bot,
+                    user=user,
+                    storage=storage,
+                )
+            except Exception as e:
+                logging.exception(f'Error notifying user {user.id} about quota: {e}')
+
+    if retry_user_ids:
+        # nothing was billed for these users yet, so the next run picks them up again
+        async with cache.redis.pipeline(transaction=True) as pipeline:
+            pipeline.rpush(billing_key, *retry_user_ids)
+            pipeline.expire(billing_key, DAILY_LIMITS_RUN_TTL_SECONDS)
+            await pipeline.execute()
+
+    return failed_count
+
+
+async def update_user_daily_limits(
+    bot: Bot,
+    user: User,
+    batch: AsyncWriteBatch,
+    storage: BaseStorage,
+    subscriptions: Loader[Subscription],
+    products: Loader[Product],
+):
     try:
-        user = await update_user_subscription(bot, user, batch, storage)
-        await update_user_additional_usage_quota(bot, user, bool(user.subscription_id), batch, storage)
+        user = await update_user_subscription(bot, user, batch, storage, subscriptions, products)
+        await update_user_additional_usage_quota(bot, user, bool(user.subscription_id), batch, storage, products)
     except TelegramForbiddenError:
         await update_user(user.id, {
             'is_blocked': True,
@@ -89,10 +341,17 @@ async def update_user_daily_limits(bot: Bot, user: User, batch: AsyncWriteBatch,
         logging.exception(f'Error updating user {user.id}: {error_trace}')
 
 
-async def update_user_subscription(bot: Bot, user: User, batch: AsyncWriteBatch, storage: BaseStorage):
+async def update_user_subscription(
+    bot: Bot,
+    user: User,
+    batch: AsyncWriteBatch,
+    storage: BaseStorage,
+    subscriptions: Loader[Subscription],
+    products: Loader[Product],
+):
     user_ref = firebase.db.collection(User.COLLECTION_NAME).document(user.id)
     current_date = datetime.now(timezone.utc)
-    current_subscription = await get_subscription(user.subscription_id)
+    current_subscription = await subscriptions.load(user.subscription_id)
 
     if (
         current_subscription and
@@ -101,7 +360,7 @@ async def update_user_subscription(bot: Bot, user: User, batch: AsyncWriteBatch,
     ):
         user_language_code = await get_user_language(user.id, storage)
 
-        product = await get_product(current_subscription.product_id)
+        product = await products.load(current_subscription.product_id)
         if current_subscription.payment_method == PaymentMethod.YOOKASSA:
             payment = await create_auto_payment(
                 payment_method=current_subscription.payment_method,
@@ -126,7 +385,7 @@ async def update_user_subscription(bot: Bot, user: User, batch: AsyncWriteBatch,
                 activated_subscriptions = await get_activated_subscriptions_by_user_id(user.id, current_date)
                 for activated_subscription in activated_subscriptions:
                     if activated_subscription.id != current_subscription.id:
-                        activated_subscription_product = await get_product(activated_subscription.product_id)
+                        activated_subscription_product = await products.load(activated_subscription.product_id)
                         user.subscription_id = activated_subscription.id
                         user.daily_limits = activated_subscription_product.details.get('limits')
                         break
@@ -166,7 +425,7 @@ async def update_user_subscription(bot: Bot, user: User, batch: AsyncWriteBatch,
     ):
         user_language_code = await get_user_language(user.id, storage)
         if current_subscription.provider_auto_payment_charge_id and current_subscription.status != SubscriptionStatus.CANCELED:
-            product = await get_product(current_subscription.product_id)
+            product = await products.load(current_subscription.product_id)
             if current_subscription.payment_method == PaymentMethod.YOOKASSA:
                 payment = await create_auto_payment(
                     payment_method=current_subscription.payment_method,
@@ -191,7 +450,7 @@ async def update_user_subscription(bot: Bot, user: User, batch: AsyncWriteBatch,
                     activated_subscriptions = await get_activated_subscriptions_by_user_id(user.id, current_date)
                     for activated_subscription in activated_subscriptions:
                         if activated_subscription.id != current_subscription.id:
-                            activated_subscription_product = await get_product(activated_subscription.product_id)
+                            activated_subscription_product = await products.load(activated_subscription.product_id)
                             user.subscription_id = activated_subscription.id
                             user.daily_limits = activated_subscription_product.details.get('limits')
                             break
@@ -228,7 +487,7 @@ async def update_user_subscription(bot: Bot, user: User, batch: AsyncWriteBatch,
                     activated_subscriptions = await get_activated_subscriptions_by_user_id(user.id, current_date)
                     for activated_subscription in activated_subscriptions:
                         if activated_subscription.id != current_subscription.id:
-                            activated_subscription_product = await get_product(activated_subscription.product_id)
+                            activated_subscription_product = await products.load(activated_subscription.product_id)
                             user.subscription_id = activated_subscription.id
                             user.daily_limits = activated_subscription_product.details.get('limits')
                             break
@@ -264,7 +523,7 @@ async def update_user_subscription(bot: Bot, user: User, batch: AsyncWriteBatch,
             activated_subscriptions = await get_activated_subscriptions_by_user_id(user.id, current_date)
             for activated_subscription in activated_subscriptions:
                 if activated_subscription.id != current_subscription.id:
-                    activated_subscription_product = await get_product(activated_subscription.product_id)
+                    activated_subscription_product = await products.load(activated_subscription.product_id)
                     user.subscription_id = activated_subscription.id
                     user.daily_limits = activated_subscription_product.details.get('limits')
                     break
@@ -299,7 +558,7 @@ async def update_user_subscription(bot: Bot, user: User, batch: AsyncWriteBatch,
         current_subscription.end_date >= current_date and
         current_subscription.status != SubscriptionStatus.FINISHED
     ):
-        product = await get_product(current_subscription.product_id)
+        product = await products.load(current_subscription.product_id)
         daily_limits = product.details.get('limits')
     else:
         daily_limits = SUBSCRIPTION_FREE_LIMITS
@@ -318,6 +577,7 @@ async def update_user_additional_usage_quota(
     had_subscription: bool,
     batch: AsyncWriteBatch,
     storage: BaseStorage,
+    products: Loader[Product],
 ):
     need_update = False
 
@@ -335,7 +595,7 @@ async def update_user_additional_usage_quota(
         packages = await get_packages_by_user_id(user.id)
         count_active_packages_after = 0
         for package in packages:
-            product = await get_product(package.product_id)
+            product = await products.load(package.product_id)
             if product.details.get('is_recurring', False) and package.until_at > current_date:
                 user.additional_usage_quota[Quota.VOICE_MESSAGES] = True
                 count_active_packages_after += 1
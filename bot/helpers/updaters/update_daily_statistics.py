@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from bot.config import config
+from bot.database.ledger import ledger
+from bot.database.models.common import Currency
+from bot.database.models.statistics import DailyStatistics
+from bot.database.models.subscription import Subscription
+from bot.database.models.transaction import TransactionType, ServiceType
+from bot.database.models.user import User
+from bot.database.operations.loader import Loader
+from bot.database.operations.statistics.writers import write_daily_statistics, write_daily_users
+from bot.database.operations.transaction.getters import get_transactions
+
+
+def get_start_of_day(date: datetime) -> datetime:
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+
+    return date.astimezone(timezone.utc).replace(
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+
+
+async def build_daily_statistics(
+    date: datetime,
+    users: Loader[User],
+    subscriptions: Loader[Subscription],
+) -> DailyStatistics:
+    start_date = get_start_of_day(date)
+    end_date = start_date + timedelta(days=1) - timedelta(microseconds=1)
+
+    daily_statistics = DailyStatistics(
+        id=start_date.strftime('%Y-%m-%d'),
+        date=start_date,
+    )
+    active_users = {}
+    paid_users = set()
+
+    transactions = await get_transactions(start_date, end_date)
+    transaction_users = await users.load_many(transaction.user_id for transaction in transactions)
+    user_subscriptions = await subscriptions.load_many(
+        user.subscription_id for user in transaction_users.values() if user
+    )
+
+    for transaction in transactions:
+        transaction_user = transaction_users.get(transaction.user_id)
+        subscription = user_subscriptions.get(transaction_user.subscription_id) if transaction_user else None
+        subscription_key = subscription.product_id if subscription else ServiceType.FREE
+        active_users[transaction.user_id] = subscription_key
+
+        count_transactions = daily_statistics.transactions.setdefault(transaction.product_id, {
+            'SUCCESS': 0,
+            'FAIL': 0,
+            'EXAMPLE': 0,
+            'ALL': 0,
+            'BONUS': 0,
+        })
+
+        if transaction.type == TransactionType.INCOME:
+            daily_statistics.count_incomes += 1
+            transaction_net = transaction.clear_amount
+            if transaction.currency == Currency.USD:
+                transaction_net *= 100
+            elif transaction.currency == Currency.XTR:
+                transaction_net *= 2
+
+            count_incomes = daily_statistics.incomes.setdefault(transaction.product_id, {
+                Currency.RUB: 0,
+                Currency.USD: 0,
+                Currency.XTR: 0,
+                'net': 0,
+            })
+            count_incomes[transaction.currency] += transaction.clear_amount
+            count_incomes['net'] += transaction_net
+
+            if transaction.details.get('is_bonus', False):
+                count_transactions['BONUS'] += 1
+
+            if transaction_net > 0:
+                paid_users.add(transaction.user_id)
+        elif transaction.type == TransactionType.EXPENSE:
+            has_error = transaction.details.get('has_error', False)
+            is_suggestion = transaction.details.get('is_suggestion', False)
+
+            count_transactions['SUCCESS'] += transaction.quantity if not has_error else 0
+            count_transactions['FAIL'] += transaction.quantity if has_error else 0
+            count_transactions['EXAMPLE'] += transaction.quantity if is_suggestion else 0
+            count_transactions['ALL'] += transaction.quantity
+
+            count_expenses = daily_statistics.expenses.setdefault(transaction.product_id, {
+                'EXAMPLE_ALL': 0,
+                'REQUEST_ALL': 0,
+                'ALL': 0,
+            })
+            count_expenses['EXAMPLE_ALL' if is_suggestion else 'REQUEST_ALL'] += transaction.amount
+            count_expenses['ALL'] += transaction.amount
+
+            if transaction.user_id != config.SUPER_ADMIN_ID:
+                user_expenses = daily_statistics.user_expenses.setdefault(subscription_key, {})
+                user_expenses[transaction.product_id] = user_expenses.get(transaction.product_id, 0) + \
+                    transaction.amount
+
+    daily_statistics.count_active_users = len(active_users)
+    daily_statistics.count_paid_users = len(paid_users)
+    for subscription_key in active_users.values():
+        daily_statistics.count_users[subscription_key] = daily_statistics.count_users.get(subscription_key, 0) + 1
+    await write_daily_users(daily_statistics.id, active_users, paid_users)
+
+    return daily_statistics
+
+
+async def update_daily_statistics(start_date: datetime, end_date: Optional[datetime] = None) -> list[DailyStatistics]:
+    # rows still buffered by the ledger must be visible to the rollup
+    await ledger.drain(wait=True)
+
+    date = get_start_of_day(start_date)
+    end_date = get_start_of_day(end_date or start_date)
+
+    users = Loader(User)
+    subscriptions = Loader(Subscription)
+    daily_statistics = []
+    while date <= end_date:
+        daily_statistics.append(
+            await write_daily_statistics(await build_daily_statistics(date, users, subscriptions)),
+        )
+        date += timedelta(days=1)
+
+    return daily_statistics
@@ -1,3 +1,5 @@
+from datetime import datetime, timezone
+
 from bot.database.models.common import Quota
 from bot.database.models.user import User
 from bot.database.operations.user.updaters import update_user, update_user_in_transaction
@@ -86,6 +88,9 @@ def get_user_with_updated_quota(user: User, user_quota: Quota, quantity_to_delet
         else:
             break
 
+    # lets the daily reset pick only the users who actually spent something
+    user.last_usage_at = datetime.now(timezone.utc)
+
     return user
 
 
@@ -98,6 +103,7 @@ async def update_user_usage_quota(user: User, user_quota: Quota, quantity_to_del
     await update_user(user.id, {
         'daily_limits': user.daily_limits,
         'additional_usage_quota': user.additional_usage_quota,
+        'last_usage_at': user.last_usage_at,
     })
 
 
@@ -110,4 +116,5 @@ async def update_user_usage_quota_in_transaction(transaction, user: User, user_q
     await update_user_in_transaction(transaction, user.id, {
         'daily_limits': user.daily_limits,
         'additional_usage_quota': user.additional_usage_quota,
+        'last_usage_at': user.last_usage_at,
     })
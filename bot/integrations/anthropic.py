@@ -1,9 +1,20 @@
+from typing import AsyncIterator, Optional
+
 from anthropic import AsyncAnthropic
 
 from bot.config import config
 from bot.database.models.common import ClaudeGPTVersion
+from bot.utils.metrics import observe_integration
+
+client: Optional[AsyncAnthropic] = None
+
 
-client = AsyncAnthropic(api_key=config.ANTHROPIC_API_KEY.get_secret_value())
+def get_client() -> AsyncAnthropic:
+    global client
+    if client is None:
+        client = AsyncAnthropic(api_key=config.ANTHROPIC_API_KEY.get_secret_value())
+
+    return client
 
 
 def get_default_max_tokens(model_version: ClaudeGPTVersion) -> int:
@@ -14,10 +25,11 @@ def get_default_max_tokens(model_version: ClaudeGPTVersion) -> int:
     return base
 
 
+@observe_integration('anthropic')
 async def get_response_message(model_version: ClaudeGPTVersion, system_prompt: str, history: list) -> dict:
     max_tokens = get_default_max_tokens(model_version)
 
-    response = await client.messages.create(
+    response = await get_client().messages.create(
         model=model_version,
         system=system_prompt,
         messages=history,
@@ -30,3 +42,31 @@ async def get_response_message(model_version: ClaudeGPTVersion, system_prompt: s
         'input_tokens': response.usage.input_tokens,
         'output_tokens': response.usage.output_tokens
     }
+
+
+@observe_integration('anthropic')
+async def get_response_message_stream(
+    model_version: ClaudeGPTVersion,
+    system_prompt: str,
+    history: list,
+) -> AsyncIterator[dict]:
+    max_tokens = get_default_max_tokens(model_version)
+
+    async with get_client().messages.stream(
+        model=model_version,
+        system=system_prompt,
+        messages=history,
+        max_tokens=max_tokens,
+    ) as stream:
+        async for text in stream.text_stream:
+            yield {
+                'delta': text,
+            }
+
+        response = await stream.get_final_message()
+
+    yield {
+        'finish_reason': response.stop_reason,
+        'input_tokens': response.usage.input_tokens,
+        'output_tokens': response.usage.output_tokens,
+    }
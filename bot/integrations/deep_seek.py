@@ -1,19 +1,32 @@
+from typing import AsyncIterator, Optional
+
 import openai
 
 from bot.config import config
 from bot.database.models.common import DeepSeekVersion
+from bot.integrations.open_ai import read_chat_completion_stream
+from bot.utils.metrics import observe_integration
+
+client: Optional[openai.AsyncOpenAI] = None
+
 
-client = openai.AsyncOpenAI(
-    api_key=config.DEEPSEEK_API_KEY.get_secret_value(),
-    base_url='https://api.deepseek.com',
-)
+def get_client() -> openai.AsyncOpenAI:
+    global client
+    if client is None:
+        client = openai.AsyncOpenAI(
+            api_key=config.DEEPSEEK_API_KEY.get_secret_value(),
+            base_url='https://api.deepseek.com',
+        )
 
+    return client
 
+
+@observe_integration('deep_seek')
 async def get_response_message(
     model_version: DeepSeekVersion,
     history: list,
 ) -> dict:
-    response = await client.chat.completions.create(
+    response = await get_client().chat.completions.create(
         model=model_version,
         messages=history,
     )
@@ -24,3 +37,19 @@ async def get_response_message(
         'input_tokens': response.usage.prompt_tokens,
         'output_tokens': response.usage.completion_tokens,
     }
+
+
+@observe_integration('deep_seek')
+async def get_response_message_stream(
+    model_version: DeepSeekVersion,
+    history: list,
+) -> AsyncIterator[dict]:
+    stream = await get_client().chat.completions.create(
+        model=model_version,
+        messages=history,
+        stream=True,
+        stream_options={'include_usage': True},
+    )
+
+    async for chunk in read_chat_completion_stream(stream):
+        yield chunk
@@ -2,7 +2,9 @@ import aiohttp
 
 from bot.config import config
 from bot.database.models.common import VideoSummaryFocus, VideoSummaryFormat, VideoSummaryAmount
+from bot.integrations.http_sessions import http_sessions
 from bot.locales.types import LanguageCode
+from bot.utils.metrics import observe_integration
 
 EIGHTIFY_API_URL = 'https://backend.eightify.app'
 EIGHTIFY_API_KEY = config.EIGHTIFY_API_KEY.get_secret_value()
@@ -19,13 +21,13 @@ class Eightify:
 
     async def __aenter__(self):
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = http_sessions.get(EIGHTIFY_API_URL)
 
         self.summary = Summary(self)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        await self.session.close()
+        pass
 
     async def request(self, method: str, url: str, **kwargs):
         async with self.session.request(method, url, headers=self.headers, **kwargs) as response:
@@ -69,6 +71,7 @@ class Summary(APIResource):
         return data['markdown']
 
 
+@observe_integration('eightify')
 async def generate_summary(
     language_code: LanguageCode,
     video_id: str,
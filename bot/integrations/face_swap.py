@@ -1,10 +1,11 @@
 import asyncio
 
 import aiohttp
-import httpx
 from filetype import filetype
 
 from bot.config import config
+from bot.integrations.http_sessions import http_sessions
+from bot.utils.metrics import observe_integration
 
 FACE_SWAP_API_URL = 'https://developer.remaker.ai/api/remaker'
 FACE_SWAP_API_KEY = config.FACE_SWAP_API_KEY.get_secret_value()
@@ -20,13 +21,13 @@ class FaceSwap:
 
     async def __aenter__(self):
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = http_sessions.get(FACE_SWAP_API_URL)
 
         self.videos = Videos(self)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        await self.session.close()
+        pass
 
     async def request(self, method: str, url: str, **kwargs):
         async with self.session.request(method, url, headers=self.headers, **kwargs) as response:
@@ -48,9 +49,8 @@ class Videos(APIResource):
         image_url: str,
         video_url: str,
     ) -> str:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(image_url)
-            response_content = response.content
+        async with http_sessions.get(image_url).get(image_url) as response:
+            response_content = await response.read()
 
         kind = await asyncio.to_thread(lambda: filetype.guess(response_content))
         if kind:
@@ -84,6 +84,7 @@ class Videos(APIResource):
         return data['result']
 
 
+@observe_integration('face_swap')
 async def generate_face_swap_video(
     image_url: str,
     video_url: str,
@@ -97,6 +98,7 @@ async def generate_face_swap_video(
         return task_id
 
 
+@observe_integration('face_swap')
 async def get_face_swap_video_generation(
     job_id: str,
 ) -> dict:
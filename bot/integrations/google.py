@@ -1,14 +1,32 @@
 import asyncio
 import io
+from types import ModuleType
+from typing import AsyncIterator, Optional
 
 import httpx
-from google.generativeai import configure, GenerativeModel, GenerationConfig, upload_file, get_file
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
 from bot.config import config
 from bot.database.models.common import GeminiGPTVersion
+from bot.utils.metrics import observe_integration
 
-configure(api_key=config.GEMINI_API_KEY.get_secret_value())
+genai: Optional[ModuleType] = None
+
+
+def get_genai() -> ModuleType:
+    global genai
+    if genai is None:
+        # the sdk takes most of a second to import, so it waits for the first gemini request instead of a cold start
+        import google.generativeai
+
+        google.generativeai.configure(api_key=config.GEMINI_API_KEY.get_secret_value())
+        genai = google.generativeai
+
+    return genai
+
+
+def get_blocked_response_errors() -> tuple[type[Exception], ...]:
+    genai_types = get_genai().types
+    return genai_types.StopCandidateException, genai_types.BlockedPromptException
 
 
 def get_default_max_tokens(model_version: GeminiGPTVersion) -> int:
@@ -24,31 +42,33 @@ def get_default_max_tokens(model_version: GeminiGPTVersion) -> int:
     return base
 
 
+@observe_integration('google')
 async def get_response_message(
     model_version: GeminiGPTVersion,
     system_prompt: str,
     history: list,
 ) -> dict:
+    genai = get_genai()
     max_tokens = get_default_max_tokens(model_version)
 
     if model_version == GeminiGPTVersion.V1_Ultra:
         model_name = GeminiGPTVersion.V1_Pro
     else:
         model_name = model_version
-    model = GenerativeModel(
+    model = genai.GenerativeModel(
         model_name=model_name,
         system_instruction=system_prompt,
     )
     response = await model.generate_content_async(
         contents=history,
-        generation_config=GenerationConfig(
+        generation_config=genai.GenerationConfig(
             max_output_tokens=max_tokens,
         ),
         safety_settings={
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+            genai.types.HarmCategory.HARM_CATEGORY_HARASSMENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+            genai.types.HarmCategory.HARM_CATEGORY_HATE_SPEECH: genai.types.HarmBlockThreshold.BLOCK_NONE,
+            genai.types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+            genai.types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: genai.types.HarmBlockThreshold.BLOCK_NONE,
         }
     )
 
@@ -60,10 +80,62 @@ async def get_response_message(
     }
 
 
+@observe_integration('google')
+async def get_response_message_stream(
+    model_version: GeminiGPTVersion,
+    system_prompt: str,
+    history: list,
+) -> AsyncIterator[dict]:
+    genai = get_genai()
+    max_tokens = get_default_max_tokens(model_version)
+
+    if model_version == GeminiGPTVersion.V1_Ultra:
+        model_name = GeminiGPTVersion.V1_Pro
+    else:
+        model_name = model_version
+    model = genai.GenerativeModel(
+        model_name=model_name,
+        system_instruction=system_prompt,
+    )
+    response = await model.generate_content_async(
+        contents=history,
+        generation_config=genai.GenerationConfig(
+            max_output_tokens=max_tokens,
+        ),
+        safety_settings={
+            genai.types.HarmCategory.HARM_CATEGORY_HARASSMENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+            genai.types.HarmCategory.HARM_CATEGORY_HATE_SPEECH: genai.types.HarmBlockThreshold.BLOCK_NONE,
+            genai.types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+            genai.types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+        },
+        stream=True,
+    )
+
+    async for chunk in response:
+        try:
+            text = chunk.text
+        except ValueError:
+            # the last chunk may only carry the finish reason
+            continue
+
+        if text:
+            yield {
+                'delta': text,
+            }
+
+    yield {
+        'finish_reason': response.candidates[-1].finish_reason,
+        'input_tokens': response.usage_metadata.prompt_token_count,
+        'output_tokens': response.usage_metadata.candidates_token_count,
+    }
+
+
+@observe_integration('google')
 async def get_response_video_summary(
     prompt: str,
     video_file_link: str,
 ) -> dict:
+    genai = get_genai()
     async with httpx.AsyncClient() as client:
         response = await client.head(video_file_link)
         mime_type = response.headers.get('Content-Type')
@@ -73,17 +145,17 @@ async def get_response_video_summary(
         response = await client.get(video_file_link)
         video_content = response.content
     video_io = io.BytesIO(video_content)
-    video_file = await asyncio.to_thread(lambda: upload_file(path=video_io, mime_type=mime_type))
+    video_file = await asyncio.to_thread(lambda: genai.upload_file(path=video_io, mime_type=mime_type))
 
     while video_file.state.name == 'PROCESSING':
         await asyncio.sleep(10)
-        video_file = await asyncio.to_thread(lambda: get_file(video_file.name))
+        video_file = await asyncio.to_thread(lambda: genai.get_file(video_file.name))
 
     if video_file.state.name == 'FAILED':
         raise ValueError(video_file.state.name)
 
     model_name = GeminiGPTVersion.V2_Flash
-    model = GenerativeModel(
+    model = genai.GenerativeModel(
         model_name=model_name,
     )
     response = await model.generate_content_async(
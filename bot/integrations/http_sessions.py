@@ -0,0 +1,74 @@
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from bot.config import config
+
+
+class HTTPSessions:
+    sessions: dict[str, aiohttp.ClientSession]
+    counters: dict[str, dict[str, int]]
+
+    def __init__(self):
+        self.sessions = {}
+        self.counters = defaultdict(lambda: {
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+        })
+
+    async def close(self):
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions = {}
+
+    def get(self, url: str) -> aiohttp.ClientSession:
+        host = urlsplit(url).netloc
+        session = self.sessions.get(host)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=config.HTTP_CONNECTIONS_PER_HOST,
+                    keepalive_timeout=config.HTTP_KEEPALIVE_SECONDS,
+                    ttl_dns_cache=config.HTTP_DNS_CACHE_SECONDS,
+                ),
+                trace_configs=[self.build_trace_config(host)],
+            )
+            self.sessions[host] = session
+
+        return session
+
+    def build_trace_config(self, host: str) -> aiohttp.TraceConfig:
+        counters = self.counters[host]
+
+        async def on_request_start(*_):
+            counters['requests'] += 1
+
+        async def on_connection_create_end(*_):
+            counters['connections_created'] += 1
+
+        async def on_connection_reuseconn(*_):
+            counters['connections_reused'] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        stats = {}
+        for host, session in self.sessions.items():
+            connector = session.connector
+            stats[host] = {
+                **self.counters[host],
+                'connections_acquired': len(connector._acquired) if connector else 0,
+                'connections_idle': sum(len(conns) for conns in connector._conns.values()) if connector else 0,
+                'connections_limit': config.HTTP_CONNECTIONS_PER_HOST,
+            }
+
+        return stats
+
+
+http_sessions = HTTPSessions()
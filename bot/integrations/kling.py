@@ -3,6 +3,8 @@ from typing_extensions import Optional
 
 from bot.config import config
 from bot.database.models.common import KlingVersion, KlingMode, KlingDuration, AspectRatio
+from bot.integrations.http_sessions import http_sessions
+from bot.utils.metrics import observe_integration
 
 KLING_API_URL = 'https://api.piapi.ai'
 KLING_API_KEY = config.KLING_API_KEY.get_secret_value()
@@ -19,13 +21,13 @@ class Kling:
 
     async def __aenter__(self):
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = http_sessions.get(KLING_API_URL)
 
         self.videos = Videos(self)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        await self.session.close()
+        pass
 
     async def request(self, method: str, url: str, **kwargs):
         async with self.session.request(method, url, headers=self.headers, **kwargs) as response:
@@ -104,6 +106,7 @@ class Videos(APIResource):
         return data['data']['task_id']
 
 
+@observe_integration('kling')
 async def generate_video(
     prompt: str,
     version: KlingVersion,
@@ -10,12 +10,21 @@ from bot.database.models.common import (
     LumaRayDuration,
     LumaRayQuality,
 )
+from bot.utils.metrics import observe_integration
 
 WEBHOOK_LUMA_URL = config.WEBHOOK_URL + config.WEBHOOK_LUMA_PATH
 
-client = AsyncLumaAI(
-    auth_token=config.LUMA_API_KEY.get_secret_value(),
-)
+client: Optional[AsyncLumaAI] = None
+
+
+def get_client() -> AsyncLumaAI:
+    global client
+    if client is None:
+        client = AsyncLumaAI(
+            auth_token=config.LUMA_API_KEY.get_secret_value(),
+        )
+
+    return client
 
 
 def get_cost_for_video(quality: LumaRayQuality, duration: LumaRayDuration):
@@ -27,12 +36,13 @@ def get_cost_for_video(quality: LumaRayQuality, duration: LumaRayDuration):
     return 1
 
 
+@observe_integration('luma')
 async def get_response_image(
     prompt_text: str,
     aspect_ratio: AspectRatio,
     prompt_image: Optional[str] = None,
 ) -> str:
-    response = await client.generations.image.create(
+    response = await get_client().generations.image.create(
         model=LumaPhotonVersion.V1,
         prompt=prompt_text,
         aspect_ratio=aspect_ratio,
@@ -46,6 +56,7 @@ async def get_response_image(
     return response.id
 
 
+@observe_integration('luma')
 async def get_response_video(
     prompt_text: str,
     version: LumaRayVersion,
@@ -54,7 +65,7 @@ async def get_response_video(
     quality: LumaRayQuality,
     prompt_image: Optional[str] = None,
 ) -> str:
-    response = await client.generations.create(
+    response = await get_client().generations.create(
         prompt=prompt_text,
         model=version,
         resolution=quality,
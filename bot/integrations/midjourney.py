@@ -2,6 +2,8 @@ from aiogram.client.session import aiohttp
 
 from bot.config import config
 from bot.database.models.common import MidjourneyVersion, MidjourneyAction, AspectRatio
+from bot.integrations.http_sessions import http_sessions
+from bot.utils.metrics import observe_integration
 
 MIDJOURNEY_API_URL = 'https://api.piapi.ai'
 MIDJOURNEY_API_KEY = config.MIDJOURNEY_API_KEY.get_secret_value()
@@ -18,13 +20,13 @@ class Midjourney:
 
     async def __aenter__(self):
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = http_sessions.get(MIDJOURNEY_API_URL)
 
         self.images = Images(self)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        await self.session.close()
+        pass
 
     async def request(self, method: str, url: str, **kwargs):
         async with self.session.request(method, url, headers=self.headers, **kwargs) as response:
@@ -162,6 +164,7 @@ class Images(APIResource):
         return data['data']['task_id']
 
 
+@observe_integration('midjourney')
 async def create_midjourney_images(
     prompt: str,
     aspect_ratio: AspectRatio,
@@ -177,6 +180,7 @@ async def create_midjourney_images(
         return task_id
 
 
+@observe_integration('midjourney')
 async def create_midjourney_image(
     original_task_id: str,
     choice: int,
@@ -190,6 +194,7 @@ async def create_midjourney_image(
         return task_id
 
 
+@observe_integration('midjourney')
 async def create_different_midjourney_images(
     original_task_id: str,
 ) -> str:
@@ -201,6 +206,7 @@ async def create_different_midjourney_images(
         return task_id
 
 
+@observe_integration('midjourney')
 async def create_different_midjourney_image(
     original_task_id: str,
     choice: int,
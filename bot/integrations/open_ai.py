@@ -1,13 +1,22 @@
-from typing import BinaryIO, Literal
+from typing import AsyncIterator, BinaryIO, Literal, Optional
 
 import openai
 
 from bot.config import config
 from bot.database.models.common import ChatGPTVersion, DALLEResolution, DALLEQuality, DALLEVersion
+from bot.utils.metrics import observe_integration
 
-client = openai.AsyncOpenAI(
-    api_key=config.OPENAI_API_KEY.get_secret_value(),
-)
+client: Optional[openai.AsyncOpenAI] = None
+
+
+def get_client() -> openai.AsyncOpenAI:
+    global client
+    if client is None:
+        client = openai.AsyncOpenAI(
+            api_key=config.OPENAI_API_KEY.get_secret_value(),
+        )
+
+    return client
 
 
 def get_default_max_tokens(model_version: ChatGPTVersion) -> int:
@@ -21,17 +30,18 @@ def get_default_max_tokens(model_version: ChatGPTVersion) -> int:
     return base
 
 
+@observe_integration('open_ai')
 async def get_response_message(model_version: ChatGPTVersion, history: list) -> dict:
     max_tokens = get_default_max_tokens(model_version)
 
     if model_version == ChatGPTVersion.V4_Omni_Mini or model_version == ChatGPTVersion.V4_Omni:
-        response = await client.chat.completions.create(
+        response = await get_client().chat.completions.create(
             model=model_version,
             messages=history,
             max_tokens=max_tokens,
         )
     else:
-        response = await client.chat.completions.create(
+        response = await get_client().chat.completions.create(
             model=model_version,
             messages=history,
         )
@@ -44,6 +54,54 @@ async def get_response_message(model_version: ChatGPTVersion, history: list) ->
     }
 
 
+@observe_integration('open_ai')
+async def get_response_message_stream(model_version: ChatGPTVersion, history: list) -> AsyncIterator[dict]:
+    max_tokens = get_default_max_tokens(model_version)
+
+    if model_version == ChatGPTVersion.V4_Omni_Mini or model_version == ChatGPTVersion.V4_Omni:
+        stream = await get_client().chat.completions.create(
+            model=model_version,
+            messages=history,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={'include_usage': True},
+        )
+    else:
+        stream = await get_client().chat.completions.create(
+            model=model_version,
+            messages=history,
+            stream=True,
+            stream_options={'include_usage': True},
+        )
+
+    async for chunk in read_chat_completion_stream(stream):
+        yield chunk
+
+
+async def read_chat_completion_stream(stream) -> AsyncIterator[dict]:
+    finish_reason = None
+    input_tokens = output_tokens = 0
+    async for chunk in stream:
+        if chunk.usage:
+            input_tokens = chunk.usage.prompt_tokens
+            output_tokens = chunk.usage.completion_tokens
+
+        if chunk.choices:
+            choice = chunk.choices[0]
+            if choice.delta and choice.delta.content:
+                yield {
+                    'delta': choice.delta.content,
+                }
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+
+    yield {
+        'finish_reason': finish_reason,
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+    }
+
+
 def get_cost_for_image(quality: DALLEQuality, resolution: DALLEResolution):
     if quality == DALLEQuality.STANDARD and resolution == DALLEResolution.LOW:
         return 1
@@ -58,13 +116,14 @@ def get_cost_for_image(quality: DALLEQuality, resolution: DALLEResolution):
     return 1
 
 
+@observe_integration('open_ai')
 async def get_response_image(
     model_version: DALLEVersion,
     prompt: str,
     size: DALLEResolution,
     quality: DALLEQuality,
 ) -> str:
-    response = await client.images.generate(
+    response = await get_client().images.generate(
         model=model_version,
         prompt=prompt,
         size=size,
@@ -75,8 +134,9 @@ async def get_response_image(
     return response.data[0].url
 
 
+@observe_integration('open_ai')
 async def get_response_speech_to_text(audio_file: BinaryIO) -> str:
-    response = await client.audio.transcriptions.create(
+    response = await get_client().audio.transcriptions.create(
         model='whisper-1',
         file=audio_file,
     )
@@ -84,8 +144,9 @@ async def get_response_speech_to_text(audio_file: BinaryIO) -> str:
     return response.text
 
 
+@observe_integration('open_ai')
 async def get_response_text_to_speech(text: str, voice: Literal['alloy', 'echo', 'fable', 'onyx', 'nova', 'shimmer']):
-    response = await client.audio.speech.create(
+    response = await get_client().audio.speech.create(
         model='tts-1',
         voice=voice,
         response_format='opus',
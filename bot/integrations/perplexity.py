@@ -1,19 +1,31 @@
+from typing import AsyncIterator, Optional
+
 import openai
 
 from bot.config import config
 from bot.database.models.common import PerplexityGPTVersion
+from bot.utils.metrics import observe_integration
+
+client: Optional[openai.AsyncOpenAI] = None
+
+
+def get_client() -> openai.AsyncOpenAI:
+    global client
+    if client is None:
+        client = openai.AsyncOpenAI(
+            api_key=config.PERPLEXITY_API_KEY.get_secret_value(),
+            base_url='https://api.perplexity.ai',
+        )
 
-client = openai.AsyncOpenAI(
-    api_key=config.PERPLEXITY_API_KEY.get_secret_value(),
-    base_url='https://api.perplexity.ai',
-)
+    return client
 
 
+@observe_integration('perplexity')
 async def get_response_message(
     model_version: PerplexityGPTVersion,
     history: list,
 ) -> dict:
-    response = await client.chat.completions.create(
+    response = await get_client().chat.completions.create(
         model=model_version,
         messages=history,
     )
@@ -25,3 +37,41 @@ async def get_response_message(
         'input_tokens': response.usage.prompt_tokens,
         'output_tokens': response.usage.completion_tokens,
     }
+
+
+@observe_integration('perplexity')
+async def get_response_message_stream(
+    model_version: PerplexityGPTVersion,
+    history: list,
+) -> AsyncIterator[dict]:
+    stream = await get_client().chat.completions.create(
+        model=model_version,
+        messages=history,
+        stream=True,
+    )
+
+    finish_reason = None
+    citations = []
+    input_tokens = output_tokens = 0
+    async for chunk in stream:
+        if getattr(chunk, 'citations', None):
+            citations = chunk.citations
+        if chunk.usage:
+            input_tokens = chunk.usage.prompt_tokens
+            output_tokens = chunk.usage.completion_tokens
+
+        if chunk.choices:
+            choice = chunk.choices[0]
+            if choice.delta and choice.delta.content:
+                yield {
+                    'delta': choice.delta.content,
+                }
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+
+    yield {
+        'finish_reason': finish_reason,
+        'citations': citations,
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+    }
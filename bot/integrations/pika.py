@@ -2,6 +2,8 @@ import aiohttp
 
 from bot.config import config
 from bot.database.models.common import PikaVersion
+from bot.integrations.http_sessions import http_sessions
+from bot.utils.metrics import observe_integration
 
 PIKA_API_URL = 'https://api.acedata.cloud/pika/videos'
 PIKA_API_KEY = config.PIKA_API_KEY.get_secret_value()
@@ -19,13 +21,13 @@ class Pika:
 
     async def __aenter__(self):
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = http_sessions.get(PIKA_API_URL)
 
         self.videos = Videos(self)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        await self.session.close()
+        pass
 
     async def request(self, method: str, url: str, **kwargs):
         async with self.session.request(method, url, headers=self.headers, **kwargs) as response:
@@ -63,6 +65,7 @@ class Videos(APIResource):
         return data['task_id']
 
 
+@observe_integration('pika')
 async def generate_video(
     prompt: str,
     version: PikaVersion,
@@ -1,12 +1,23 @@
+from typing import Optional
+
 import openai
 
 from bot.config import config
 from bot.database.models.common import RecraftVersion, AspectRatio
+from bot.utils.metrics import observe_integration
+
+client: Optional[openai.AsyncOpenAI] = None
+
+
+def get_client() -> openai.AsyncOpenAI:
+    global client
+    if client is None:
+        client = openai.AsyncOpenAI(
+            api_key=config.RECRAFT_API_KEY.get_secret_value(),
+            base_url='https://external.api.recraft.ai/v1',
+        )
 
-client = openai.AsyncOpenAI(
-    api_key=config.RECRAFT_API_KEY.get_secret_value(),
-    base_url='https://external.api.recraft.ai/v1',
-)
+    return client
 
 
 def get_size_by_aspect_ratio(aspect_ratio: AspectRatio):
@@ -31,12 +42,13 @@ def get_size_by_aspect_ratio(aspect_ratio: AspectRatio):
     return '1024x1024'
 
 
+@observe_integration('recraft')
 async def get_response_image(
     prompt: str,
     model_version: RecraftVersion,
     aspect_ratio: AspectRatio,
 ) -> str:
-    response = await client.images.generate(
+    response = await get_client().images.generate(
         model=model_version,
         prompt=prompt,
         size=get_size_by_aspect_ratio(aspect_ratio),
@@ -47,11 +59,12 @@ async def get_response_image(
     return response.data[0].url
 
 
+@observe_integration('recraft')
 async def get_response_replace_background_image(
     prompt: str,
     image: str,
 ) -> str:
-    response = await client.post(
+    response = await get_client().post(
         path='/images/replaceBackground',
         cast_to=dict,
         options={'headers': {'Content-Type': 'multipart/form-data'}},
@@ -66,10 +79,11 @@ async def get_response_replace_background_image(
     return response['data'][0]['url']
 
 
+@observe_integration('recraft')
 async def get_response_vectorize_image(
     image: str,
 ) -> str:
-    response = await client.post(
+    response = await get_client().post(
         path='/images/vectorize',
         cast_to=dict,
         options={'headers': {'Content-Type': 'multipart/form-data'}},
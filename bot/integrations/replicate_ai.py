@@ -1,15 +1,60 @@
 import asyncio
-import os
+import hashlib
+import pickle
 from typing import Optional
 
-import replicate
-
 from bot.config import config
 from bot.database.models.common import PhotoshopAIAction, AspectRatio, StableDiffusionVersion, FluxVersion
+from bot.utils.metrics import observe_integration
+from bot.utils.update_registry import run_checkpoint
 
-os.environ['REPLICATE_API_TOKEN'] = config.REPLICATE_API_KEY.get_secret_value()
 WEBHOOK_REPLICATE_URL = config.WEBHOOK_URL + config.WEBHOOK_REPLICATE_PATH
 
+# pinned versions are submitted by id, the rest run the model's latest version
+REPLICATE_MODEL_VERSIONS = {
+    'cdingram/face-swap': 'd1d6ea8c8be89d664a07a457526f7128109dee7030fdac424788d762c71ed111',
+    'bytedance/flux-pulid': '8baa7ef2255075b46f4d91cd238c21d31181b3e6a864463f967960bb0112525b',
+    'tencentarc/gfpgan': '0fbacf7afc6c144e5be9767cff80f25aff23e52b0708f17e20f9879b2f21516c',
+    'microsoft/bringing-old-photos-back-to-life': 'c75db81db6cbd809d93cc3b7e7a088a351a3349c9fa02b6d393e35e0d51ba799',
+    'cjwbw/bigcolor': '9451bfbf652b21a9bccc741e5c7046540faa5586cfa3aa45abc7dbb46151a4f7',
+    'cjwbw/rembg': 'fb8af171cfa1616ddcf1242c093f9c46bcada5ad4cf6f2fbe8b81b330ec5c003',
+    'meta/musicgen': '671ac645ce5e552cc63a54a2bbff63fcf798043055d2dac5fc9e36a837eedcfb',
+    'stability-ai/sdxl': '7762fd07cf82c948538e41f63f77d685e02b063e37e496e96eefd46c929f9bdc',
+}
+
+client = None
+
+
+def get_client():
+    global client
+    if client is None:
+        # the sdk pulls in pydantic.v1 and is only needed by image tools, so it is not imported on a cold start
+        import replicate
+
+        client = replicate.Client(api_token=config.REPLICATE_API_KEY.get_secret_value())
+
+    return client
+
+
+@observe_integration('replicate')
+async def create_prediction(model_name: str, input_parameters: dict) -> str:
+    version = REPLICATE_MODEL_VERSIONS.get(model_name)
+
+    async def create() -> str:
+        prediction = await get_client().predictions.async_create(
+            **({'version': version} if version else {'model': model_name}),
+            input=input_parameters,
+            webhook=WEBHOOK_REPLICATE_URL,
+            webhook_events_filter=['completed'],
+        )
+        return prediction.id
+
+    # a retried update reuses the prediction it already paid for
+    return await run_checkpoint(
+        f'replicate:{model_name}:{hashlib.sha1(pickle.dumps(input_parameters)).hexdigest()}',
+        create,
+    )
+
 
 async def create_face_swap_images(images: list[dict]):
     tasks = [create_face_swap_image(image['target_image'], image['source_image']) for image in images]
@@ -24,16 +69,7 @@ async def create_face_swap_image(target_image: str, source_image: str) -> Option
         'swap_image': source_image,
     }
 
-    model = await replicate.models.async_get('cdingram/face-swap')
-    version = await model.versions.async_get('d1d6ea8c8be89d664a07a457526f7128109dee7030fdac424788d762c71ed111')
-    prediction = await replicate.predictions.async_create(
-        version=version,
-        input=input_parameters,
-        webhook=WEBHOOK_REPLICATE_URL,
-        webhook_events_filter=['completed'],
-    )
-
-    return prediction.id
+    return await create_prediction('cdingram/face-swap', input_parameters)
 
 
 async def create_flux_face_swap_image(
@@ -48,16 +84,7 @@ async def create_flux_face_swap_image(
         'output_quality': 100,
     }
 
-    model = await replicate.models.async_get('bytedance/flux-pulid')
-    version = await model.versions.async_get('8baa7ef2255075b46f4d91cd238c21d31181b3e6a864463f967960bb0112525b')
-    prediction = await replicate.predictions.async_create(
-        version=version,
-        input=input_parameters,
-        webhook=WEBHOOK_REPLICATE_URL,
-        webhook_events_filter=['completed'],
-    )
-
-    return prediction.id
+    return await create_prediction('bytedance/flux-pulid', input_parameters)
 
 
 async def create_photoshop_ai_image(action: PhotoshopAIAction, image_url: str) -> Optional[str]:
@@ -66,41 +93,30 @@ async def create_photoshop_ai_image(action: PhotoshopAIAction, image_url: str) -
             'img': image_url,
         }
 
-        model = await replicate.models.async_get('tencentarc/gfpgan')
-        version = await model.versions.async_get('0fbacf7afc6c144e5be9767cff80f25aff23e52b0708f17e20f9879b2f21516c')
+        model_name = 'tencentarc/gfpgan'
     elif action == PhotoshopAIAction.RESTORATION:
         input_parameters = {
             'image': image_url,
             'with_scratch': True,
         }
 
-        model = await replicate.models.async_get('microsoft/bringing-old-photos-back-to-life')
-        version = await model.versions.async_get('c75db81db6cbd809d93cc3b7e7a088a351a3349c9fa02b6d393e35e0d51ba799')
+        model_name = 'microsoft/bringing-old-photos-back-to-life'
     elif action == PhotoshopAIAction.COLORIZATION:
         input_parameters = {
             'image': image_url,
         }
 
-        model = await replicate.models.async_get('cjwbw/bigcolor')
-        version = await model.versions.async_get('9451bfbf652b21a9bccc741e5c7046540faa5586cfa3aa45abc7dbb46151a4f7')
+        model_name = 'cjwbw/bigcolor'
     elif action == PhotoshopAIAction.REMOVAL_BACKGROUND:
         input_parameters = {
             'image': image_url,
         }
 
-        model = await replicate.models.async_get('cjwbw/rembg')
-        version = await model.versions.async_get('fb8af171cfa1616ddcf1242c093f9c46bcada5ad4cf6f2fbe8b81b330ec5c003')
+        model_name = 'cjwbw/rembg'
     else:
         return
 
-    prediction = await replicate.predictions.async_create(
-        version=version,
-        input=input_parameters,
-        webhook=WEBHOOK_REPLICATE_URL,
-        webhook_events_filter=['completed'],
-    )
-
-    return prediction.id
+    return await create_prediction(model_name, input_parameters)
 
 
 async def create_music_gen_melody(prompt: str, duration: int) -> Optional[str]:
@@ -111,16 +127,7 @@ async def create_music_gen_melody(prompt: str, duration: int) -> Optional[str]:
         'duration': duration,
     }
 
-    model = await replicate.models.async_get('meta/musicgen')
-    version = await model.versions.async_get('671ac645ce5e552cc63a54a2bbff63fcf798043055d2dac5fc9e36a837eedcfb')
-    prediction = await replicate.predictions.async_create(
-        version=version,
-        input=input_parameters,
-        webhook=WEBHOOK_REPLICATE_URL,
-        webhook_events_filter=['completed'],
-    )
-
-    return prediction.id
+    return await create_prediction('meta/musicgen', input_parameters)
 
 
 async def create_stable_diffusion_image(
@@ -138,15 +145,7 @@ async def create_stable_diffusion_image(
             input_parameters['image'] = image_link
             input_parameters['prompt_strength'] = 0.75
 
-        model = await replicate.models.async_get('stability-ai/sdxl')
-        version = await model.versions.async_get('7762fd07cf82c948538e41f63f77d685e02b063e37e496e96eefd46c929f9bdc')
-
-        prediction = await replicate.predictions.async_create(
-            version=version,
-            input=input_parameters,
-            webhook=WEBHOOK_REPLICATE_URL,
-            webhook_events_filter=['completed'],
-        )
+        model_name = 'stability-ai/sdxl'
     elif model_version == StableDiffusionVersion.V3:
         input_parameters = {
             'prompt': prompt,
@@ -158,17 +157,11 @@ async def create_stable_diffusion_image(
             input_parameters['image'] = image_link
             input_parameters['prompt_strength'] = 0.75
 
-        model = await replicate.models.async_get('stability-ai/stable-diffusion-3.5-large-turbo')
-        prediction = await replicate.predictions.async_create(
-            model=model,
-            input=input_parameters,
-            webhook=WEBHOOK_REPLICATE_URL,
-            webhook_events_filter=['completed'],
-        )
+        model_name = 'stability-ai/stable-diffusion-3.5-large-turbo'
     else:
         return
 
-    return prediction.id
+    return await create_prediction(model_name, input_parameters)
 
 
 async def create_flux_image(
@@ -199,12 +192,4 @@ async def create_flux_image(
         if image_link:
             input_parameters['image_prompt'] = image_link
 
-    model = await replicate.models.async_get(f'black-forest-labs/{version}')
-    prediction = await replicate.predictions.async_create(
-        model=model,
-        input=input_parameters,
-        webhook=WEBHOOK_REPLICATE_URL,
-        webhook_events_filter=['completed'],
-    )
-
-    return prediction.id
+    return await create_prediction(f'black-forest-labs/{version}', input_parameters)
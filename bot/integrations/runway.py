@@ -1,15 +1,22 @@
-import asyncio
+from typing import Optional
 
-import runwayml
-from httpx import Request, Response
 from runwayml import AsyncRunwayML
 
 from bot.config import config
 from bot.database.models.common import RunwayVersion, RunwayResolution, RunwayDuration
+from bot.utils.metrics import observe_integration
 
-client = AsyncRunwayML(
-    api_key=config.RUNWAYML_API_KEY.get_secret_value(),
-)
+client: Optional[AsyncRunwayML] = None
+
+
+def get_client() -> AsyncRunwayML:
+    global client
+    if client is None:
+        client = AsyncRunwayML(
+            api_key=config.RUNWAYML_API_KEY.get_secret_value(),
+        )
+
+    return client
 
 
 def get_cost_for_video(duration: RunwayDuration):
@@ -21,14 +28,15 @@ def get_cost_for_video(duration: RunwayDuration):
     return 1
 
 
-async def get_response_video(
+@observe_integration('runway')
+async def generate_video(
     model_version: RunwayVersion,
     prompt_text: str,
     prompt_image: str,
     resolution: RunwayResolution,
     duration: RunwayDuration,
-) -> dict:
-    response = await client.image_to_video.create(
+) -> str:
+    response = await get_client().image_to_video.create(
         model=model_version,
         prompt_text=prompt_text,
         prompt_image=prompt_image,
@@ -36,27 +44,15 @@ async def get_response_video(
         duration=duration,
     )
 
-    task_id = response.id
+    return response.id
 
-    await asyncio.sleep(10)
-    task = await client.tasks.retrieve(task_id)
-    for _ in range(60):
-        await asyncio.sleep(10)
-        task = await client.tasks.retrieve(task_id)
-        if task.status in ['SUCCEEDED', 'FAILED', 'CANCELLED']:
-            break
 
-    if task.status == 'FAILED':
-        raise runwayml.BadRequestError(
-            message=task.failure_code,
-            body={'error': task.failure_code},
-            response=Response(
-                status_code=400,
-                request=Request('POST', 'https://api.runwayml.com'),
-            ),
-        )
+@observe_integration('runway')
+async def get_video_generation(task_id: str) -> dict:
+    task = await get_client().tasks.retrieve(task_id)
 
     return {
+        'id': task_id,
         'status': task.status,
         'result': task.output,
         'failure': task.failure,
@@ -2,6 +2,8 @@ import aiohttp
 
 from bot.config import config
 from bot.database.models.common import SunoVersion
+from bot.integrations.http_sessions import http_sessions
+from bot.utils.metrics import observe_integration
 
 SUNO_API_URL = 'https://api.acedata.cloud/suno/audios'
 SUNO_API_KEY = config.SUNO_API_KEY.get_secret_value()
@@ -19,13 +21,13 @@ class Suno:
 
     async def __aenter__(self):
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = http_sessions.get(SUNO_API_URL)
 
         self.songs = Songs(self)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        await self.session.close()
+        pass
 
     async def request(self, method: str, url: str, **kwargs):
         async with self.session.request(method, url, headers=self.headers, **kwargs) as response:
@@ -64,6 +66,7 @@ class Songs(APIResource):
         return data['task_id']
 
 
+@observe_integration('suno')
 async def generate_song(
     version: SunoVersion,
     prompt: str,
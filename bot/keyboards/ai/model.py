@@ -10,10 +10,12 @@ from bot.database.models.common import (
     StableDiffusionVersion,
     FluxVersion,
 )
+from bot.keyboards.cache import cached_keyboard
 from bot.locales.main import get_localization
 from bot.locales.types import LanguageCode
 
 
+@cached_keyboard
 def build_model_keyboard(
     language_code: LanguageCode,
     model: Model,
@@ -525,6 +527,7 @@ def build_model_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_switched_to_ai_keyboard(language_code: LanguageCode, model: Model) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -538,6 +541,7 @@ def build_switched_to_ai_keyboard(language_code: LanguageCode, model: Model) ->
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_switched_to_ai_selection_keyboard(language_code: LanguageCode, model: Model) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -589,6 +593,7 @@ def build_switched_to_ai_selection_keyboard(language_code: LanguageCode, model:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_model_limit_exceeded_keyboard(language_code: LanguageCode, had_subscription: bool) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -621,6 +626,7 @@ def build_model_limit_exceeded_keyboard(language_code: LanguageCode, had_subscri
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_model_restricted_keyboard(language_code: LanguageCode, had_subscription: bool) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -659,6 +665,7 @@ def build_model_restricted_keyboard(language_code: LanguageCode, had_subscriptio
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_model_unresolved_request_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
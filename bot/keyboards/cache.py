@@ -0,0 +1,41 @@
+import functools
+from enum import Enum
+from typing import Callable
+
+from aiogram.types import InlineKeyboardMarkup
+from cachetools import LRUCache
+
+from bot.config import config
+
+keyboard_cache = LRUCache(maxsize=config.KEYBOARD_CACHE_MAX_SIZE)
+
+
+def freeze(value):
+    if value is None or isinstance(value, (str, int, float, Enum)):
+        return value
+    elif isinstance(value, dict):
+        return frozenset((key, freeze(item)) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    elif hasattr(value, 'COLLECTION_NAME'):
+        # catalog documents are versioned by their edit time, so an edit builds a new keyboard
+        return value.COLLECTION_NAME, value.id, value.edited_at
+
+    raise TypeError(f'Unsupported keyboard argument: {type(value)}')
+
+
+def cached_keyboard(builder: Callable[..., InlineKeyboardMarkup]):
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs) -> InlineKeyboardMarkup:
+        try:
+            key = builder.__module__, builder.__qualname__, freeze(args), freeze(kwargs)
+        except TypeError:
+            return builder(*args, **kwargs)
+
+        keyboard = keyboard_cache.get(key)
+        if keyboard is None:
+            keyboard = keyboard_cache[key] = builder(*args, **kwargs)
+
+        return keyboard
+
+    return wrapper
@@ -3,10 +3,12 @@ from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from bot.database.models.common import Currency
 from bot.database.models.game import GameType
 from bot.database.models.product import Product, ProductType, ProductCategory, ProductCategorySymbols
+from bot.keyboards.cache import cached_keyboard
 from bot.locales.main import get_localization
 from bot.locales.types import LanguageCode
 
 
+@cached_keyboard
 def build_bonus_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -56,6 +58,7 @@ def build_bonus_earn_keyboard(language_code: LanguageCode, user_id: str) -> Inli
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_bonus_play_game_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -99,6 +102,7 @@ def build_bonus_play_game_keyboard(language_code: LanguageCode) -> InlineKeyboar
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_bonus_play_game_chosen_keyboard(language_code: LanguageCode, game_type: GameType) -> InlineKeyboardMarkup:
     buttons = []
     if (
@@ -157,6 +161,7 @@ def build_bonus_play_game_chosen_keyboard(language_code: LanguageCode, game_type
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_bonus_spend_keyboard(language_code: LanguageCode, products: list[Product], page=0) -> InlineKeyboardMarkup:
     buttons = []
 
@@ -244,6 +249,7 @@ def build_bonus_spend_keyboard(language_code: LanguageCode, products: list[Produ
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_bonus_spend_selection_keyboard(language_code: LanguageCode, product: Product) -> InlineKeyboardMarkup:
     buttons = []
     quantities = []
@@ -286,6 +292,7 @@ def build_bonus_spend_selection_keyboard(language_code: LanguageCode, product: P
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_bonus_suggestion_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -1,14 +1,15 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-from stripe import Subscription
 
 from bot.database.models.common import PaymentType, PaymentMethod, Currency
 from bot.database.models.product import Product, ProductType, ProductCategory, ProductCategorySymbols
 from bot.database.models.subscription import SubscriptionPeriod
 from bot.helpers.getters.get_user_discount import get_user_discount
+from bot.keyboards.cache import cached_keyboard
 from bot.locales.main import get_localization
 from bot.locales.types import LanguageCode
 
 
+@cached_keyboard
 def build_buy_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -32,6 +33,7 @@ def build_buy_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_subscriptions_keyboard(
     subscriptions: list[Product],
     category: ProductCategory,
@@ -91,6 +93,7 @@ def build_subscriptions_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_payment_method_for_subscription_keyboard(
     language_code: LanguageCode,
     subscription: Product,
@@ -142,6 +145,7 @@ def build_payment_keyboard(language_code: LanguageCode, payment_link: str) -> In
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_cancel_subscription_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -161,6 +165,7 @@ def build_cancel_subscription_keyboard(language_code: LanguageCode) -> InlineKey
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_packages_keyboard(
     language_code: LanguageCode,
     products: list[Product],
@@ -266,6 +271,7 @@ def build_packages_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_package_selection_keyboard(
     language_code: LanguageCode,
     product: Product,
@@ -313,6 +319,7 @@ def build_package_selection_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_package_quantity_sent_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -336,6 +343,7 @@ def build_package_quantity_sent_keyboard(language_code: LanguageCode) -> InlineK
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_package_add_to_cart_selection_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -355,6 +363,7 @@ def build_package_add_to_cart_selection_keyboard(language_code: LanguageCode) ->
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_package_cart_keyboard(
     language_code: LanguageCode,
     is_empty: bool,
@@ -393,6 +402,7 @@ def build_package_cart_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_payment_method_for_package_keyboard(
     language_code: LanguageCode,
     package_product_id: str,
@@ -428,6 +438,7 @@ def build_payment_method_for_package_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_payment_method_for_cart_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -459,6 +470,7 @@ def build_payment_method_for_cart_keyboard(language_code: LanguageCode) -> Inlin
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_return_to_packages_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -472,6 +484,7 @@ def build_return_to_packages_keyboard(language_code: LanguageCode) -> InlineKeyb
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_return_to_cart_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
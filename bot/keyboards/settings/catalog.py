@@ -5,10 +5,12 @@ from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, CopyTextBu
 from bot.database.models.common import Model, ModelType
 from bot.database.models.prompt import Prompt, PromptCategory, PromptSubCategory
 from bot.database.models.role import Role
+from bot.keyboards.cache import cached_keyboard
 from bot.locales.main import get_localization
 from bot.locales.types import LanguageCode
 
 
+@cached_keyboard
 def build_catalog_keyboard(language_code: LanguageCode):
     buttons = [
         [
@@ -26,6 +28,7 @@ def build_catalog_keyboard(language_code: LanguageCode):
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_catalog_digital_employees_keyboard(
     language_code: LanguageCode,
     current_role_id: str,
@@ -55,6 +58,7 @@ def build_catalog_digital_employees_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_catalog_prompts_model_type_keyboard(
     language_code: LanguageCode,
 ) -> InlineKeyboardMarkup:
@@ -88,6 +92,7 @@ def build_catalog_prompts_model_type_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_catalog_prompt_categories_keyboard(
     language_code: LanguageCode,
     categories: list[PromptCategory],
@@ -122,6 +127,7 @@ def build_catalog_prompt_categories_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_catalog_prompt_subcategories_keyboard(
     language_code: LanguageCode,
     subcategories: list[PromptSubCategory],
@@ -146,6 +152,7 @@ def build_catalog_prompt_subcategories_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_prompts_catalog_keyboard(
     language_code: LanguageCode,
     prompts: list[Prompt],
@@ -178,6 +185,7 @@ def build_prompts_catalog_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_prompts_catalog_chosen_keyboard(
     language_code: LanguageCode,
     prompt: Prompt,
@@ -216,6 +224,7 @@ def build_prompts_catalog_chosen_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_prompts_catalog_copy_keyboard(
     language_code: LanguageCode,
     prompt_text: str,
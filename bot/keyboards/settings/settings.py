@@ -23,10 +23,12 @@ from bot.database.models.common import (
     LumaRayDuration,
 )
 from bot.database.models.user import UserSettings, UserGender
+from bot.keyboards.cache import cached_keyboard
 from bot.locales.main import get_localization
 from bot.locales.types import LanguageCode
 
 
+@cached_keyboard
 def build_settings_choose_model_type_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -64,6 +66,7 @@ def build_settings_choose_model_type_keyboard(language_code: LanguageCode) -> In
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_settings_choose_text_model_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -107,6 +110,7 @@ def build_settings_choose_text_model_keyboard(language_code: LanguageCode) -> In
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_settings_choose_summary_model_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -130,6 +134,7 @@ def build_settings_choose_summary_model_keyboard(language_code: LanguageCode) ->
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_settings_choose_image_model_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -183,6 +188,7 @@ def build_settings_choose_image_model_keyboard(language_code: LanguageCode) -> I
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_settings_choose_music_model_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -206,6 +212,7 @@ def build_settings_choose_music_model_keyboard(language_code: LanguageCode) -> I
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_settings_choose_video_model_keyboard(language_code: LanguageCode) -> InlineKeyboardMarkup:
     buttons = [
         [
@@ -239,6 +246,7 @@ def build_settings_choose_video_model_keyboard(language_code: LanguageCode) -> I
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_settings_keyboard(
     language_code: LanguageCode,
     model: Model,
@@ -1586,6 +1594,7 @@ def build_settings_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard
 def build_voice_messages_settings_keyboard(
     language_code: LanguageCode,
     settings: dict,
@@ -1,27 +1,37 @@
-from typing import Type
+import importlib
+from contextvars import ContextVar
+from typing import Optional
 
 from aiogram.fsm.storage.base import BaseStorage
 
-from . import en, ru, es, hi
 from .texts import Texts
 from .types import LanguageCode
 from ..database.operations.user.updaters import update_user
 
-localization_classes: dict[LanguageCode, Type[Texts]] = {
-    LanguageCode.EN: en.English,
-    LanguageCode.RU: ru.Russian,
-    LanguageCode.ES: es.Spanish,
-    LanguageCode.HI: hi.Hindi,
+# locales are imported by their first reader, ru alone builds a morphology analyzer on import
+localization_modules: dict[LanguageCode, tuple[str, str]] = {
+    LanguageCode.EN: ('.en', 'English'),
+    LanguageCode.RU: ('.ru', 'Russian'),
+    LanguageCode.ES: ('.es', 'Spanish'),
+    LanguageCode.HI: ('.hi', 'Hindi'),
 }
+localizations: dict[LanguageCode, Texts] = {}
+
+# the language resolved for the user of the update being handled, set by LanguageMiddleware
+current_user_language: ContextVar[Optional[tuple[str, LanguageCode]]] = ContextVar('current_user_language', default=None)
 
 
 async def set_user_language(user_id: str, language_code: LanguageCode, storage: BaseStorage):
-    if language_code not in localization_classes.keys():
+    if language_code not in localization_modules.keys():
         language_code = LanguageCode.EN
 
     key = f'user:{user_id}:language'
     await storage.redis.set(key, language_code)
 
+    current_language = current_user_language.get()
+    if current_language and current_language[0] == str(user_id):
+        current_user_language.set((str(user_id), language_code))
+
     await update_user(
         user_id,
         {
@@ -33,17 +43,29 @@ async def set_user_language(user_id: str, language_code: LanguageCode, storage:
 
 
 async def get_user_language(user_id: str, storage: BaseStorage) -> LanguageCode:
+    current_language = current_user_language.get()
+    if current_language and current_language[0] == str(user_id):
+        return current_language[1]
+
     key = f'user:{user_id}:language'
     language_code = await storage.redis.get(key)
     if language_code is not None:
         language_code = language_code.decode()
 
-    if language_code not in localization_classes.keys():
+    if language_code not in localization_modules.keys():
         return LanguageCode.EN
 
     return language_code
 
 
 def get_localization(language_code: LanguageCode) -> Texts:
-    localization_class = localization_classes.get(language_code, en.English)
-    return localization_class()
+    if language_code not in localization_modules:
+        language_code = LanguageCode.EN
+
+    localization = localizations.get(language_code)
+    if localization is None:
+        module_name, class_name = localization_modules[language_code]
+        localization_class = getattr(importlib.import_module(module_name, __package__), class_name)
+        localization = localizations[language_code] = localization_class()
+
+    return localization
@@ -1,9 +1,9 @@
 import logging
 
-from aiogram.client.session import aiohttp
 import json
 
 from bot.config import config
+from bot.integrations.http_sessions import http_sessions
 
 
 async def get_translate_token() -> str:
@@ -11,15 +11,14 @@ async def get_translate_token() -> str:
     headers = {'Content-Type': 'application/json'}
     data = {'yandexPassportOauthToken': config.OAUTH_YANDEX_TOKEN.get_secret_value()}
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=data, headers=headers) as response:
-            if response.status == 200:
-                token_data = await response.json()
-                return token_data.get('iamToken', '')
-            else:
-                error_message = await response.text()
-                logging.exception(f'Error trying to get IAM_TOKEN: {error_message}')
-                return ''
+    async with http_sessions.get(url).post(url, json=data, headers=headers) as response:
+        if response.status == 200:
+            token_data = await response.json()
+            return token_data.get('iamToken', '')
+        else:
+            error_message = await response.text()
+            logging.exception(f'Error trying to get IAM_TOKEN: {error_message}')
+            return ''
 
 
 async def translate_text(text: str, source_language_code: str, target_language_code: str):
@@ -36,12 +35,11 @@ async def translate_text(text: str, source_language_code: str, target_language_c
         'texts': [text],
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, headers=headers, data=json.dumps(payload)) as response:
-            if response.status == 200:
-                data = await response.json()
-                return data['translations'][0]['text']
-            else:
-                error_message = await response.text()
-                logging.exception(f'Error in translate_text: {error_message}')
-                return ''
+    async with http_sessions.get(url).post(url, headers=headers, data=json.dumps(payload)) as response:
+        if response.status == 200:
+            data = await response.json()
+            return data['translations'][0]['text']
+        else:
+            error_message = await response.text()
+            logging.exception(f'Error in translate_text: {error_message}')
+            return ''
@@ -4,11 +4,17 @@ from typing import Callable, Any, Awaitable
 from aiogram import BaseMiddleware
 from aiogram.types import Message
 
+from bot.config import config
+from bot.database.cache import cache
+
 
 class AlbumMiddleware(BaseMiddleware):
-    def __init__(self, latency: float = 2.0):
-        self.latency = latency
-        self.albums = {}
+    KEY = 'album'
+    TTL_SECONDS = 60
+
+    def __init__(self, idle: float = config.ALBUM_IDLE_SECONDS):
+        self.idle = idle
+        self.waiting = set()
 
     async def __call__(
         self,
@@ -17,17 +23,45 @@ class AlbumMiddleware(BaseMiddleware):
         data: dict[str, Any],
     ):
         if message.media_group_id:
-            if message.media_group_id not in self.albums:
-                self.albums[message.media_group_id] = []
+            # parts of one album may land on different instances, so they are collected in redis
+            album_key = f'{self.KEY}:{message.media_group_id}'
+            async with cache.redis.pipeline(transaction=True) as pipeline:
+                pipeline.rpush(album_key, message.model_dump_json(exclude_none=True))
+                pipeline.expire(album_key, self.TTL_SECONDS)
+                await pipeline.execute()
+
+            if message.media_group_id not in self.waiting:
+                self.waiting.add(message.media_group_id)
                 asyncio.create_task(self.dispatch_album(message.media_group_id, handler, data, message))
-            self.albums[message.media_group_id].append(message)
         else:
             data['album'] = []
             await handler(message, data)
 
     async def dispatch_album(self, media_group_id: str, handler: Callable, data: dict[str, Any], message: Message):
-        await asyncio.sleep(self.latency)
-        album = self.albums.pop(media_group_id, [])
+        album_key = f'{self.KEY}:{media_group_id}'
+        try:
+            # the window restarts whenever another part arrives on any instance
+            parts_count = await cache.redis.llen(album_key)
+            while True:
+                await asyncio.sleep(self.idle)
+                current_parts_count = await cache.redis.llen(album_key)
+                if current_parts_count == parts_count:
+                    break
+                parts_count = current_parts_count
+        finally:
+            # parts arriving from now on start a new window and are dispatched as an album of their own
+            self.waiting.discard(media_group_id)
+
+        # reading and deleting in one transaction is the claim: only one instance gets the parts
+        async with cache.redis.pipeline(transaction=True) as pipeline:
+            pipeline.lrange(album_key, 0, -1)
+            pipeline.delete(album_key)
+            parts, _ = await pipeline.execute()
+
+        album = sorted(
+            [Message.model_validate_json(part, context={'bot': message.bot}) for part in parts],
+            key=lambda part: part.message_id,
+        )
         if album:
             data['album'] = album
-            await handler(message, data)
+            await handler(album[0], data)
@@ -13,13 +13,14 @@ class AuthMessageMiddleware(BaseMiddleware):
         message: Message,
         data: dict[str, Any],
     ):
-        user = await get_user(str(message.from_user.id))
+        user = await get_user(str(message.from_user.id), use_cache=False)
         if user and user.is_banned:
             await message.answer_sticker(
                 'CAACAgIAAxkBAAEMMIJmT_yFTm_LmNvCrZXeEK7t-fdSfAACSQIAAladvQoqlwydCFMhDjUE'
             )
             return
 
+        data['user'] = user
         await handler(message, data)
 
 
@@ -30,11 +31,12 @@ class AuthCallbackQueryMiddleware(BaseMiddleware):
         callback_query: CallbackQuery,
         data: dict[str, Any],
     ):
-        user = await get_user(str(callback_query.from_user.id))
+        user = await get_user(str(callback_query.from_user.id), use_cache=False)
         if user and user.is_banned:
             await callback_query.message.answer_sticker(
                 'CAACAgIAAxkBAAEMMIJmT_yFTm_LmNvCrZXeEK7t-fdSfAACSQIAAladvQoqlwydCFMhDjUE'
             )
             return
 
+        data['user'] = user
         await handler(callback_query, data)
@@ -0,0 +1,42 @@
+from typing import Callable, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message, CallbackQuery
+
+from bot.locales.main import current_user_language, get_user_language
+
+
+class LanguageMessageMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[Message, dict[str, Any]], Awaitable[Any]],
+        message: Message,
+        data: dict[str, Any],
+    ):
+        user_id = str(message.from_user.id)
+        user_language_code = await get_user_language(user_id, data['state'].storage)
+
+        token = current_user_language.set((user_id, user_language_code))
+        try:
+            data['user_language_code'] = user_language_code
+            await handler(message, data)
+        finally:
+            current_user_language.reset(token)
+
+
+class LanguageCallbackQueryMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[CallbackQuery, dict[str, Any]], Awaitable[Any]],
+        callback_query: CallbackQuery,
+        data: dict[str, Any],
+    ):
+        user_id = str(callback_query.from_user.id)
+        user_language_code = await get_user_language(user_id, data['state'].storage)
+
+        token = current_user_language.set((user_id, user_language_code))
+        try:
+            data['user_language_code'] = user_language_code
+            await handler(callback_query, data)
+        finally:
+            current_user_language.reset(token)
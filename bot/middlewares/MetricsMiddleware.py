@@ -0,0 +1,96 @@
+import json
+import logging
+import random
+import time
+from collections import Counter
+from typing import Callable, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message, CallbackQuery
+
+from bot.config import config
+from bot.utils.metrics import (
+    UPDATE_SECONDS,
+    UPDATE_REDIS_ROUND_TRIPS,
+    UPDATE_FIRESTORE_OPERATIONS,
+    UPDATE_FIRESTORE_BUDGET_EXCEEDED,
+    current_update_counts,
+    get_firestore_operations,
+)
+from bot.utils.update_registry import current_update_id
+
+
+def log_update_accounting(
+    labels: tuple[str, str, str],
+    event: Message | CallbackQuery,
+    counts: Counter,
+    seconds: float,
+):
+    firestore_operations = get_firestore_operations(counts)
+    is_over_budget = firestore_operations > config.UPDATE_FIRESTORE_BUDGET
+    if is_over_budget:
+        UPDATE_FIRESTORE_BUDGET_EXCEEDED.labels(*labels).inc()
+    # the counting itself is a few dict increments, only the log line is sampled
+    elif random.random() >= config.UPDATE_ACCOUNTING_SAMPLE_RATE:
+        return
+
+    event_type, router, handler = labels
+    summary = json.dumps({
+        'update_id': current_update_id.get(),
+        'user_id': event.from_user.id if event.from_user else None,
+        'event_type': event_type,
+        'router': router,
+        'handler': handler,
+        'seconds': round(seconds, 3),
+        'firestore_operations': firestore_operations,
+        'firestore_budget': config.UPDATE_FIRESTORE_BUDGET,
+        **counts,
+    })
+    if is_over_budget:
+        logging.warning(f'Update exceeded firestore budget: {summary}')
+    else:
+        logging.info(f'Update accounting: {summary}')
+
+
+async def observe_handler(
+    event_type: str,
+    handler: Callable[[Any, dict[str, Any]], Awaitable[Any]],
+    event: Message | CallbackQuery,
+    data: dict[str, Any],
+):
+    callback = data['handler'].callback
+    labels = event_type, callback.__module__.rsplit('.', 1)[-1], callback.__name__
+
+    counts = Counter()
+    token = current_update_counts.set(counts)
+    started_at = time.monotonic()
+    try:
+        return await handler(event, data)
+    finally:
+        seconds = time.monotonic() - started_at
+        current_update_counts.reset(token)
+
+        UPDATE_SECONDS.labels(*labels).observe(seconds)
+        UPDATE_REDIS_ROUND_TRIPS.labels(*labels).observe(counts['redis_round_trips'])
+        UPDATE_FIRESTORE_OPERATIONS.labels(*labels).observe(get_firestore_operations(counts))
+        log_update_accounting(labels, event, counts, seconds)
+
+
+class MetricsMessageMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[Message, dict[str, Any]], Awaitable[Any]],
+        message: Message,
+        data: dict[str, Any],
+    ):
+        return await observe_handler('message', handler, message, data)
+
+
+class MetricsCallbackQueryMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[CallbackQuery, dict[str, Any]], Awaitable[Any]],
+        callback_query: CallbackQuery,
+        data: dict[str, Any],
+    ):
+        return await observe_handler('callback_query', handler, callback_query, data)
@@ -17,7 +17,7 @@ from bot.locales.main import get_localization, get_user_language
 from bot.locales.types import LanguageCode
 
 
-async def is_messages_limit_exceeded(message: Message, state: FSMContext, user: User, user_quota: Quota):
+def is_messages_limit_reached(user: User, user_quota: Quota) -> bool:
     generation_cost = 1
     if user.current_model == Model.DALL_E:
         generation_cost = get_cost_for_image(
@@ -46,7 +46,11 @@ async def is_messages_limit_exceeded(message: Message, state: FSMContext, user:
 
     max_generations = user.daily_limits[user_quota] + user.additional_usage_quota[user_quota]
 
-    if max_generations < generation_cost:
+    return max_generations < generation_cost
+
+
+async def is_messages_limit_exceeded(message: Message, state: FSMContext, user: User, user_quota: Quota):
+    if is_messages_limit_reached(user, user_quota):
         user_language_code = await get_user_language(user.id, state.storage)
 
         await message.answer_sticker(
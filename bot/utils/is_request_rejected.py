@@ -0,0 +1,151 @@
+import asyncio
+from enum import StrEnum
+
+from aiogram import Bot
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.redis import RedisStorage
+from aiogram.types import Message
+from redis.exceptions import WatchError
+
+from bot.config import config
+from bot.database.models.common import Quota, Model
+from bot.database.models.user import User
+from bot.keyboards.common.common import build_time_limit_exceeded_keyboard
+from bot.locales.main import get_localization, localization_modules
+from bot.locales.types import LanguageCode
+from bot.utils.is_messages_limit_exceeded import is_messages_limit_exceeded, is_messages_limit_reached
+
+
+class RequestGateDecision(StrEnum):
+    PASSED = 'PASSED'
+    ALREADY_PROCESSING = 'ALREADY_PROCESSING'
+    MESSAGES_LIMIT_EXCEEDED = 'MESSAGES_LIMIT_EXCEEDED'
+    TIME_LIMIT_EXCEEDED = 'TIME_LIMIT_EXCEEDED'
+    ALREADY_WAITING = 'ALREADY_WAITING'
+
+
+async def notify_user_after_timeout(bot: Bot, chat_id: int, delay: int, language_code: LanguageCode, reply_to_message_id: int):
+    await asyncio.sleep(delay)
+
+    await bot.send_message(
+        chat_id=chat_id,
+        text=get_localization(language_code).MODEL_READY_FOR_NEW_REQUEST,
+        reply_to_message_id=reply_to_message_id,
+        allow_sending_without_reply=True,
+    )
+
+
+def get_request_gate_decision(
+    user_data: dict,
+    current_time: float,
+    is_limit_reached: bool,
+    is_time_limited: bool,
+) -> tuple[RequestGateDecision, bool]:
+    is_cleared = False
+
+    if user_data.get('is_processing'):
+        last_request_time = user_data.get('last_request_time')
+        if last_request_time is None or current_time - last_request_time >= config.LIMIT_PROCESSING_SECONDS:
+            user_data['is_processing'] = False
+        else:
+            return RequestGateDecision.ALREADY_PROCESSING, is_cleared
+
+    if is_limit_reached:
+        return RequestGateDecision.MESSAGES_LIMIT_EXCEEDED, is_cleared
+
+    last_request_time = user_data.get('last_request_time', 0.0)
+    if is_time_limited and last_request_time:
+        if current_time - last_request_time >= config.LIMIT_BETWEEN_REQUESTS_SECONDS:
+            user_data.clear()
+            is_cleared = True
+        elif user_data.get('additional_request_made'):
+            return RequestGateDecision.ALREADY_WAITING, is_cleared
+        else:
+            user_data['additional_request_made'] = True
+            return RequestGateDecision.TIME_LIMIT_EXCEEDED, is_cleared
+
+    return RequestGateDecision.PASSED, is_cleared
+
+
+async def is_request_rejected(
+    message: Message,
+    state: FSMContext,
+    user: User,
+    user_quota: Quota,
+    current_time: float,
+    update_last_request_time=True,
+) -> bool:
+    storage: RedisStorage = state.storage
+    data_key = storage.key_builder.build(state.key, 'data')
+    state_key = storage.key_builder.build(state.key, 'state')
+    language_key = f'user:{message.chat.id}:language'
+
+    is_limit_reached = is_messages_limit_reached(user, user_quota)
+    is_time_limited = not (
+        user.daily_limits[Quota.FAST_MESSAGES] or
+        user.additional_usage_quota[Quota.FAST_MESSAGES] or
+        user.current_model == Model.FACE_SWAP or
+        user.current_model == Model.PHOTOSHOP_AI or
+        user.current_model == Model.MUSIC_GEN or
+        user.current_model == Model.SUNO
+    )
+
+    # the fsm data is read and written back in one optimistic transaction instead of a get/update per check
+    async with storage.redis.pipeline(transaction=True) as pipeline:
+        while True:
+            try:
+                await pipeline.watch(data_key)
+                user_data, user_language_code = await pipeline.mget(data_key, language_key)
+                user_data = storage.json_loads(user_data) if user_data else {}
+                initial_user_data = dict(user_data)
+
+                decision, is_cleared = get_request_gate_decision(
+                    user_data,
+                    current_time,
+                    is_limit_reached,
+                    is_time_limited,
+                )
+                if decision == RequestGateDecision.PASSED and update_last_request_time:
+                    user_data['last_request_time'] = current_time
+
+                pipeline.multi()
+                if is_cleared:
+                    pipeline.delete(state_key)
+                if not user_data:
+                    pipeline.delete(data_key)
+                elif user_data != initial_user_data:
+                    pipeline.set(data_key, storage.json_dumps(user_data), ex=storage.data_ttl)
+                await pipeline.execute()
+                break
+            except WatchError:
+                continue
+
+    user_language_code = user_language_code.decode() if user_language_code else None
+    if user_language_code not in localization_modules.keys():
+        user_language_code = LanguageCode.EN
+
+    if decision == RequestGateDecision.ALREADY_PROCESSING or decision == RequestGateDecision.ALREADY_WAITING:
+        await message.reply(
+            text=get_localization(user_language_code).MODEL_ALREADY_MAKE_REQUEST,
+            allow_sending_without_reply=True,
+        )
+    elif decision == RequestGateDecision.MESSAGES_LIMIT_EXCEEDED:
+        await is_messages_limit_exceeded(message, state, user, user_quota)
+    elif decision == RequestGateDecision.TIME_LIMIT_EXCEEDED:
+        remaining_time = int(config.LIMIT_BETWEEN_REQUESTS_SECONDS - (current_time - user_data['last_request_time']))
+        await message.reply(
+            text=get_localization(user_language_code).model_wait_for_another_request(remaining_time),
+            reply_markup=build_time_limit_exceeded_keyboard(user_language_code),
+            allow_sending_without_reply=True,
+        )
+        asyncio.create_task(
+            notify_user_after_timeout(
+                bot=message.bot,
+                chat_id=message.chat.id,
+                delay=remaining_time,
+                language_code=user_language_code,
+                reply_to_message_id=message.message_id,
+            )
+        )
+
+    return decision != RequestGateDecision.PASSED
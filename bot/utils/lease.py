@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import uuid
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from bot.database.cache import cache
+
+EXTEND_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class Lease:
+    """
+    Redis lock that stores its owner's token. A heartbeat extends it while the owner runs, so it is only taken over
+    after the owner died, and only the owner can extend or release it.
+    """
+
+    key: str
+    seconds: int
+    token: str
+    is_held: bool
+    heartbeat_task: Optional[asyncio.Task]
+
+    def __init__(self, key: str, seconds: int):
+        self.key = key
+        self.seconds = seconds
+        self.token = uuid.uuid4().hex
+        self.is_held = False
+        self.heartbeat_task = None
+
+    async def acquire(self) -> bool:
+        self.is_held = bool(await cache.redis.set(self.key, self.token, nx=True, ex=self.seconds))
+        if self.is_held:
+            self.heartbeat_task = asyncio.create_task(self.heartbeat())
+
+        return self.is_held
+
+    async def heartbeat(self):
+        while self.is_held:
+            await asyncio.sleep(self.seconds / 3)
+            try:
+                if not await cache.redis.eval(EXTEND_SCRIPT, 1, self.key, self.token, self.seconds):
+                    logging.warning(f'Lease {self.key} was lost')
+                    self.is_held = False
+            except RedisError as e:
+                # the next beat still lands before the lease expires
+                logging.warning(f'Lease heartbeat failed for {self.key}: {e}')
+
+    async def release(self):
+        if self.heartbeat_task:
+            self.heartbeat_task.cancel()
+            self.heartbeat_task = None
+
+        if self.is_held:
+            self.is_held = False
+            await cache.redis.eval(RELEASE_SCRIPT, 1, self.key, self.token)
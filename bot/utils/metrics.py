@@ -0,0 +1,246 @@
+import functools
+import inspect
+import time
+from collections import Counter as Counts
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+
+LONG_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+MODEL_ARGUMENTS = ('model_version', 'model_name', 'version')
+FIRESTORE_OPERATIONS = ('firestore_reads', 'firestore_queries', 'firestore_commits')
+
+UPDATE_SECONDS = Histogram(
+    'bot_update_handling_seconds',
+    'Time spent in a handler, middlewares included',
+    ['event_type', 'router', 'handler'],
+    buckets=LONG_BUCKETS,
+)
+UPDATE_REDIS_ROUND_TRIPS = Histogram(
+    'bot_update_redis_round_trips',
+    'Redis round trips made while handling one update',
+    ['event_type', 'router', 'handler'],
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64),
+)
+UPDATE_FIRESTORE_OPERATIONS = Histogram(
+    'bot_update_firestore_operations',
+    'Firestore reads, queries and commits made while handling one update',
+    ['event_type', 'router', 'handler'],
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64),
+)
+UPDATE_FIRESTORE_BUDGET_EXCEEDED = Counter(
+    'bot_update_firestore_budget_exceeded',
+    'Updates that made more Firestore operations than the configured budget',
+    ['event_type', 'router', 'handler'],
+)
+INTEGRATION_SECONDS = Histogram(
+    'bot_integration_request_seconds',
+    'Latency of calls to AI providers',
+    ['provider', 'operation', 'model', 'status'],
+    buckets=LONG_BUCKETS,
+)
+INTEGRATION_TOKENS = Counter(
+    'bot_integration_tokens',
+    'Tokens reported by AI providers',
+    ['provider', 'model', 'direction'],
+)
+FIRESTORE_SECONDS = Histogram(
+    'bot_firestore_operation_seconds',
+    'Latency of Firestore RPCs',
+    ['operation'],
+)
+FIRESTORE_DOCUMENTS = Counter(
+    'bot_firestore_documents',
+    'Documents read from or written to Firestore',
+    ['operation'],
+)
+STORAGE_SECONDS = Histogram(
+    'bot_storage_operation_seconds',
+    'Latency of Cloud Storage calls',
+    ['operation'],
+)
+REDIS_ROUND_TRIPS = Counter(
+    'bot_redis_round_trips',
+    'Commands or pipelines sent to Redis',
+)
+WEBHOOK_SECONDS = Histogram(
+    'bot_webhook_processing_seconds',
+    'Time spent processing a provider webhook',
+    ['provider'],
+    buckets=LONG_BUCKETS,
+)
+UPDATE_EXECUTOR_STATS = Gauge(
+    'bot_update_executor',
+    'Update executor counters',
+    ['name'],
+)
+HTTP_SESSION_STATS = Gauge(
+    'bot_http_session',
+    'Pooled HTTP session counters',
+    ['host', 'name'],
+)
+STARTUP_SECONDS = Gauge(
+    'bot_startup_seconds',
+    'Time spent in each phase of the instance cold start',
+    ['phase'],
+)
+
+current_update_counts: ContextVar[Optional[Counts]] = ContextVar('current_update_counts', default=None)
+
+
+def count_update_operation(name: str, amount=1):
+    counts = current_update_counts.get()
+    if counts is not None:
+        counts[name] += amount
+
+
+def get_firestore_operations(counts: Counts) -> int:
+    return sum(counts[name] for name in FIRESTORE_OPERATIONS)
+
+
+def get_model_label(signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    arguments = signature.bind_partial(*args, **kwargs).arguments
+    return next((str(arguments[name]) for name in MODEL_ARGUMENTS if arguments.get(name)), '')
+
+
+def observe_tokens(provider: str, model: str, response):
+    if isinstance(response, dict):
+        for direction in ('input', 'output'):
+            if response.get(f'{direction}_tokens'):
+                INTEGRATION_TOKENS.labels(provider, model, direction).inc(response[f'{direction}_tokens'])
+
+
+def observe_integration(provider: str):
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        if inspect.isasyncgenfunction(function):
+            @functools.wraps(function)
+            async def generator_wrapper(*args, **kwargs):
+                model = get_model_label(signature, args, kwargs)
+                started_at = time.monotonic()
+                status = 'error'
+                try:
+                    async for chunk in function(*args, **kwargs):
+                        observe_tokens(provider, model, chunk)
+                        yield chunk
+                    status = 'ok'
+                finally:
+                    INTEGRATION_SECONDS.labels(provider, function.__name__, model, status).observe(
+                        time.monotonic() - started_at,
+                    )
+
+            return generator_wrapper
+
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            model = get_model_label(signature, args, kwargs)
+            started_at = time.monotonic()
+            status = 'error'
+            try:
+                response = await function(*args, **kwargs)
+                observe_tokens(provider, model, response)
+                status = 'ok'
+                return response
+            finally:
+                INTEGRATION_SECONDS.labels(provider, function.__name__, model, status).observe(
+                    time.monotonic() - started_at,
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def observe_webhook(provider: str):
+    def decorator(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            with WEBHOOK_SECONDS.labels(provider).time():
+                return await function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_firestore(api):
+    # every firestore call of the async client goes through these gapic methods, so wrapping them covers the whole app
+    def instrument_unary(operation: str):
+        method = getattr(api, operation)
+
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            if operation == 'commit':
+                request = kwargs.get('request')
+                writes = len(request.get('writes') or []) if isinstance(request, dict) else 0
+                FIRESTORE_DOCUMENTS.labels(operation).inc(writes)
+                count_update_operation('firestore_commits')
+                count_update_operation('firestore_writes', writes)
+
+            with FIRESTORE_SECONDS.labels(operation).time():
+                return await method(*args, **kwargs)
+
+        setattr(api, operation, wrapper)
+
+    def instrument_stream(operation: str, update_operation: str, is_document: Callable[[Any], bool]):
+        method = getattr(api, operation)
+
+        async def observe_stream(stream, started_at: float):
+            documents = 0
+            try:
+                async for response in stream:
+                    # proto-plus raises on fields the response type does not have, so each stream checks its own
+                    if is_document(response):
+                        documents += 1
+                    yield response
+            finally:
+                FIRESTORE_SECONDS.labels(operation).observe(time.monotonic() - started_at)
+                FIRESTORE_DOCUMENTS.labels(operation).inc(documents)
+                count_update_operation('firestore_documents', documents)
+
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            count_update_operation(update_operation)
+            started_at = time.monotonic()
+            return observe_stream(await method(*args, **kwargs), started_at)
+
+        setattr(api, operation, wrapper)
+
+    for operation in ('commit', 'begin_transaction', 'rollback', 'list_documents', 'list_collection_ids'):
+        instrument_unary(operation)
+    instrument_stream('batch_get_documents', 'firestore_reads', lambda response: 'found' in response)
+    instrument_stream('run_query', 'firestore_queries', lambda response: 'document' in response)
+    instrument_stream('run_aggregation_query', 'firestore_queries', lambda response: 'result' in response)
+
+
+def instrument_storage(storage):
+    def instrument(operation: str):
+        method = getattr(storage, operation)
+
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            count_update_operation('storage_operations')
+            with STORAGE_SECONDS.labels(operation).time():
+                return await method(*args, **kwargs)
+
+        setattr(storage, operation, wrapper)
+
+    for operation in ('download', 'download_metadata', 'upload', 'delete', 'copy', 'list_objects', 'patch_metadata'):
+        instrument(operation)
+
+
+def instrument_redis(redis):
+    pool = redis.connection_pool
+    connection_class = pool.connection_class
+
+    async def send_packed_command(self, command, check_health=True):
+        REDIS_ROUND_TRIPS.inc()
+        count_update_operation('redis_round_trips')
+        await connection_class.send_packed_command(self, command, check_health)
+
+    # a pipeline is packed into one send, so this counts round trips rather than commands
+    pool.connection_class = type(connection_class.__name__, (connection_class,), {
+        'send_packed_command': send_packed_command,
+    })
@@ -1,10 +1,37 @@
-from aiogram import Bot
+import asyncio
 
+from aiogram import Bot
 
-# from bot.helpers.senders.send_message_to_admins_and_developers import send_message_to_admins_and_developers
+from bot.config import config
+from bot.database.main import firebase
+from bot.database.models.user import User
+from bot.database.operations.transaction.getters import get_last_transaction_by_user
+from bot.helpers.senders.send_message_to_admins_and_developers import send_message_to_admins_and_developers
 
 
 async def migrate(bot: Bot):
-    pass
+    users_query = firebase.db.collection(User.COLLECTION_NAME).limit(config.BATCH_SIZE)
+    last_doc = None
+
+    while True:
+        page_query = users_query.start_after(last_doc) if last_doc else users_query
+        docs = [doc async for doc in page_query.stream()]
+
+        docs_without_last_usage = [doc for doc in docs if 'last_usage_at' not in doc.to_dict()]
+        last_transactions = await asyncio.gather(*[
+            get_last_transaction_by_user(doc.id) for doc in docs_without_last_usage
+        ])
+
+        batch = firebase.db.batch()
+        for doc, last_transaction in zip(docs_without_last_usage, last_transactions):
+            batch.update(doc.reference, {
+                'last_usage_at': last_transaction.created_at if last_transaction else None,
+            })
+        await batch.commit()
+
+        if len(docs) < config.BATCH_SIZE:
+            break
+
+        last_doc = docs[-1]
 
-    # await send_message_to_admins_and_developers(bot, '<b>Database Migration Was Successful!</b> 🎉')
+    await send_message_to_admins_and_developers(bot, '<b>Database Migration Was Successful!</b> 🎉')
@@ -0,0 +1,67 @@
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from bot.utils.metrics import STARTUP_SECONDS
+
+
+def get_process_uptime() -> Optional[float]:
+    # the interpreter started before any of our code ran, so its start time comes from the kernel
+    try:
+        with open('/proc/self/stat') as stat_file:
+            start_ticks = int(stat_file.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as uptime_file:
+            uptime = float(uptime_file.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+
+
+class StartupReport:
+    phases: dict[str, float]
+    ready_at: Optional[float]
+
+    def __init__(self):
+        self.phases = {}
+        self.ready_at = None
+
+    def record(self, phase: str, seconds: float):
+        self.phases[phase] = round(seconds, 3)
+        STARTUP_SECONDS.labels(phase).set(seconds)
+
+    @contextmanager
+    def measure(self, phase: str):
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(phase, time.monotonic() - started_at)
+
+    def start(self):
+        uptime = get_process_uptime()
+        if uptime is not None:
+            self.record('imports', uptime)
+
+    def finish(self):
+        self.ready_at = time.monotonic()
+        uptime = get_process_uptime()
+        if uptime is not None:
+            self.record('total', uptime)
+
+        logging.info(f'Startup report: {json.dumps(self.phases)}')
+
+    def observe_update(self, processing_seconds: float):
+        if self.ready_at is None or 'first_update' in self.phases:
+            return
+
+        self.record('first_update', processing_seconds)
+        self.record('first_update_after_ready', time.monotonic() - self.ready_at)
+
+        logging.info(f'Startup report: {json.dumps(self.phases)}')
+
+
+startup_report = StartupReport()
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+from cachetools import TTLCache
+
+from bot.config import config
+
+
+class TelegramRateLimiter:
+    rate: float
+    chat_interval: float
+    tokens: float
+    updated_at: float
+    paused_until: float
+    chat_next_times: TTLCache
+    lock: asyncio.Lock
+
+    def __init__(self, rate: float, chat_interval: float):
+        self.rate = rate
+        self.chat_interval = chat_interval
+        self.tokens = rate
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.chat_next_times = TTLCache(maxsize=100000, ttl=chat_interval)
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, chat_id: str):
+        while True:
+            async with self.lock:
+                now = time.monotonic()
+                wait = max(self.paused_until - now, self.chat_next_times.get(chat_id, 0) - now)
+                if wait <= 0:
+                    self.tokens = min(self.rate, self.tokens + (now - self.updated_at) * self.rate)
+                    self.updated_at = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.chat_next_times[chat_id] = now + self.chat_interval
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        # telegram's retry_after applies to the whole bot, not only to the chat that got it
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+telegram_rate_limiter = TelegramRateLimiter(
+    rate=config.TELEGRAM_MESSAGES_PER_SECOND,
+    chat_interval=config.TELEGRAM_CHAT_MESSAGE_INTERVAL_SECONDS,
+)
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+from aiogram.types import Update
+
+from bot.config import config
+from bot.helpers.getters.get_user_id_from_telegram_update import get_user_id_from_telegram_update
+from bot.utils.startup_report import startup_report
+
+UpdateHandler = Callable[[Update], Awaitable[None]]
+
+
+class UpdateExecutor:
+    handler: Optional[UpdateHandler]
+    semaphore: Optional[asyncio.Semaphore]
+    queues: dict[str, deque[tuple[Update, float]]]
+    tasks: set[asyncio.Task]
+    pending: int
+    running: int
+    counters: dict[str, float]
+
+    def __init__(self):
+        self.handler = None
+        self.semaphore = None
+        self.queues = {}
+        self.tasks = set()
+        self.pending = 0
+        self.running = 0
+        self.counters = {
+            'accepted': 0,
+            'rejected': 0,
+            'processed': 0,
+            'released_early': 0,
+            'wait_seconds_total': 0.0,
+            'wait_seconds_max': 0.0,
+            'processing_seconds_total': 0.0,
+            'processing_seconds_max': 0.0,
+        }
+
+    async def init(self, handler: UpdateHandler):
+        self.handler = handler
+        self.semaphore = asyncio.Semaphore(config.UPDATE_EXECUTOR_WORKERS)
+
+    async def close(self):
+        deadline = time.monotonic() + config.UPDATE_EXECUTOR_SHUTDOWN_SECONDS
+        # drains keep spawning processing tasks, so wait until nothing is left rather than for a snapshot
+        while self.tasks and time.monotonic() < deadline:
+            await asyncio.wait(list(self.tasks), timeout=deadline - time.monotonic())
+
+    def submit(self, update: Update) -> bool:
+        if self.pending >= config.UPDATE_EXECUTOR_MAX_PENDING:
+            self.counters['rejected'] += 1
+            return False
+
+        self.pending += 1
+        self.counters['accepted'] += 1
+
+        key = get_user_id_from_telegram_update(update) or f'update:{update.update_id}'
+        queue = self.queues.get(key)
+        if queue is None:
+            queue = self.queues[key] = deque()
+            self.spawn(self.drain(key, queue))
+        queue.append((update, time.monotonic()))
+
+        return True
+
+    def spawn(self, coroutine: Awaitable):
+        task = asyncio.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def drain(self, key: str, queue: deque[tuple[Update, float]]):
+        try:
+            while queue:
+                update, submitted_at = queue.popleft()
+                await self.semaphore.acquire()
+
+                self.pending -= 1
+                wait_seconds = time.monotonic() - submitted_at
+                self.counters['wait_seconds_total'] += wait_seconds
+                self.counters['wait_seconds_max'] = max(self.counters['wait_seconds_max'], wait_seconds)
+
+                task = self.spawn(self.process(update))
+                # long generations keep their worker, but stop holding back the user's next updates (e.g. a cancel button)
+                done, _ = await asyncio.wait({task}, timeout=config.UPDATE_EXECUTOR_USER_SERIAL_SECONDS)
+                if not done:
+                    self.counters['released_early'] += 1
+        finally:
+            self.queues.pop(key, None)
+
+    async def process(self, update: Update):
+        self.running += 1
+        started_at = time.monotonic()
+        try:
+            await self.handler(update)
+        except Exception as e:
+            logging.exception(f'Error in update_executor: {e}')
+        finally:
+            processing_seconds = time.monotonic() - started_at
+            self.counters['processed'] += 1
+            self.counters['processing_seconds_total'] += processing_seconds
+            self.counters['processing_seconds_max'] = max(self.counters['processing_seconds_max'], processing_seconds)
+            startup_report.observe_update(processing_seconds)
+            self.running -= 1
+            self.semaphore.release()
+
+    def get_stats(self) -> dict[str, float]:
+        return {
+            **self.counters,
+            'pending': self.pending,
+            'running': self.running,
+            'users': len(self.queues),
+            'workers': config.UPDATE_EXECUTOR_WORKERS,
+            'max_pending': config.UPDATE_EXECUTOR_MAX_PENDING,
+        }
+
+
+update_executor = UpdateExecutor()
@@ -0,0 +1,45 @@
+import logging
+import pickle
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from redis.exceptions import RedisError
+
+from bot.config import config
+from bot.database.cache import cache
+
+T = TypeVar('T')
+
+current_update_id: ContextVar[Optional[int]] = ContextVar('current_update_id', default=None)
+
+
+async def claim_update(update_id: int) -> bool:
+    try:
+        return bool(await cache.redis.set(f'update:{update_id}', 1, nx=True, ex=config.UPDATE_DEDUPE_TTL_SECONDS))
+    except RedisError as e:
+        # processing an update twice is better than dropping it
+        logging.warning(f'Update claim failed for {update_id}: {e}')
+        return True
+
+
+async def run_checkpoint(step: str, action: Callable[[], Awaitable[T]]) -> T:
+    update_id = current_update_id.get()
+    if update_id is None:
+        return await action()
+
+    key = f'update:{update_id}:checkpoint:{step}'
+    try:
+        payload = await cache.redis.get(key)
+        if payload is not None:
+            return pickle.loads(payload)
+    except RedisError as e:
+        logging.warning(f'Checkpoint get failed for {key}: {e}')
+
+    result = await action()
+    if result is not None:
+        try:
+            await cache.redis.set(key, pickle.dumps(result), ex=config.UPDATE_DEDUPE_TTL_SECONDS)
+        except RedisError as e:
+            logging.warning(f'Checkpoint set failed for {key}: {e}')
+
+    return result
@@ -6,6 +6,7 @@ import traceback
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 from functools import partial
+from typing import Optional
 
 import uvicorn
 from aiogram.client.default import DefaultBotProperties
@@ -20,16 +21,17 @@ from aiogram.exceptions import (
 from aiogram.types import Update
 from aiohttp import ClientOSError, ClientTimeout
 from fastapi import FastAPI, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from aiogram import Bot, Dispatcher, types
 from aiogram.enums.parse_mode import ParseMode
 from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.fsm.strategy import FSMStrategy
-from redis.backoff import FullJitterBackoff
-from redis.retry import Retry
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from redis.exceptions import ConnectionError
 
 from bot.config import config
+from bot.database.cache import cache
+from bot.database.ledger import ledger
 from bot.database.main import firebase
 from bot.handlers.admin.admin_handler import admin_router
 from bot.handlers.admin.ads_handler import ads_router
@@ -94,14 +96,29 @@ from bot.helpers.handlers.handle_stripe_webhook import handle_stripe_webhook
 from bot.helpers.handlers.handle_suno_webhook import handle_suno_webhook
 from bot.helpers.handlers.handle_yookassa_webhook import handle_yookassa_webhook
 from bot.helpers.notifiers.notify_admins_about_error import notify_admins_about_error
+from bot.helpers.pollers.poll_face_swap_video import poll_face_swap_video
+from bot.helpers.pollers.poll_runway_video import poll_runway_video
+from bot.helpers.pollers.poll_scheduler import poll_scheduler, PollJobKind
+from bot.helpers.senders.outbox import outbox, OutboxKind
+from bot.helpers.senders.send_message_to_users import resume_broadcasts
 from bot.helpers.senders.send_statistics import send_statistics
 from bot.helpers.setters.set_commands import set_commands
 from bot.helpers.setters.set_description import set_description
 from bot.helpers.updaters.update_daily_limits import update_daily_limits
+from bot.helpers.updaters.update_daily_statistics import update_daily_statistics
+from bot.integrations.http_sessions import http_sessions
+from bot.integrations.open_ai import get_client as get_open_ai_client
 from bot.locales.main import get_localization
+from bot.locales.types import LanguageCode
 from bot.middlewares.AuthMiddleware import AuthMessageMiddleware, AuthCallbackQueryMiddleware
+from bot.middlewares.LanguageMiddleware import LanguageMessageMiddleware, LanguageCallbackQueryMiddleware
 from bot.middlewares.LoggingMiddleware import LoggingMessageMiddleware, LoggingCallbackQueryMiddleware
+from bot.middlewares.MetricsMiddleware import MetricsMessageMiddleware, MetricsCallbackQueryMiddleware
+from bot.utils.metrics import UPDATE_EXECUTOR_STATS, HTTP_SESSION_STATS
 from bot.utils.migrate import migrate
+from bot.utils.startup_report import startup_report
+from bot.utils.update_executor import update_executor
+from bot.utils.update_registry import claim_update, current_update_id
 
 WEBHOOK_BOT_PATH = f'/bot/{config.BOT_TOKEN.get_secret_value()}'
 WEBHOOK_YOOKASSA_PATH = '/payment/yookassa'
@@ -132,12 +149,7 @@ bot = Bot(
         allow_sending_without_reply=True,
     ),
 )
-storage = RedisStorage.from_url(config.REDIS_URL, {
-    'socket_keepalive': True,
-    'health_check_interval': 30,
-    'retry_on_timeout': True,
-    'retry': Retry(FullJitterBackoff(cap=5, base=1), 5),
-})
+storage = RedisStorage(redis=cache.redis)
 dp = Dispatcher(
     storage=storage,
     sm_strategy=FSMStrategy.GLOBAL_USER,
@@ -155,11 +167,18 @@ additional_bots = [
 ]
 
 
+async def set_webhook():
+    try:
+        webhook_info = await bot.get_webhook_info()
+        if webhook_info.url != WEBHOOK_BOT_URL:
+            await bot.set_webhook(url=WEBHOOK_BOT_URL)
+    except Exception as e:
+        logging.exception(f'Error in set_webhook: {e}')
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    webhook_info = await bot.get_webhook_info()
-    if webhook_info.url != WEBHOOK_BOT_URL:
-        await bot.set_webhook(url=WEBHOOK_BOT_URL)
+    startup_report.start()
 
     dp.include_routers(
         maintenance_router,
@@ -211,13 +230,43 @@ async def lifespan(_: FastAPI):
         text_router,
     )
 
+    dp.message.middleware(MetricsMessageMiddleware())
+    dp.callback_query.middleware(MetricsCallbackQueryMiddleware())
     dp.message.middleware(LoggingMessageMiddleware())
     dp.callback_query.middleware(LoggingCallbackQueryMiddleware())
     dp.message.middleware(AuthMessageMiddleware())
     dp.callback_query.middleware(AuthCallbackQueryMiddleware())
-
-    await firebase.init()
+    dp.message.middleware(LanguageMessageMiddleware())
+    dp.callback_query.middleware(LanguageCallbackQueryMiddleware())
+
+    with startup_report.measure('firebase'):
+        await firebase.init()
+    with startup_report.measure('ledger'):
+        await ledger.init()
+    with startup_report.measure('workers'):
+        await update_executor.init(handle_update)
+        await outbox.init(bot, {
+            OutboxKind.UPDATE: redeliver_update,
+        })
+        await poll_scheduler.init(bot, dp, {
+            PollJobKind.RUNWAY_VIDEO: poll_runway_video,
+            PollJobKind.FACE_SWAP_VIDEO: poll_face_swap_video,
+        })
+    with startup_report.measure('warm_up'):
+        # clients and locales are built on first use, so the ones nearly every first update needs are built here
+        get_localization(LanguageCode.EN)
+        get_open_ai_client()
+
+    # the webhook is already registered on every start but the first, so checking it does not hold back traffic
+    asyncio.create_task(set_webhook())
+    asyncio.create_task(resume_broadcasts(bot))
+    startup_report.finish()
     yield
+    await update_executor.close()
+    await outbox.close()
+    await poll_scheduler.close()
+    await ledger.close()
+    await http_sessions.close()
     await bot.session.close()
     await storage.close()
     await firebase.close()
@@ -227,12 +276,15 @@ app = FastAPI(lifespan=lifespan)
 
 
 @app.post(WEBHOOK_BOT_PATH)
-async def bot_webhook(update: dict, background_tasks: BackgroundTasks):
-    background_tasks.add_task(handle_update, update)
+async def bot_webhook(update: dict):
+    # a 429 makes telegram hold the update and retry it later instead of piling it up here
+    if not update_executor.submit(types.Update(**update)):
+        return JSONResponse(content={}, status_code=429, headers={'Retry-After': '1'})
 
 
-async def delayed_handle_update(update: Update, timeout: int):
-    await asyncio.sleep(timeout)
+async def redeliver_update(_: Bot, payload: dict):
+    update = Update.model_validate(payload['update'], context={'bot': bot})
+    current_update_id.set(update.update_id)
 
     try:
         await dp.feed_update(bot=bot, update=update)
@@ -252,7 +304,8 @@ async def delayed_handle_update(update: Update, timeout: int):
             logging.warning(e)
         else:
             logging.error(f'Error in bot_delayed_webhook telegram retry after: {e}')
-            asyncio.create_task(delayed_handle_update(update, e.retry_after + 30))
+            # the outbox reschedules the job and counts it against OUTBOX_MAX_ATTEMPTS
+            raise
     except TelegramBadRequest as e:
         if e.message.startswith('Bad Request: message can\'t be deleted for everyone'):
             logging.warning(e)
@@ -273,8 +326,12 @@ async def delayed_handle_update(update: Update, timeout: int):
         await notify_admins_about_error(bot, update, dp, e)
 
 
-async def handle_update(update: dict):
-    telegram_update = types.Update(**update)
+async def handle_update(telegram_update: Update):
+    if not await claim_update(telegram_update.update_id):
+        logging.warning(f'Skipped duplicate update {telegram_update.update_id}')
+        return
+
+    current_update_id.set(telegram_update.update_id)
     try:
         for i in range(config.MAX_RETRIES):
             try:
@@ -307,7 +364,9 @@ async def handle_update(update: dict):
             logging.warning(e)
         else:
             logging.error(f'Error in bot_webhook telegram retry after: {e}')
-            asyncio.create_task(delayed_handle_update(telegram_update, e.retry_after + 30))
+            await outbox.enqueue(OutboxKind.UPDATE, {
+                'update': telegram_update.model_dump(mode='json', exclude_none=True),
+            }, e.retry_after + 30)
     except TelegramBadRequest as e:
         if e.message.startswith('Bad Request: file is too big'):
             await handle_big_file(bot, telegram_update)
@@ -404,6 +463,17 @@ async def check_health(background_tasks: BackgroundTasks):
     return {'code': 200}
 
 
+@app.get('/metrics')
+async def metrics():
+    for name, value in update_executor.get_stats().items():
+        UPDATE_EXECUTOR_STATS.labels(name).set(value)
+    for host, stats in http_sessions.get_stats().items():
+        for name, value in stats.items():
+            HTTP_SESSION_STATS.labels(host, name).set(value)
+
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get('/run-daily-tasks')
 async def run_daily_tasks(background_tasks: BackgroundTasks):
     yesterday_utc_day = datetime.now(timezone.utc) - timedelta(days=1)
@@ -412,6 +482,7 @@ async def run_daily_tasks(background_tasks: BackgroundTasks):
     await check_waiting_payments()
 
     today = datetime.now()
+    background_tasks.add_task(update_daily_statistics, yesterday_utc_day)
     background_tasks.add_task(send_statistics, bot, 'day')
     if today.weekday() == 0:
         background_tasks.add_task(send_statistics, bot, 'week')
@@ -421,9 +492,20 @@ async def run_daily_tasks(background_tasks: BackgroundTasks):
     return {'code': 200}
 
 
+@app.get('/backfill-daily-statistics')
+async def backfill_daily_statistics(background_tasks: BackgroundTasks, start_date: str, end_date: Optional[str] = None):
+    background_tasks.add_task(
+        update_daily_statistics,
+        datetime.strptime(start_date, '%Y-%m-%d'),
+        datetime.strptime(end_date, '%Y-%m-%d') if end_date else None,
+    )
+
+    return {'code': 200}
+
+
 @app.get('/update-daily-limits')
-async def daily_tasks(background_tasks: BackgroundTasks):
-    background_tasks.add_task(update_daily_limits, bot, storage)
+async def daily_tasks(background_tasks: BackgroundTasks, shard: int = 0, shards: int = 1):
+    background_tasks.add_task(update_daily_limits, bot, storage, shard, shards)
 
     return {'code': 200}
 
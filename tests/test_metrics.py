@@ -0,0 +1,68 @@
+import asyncio
+from collections import Counter as Counts
+
+from google.cloud.firestore_v1 import types
+
+from bot.utils.metrics import current_update_counts, instrument_firestore
+
+
+async def stream(*responses):
+    for response in responses:
+        yield response
+
+
+class FakeFirestoreApi:
+    async def commit(self, request=None, **kwargs):
+        return types.CommitResponse()
+
+    async def begin_transaction(self, **kwargs):
+        return types.BeginTransactionResponse()
+
+    async def rollback(self, **kwargs):
+        pass
+
+    async def list_documents(self, **kwargs):
+        return []
+
+    async def list_collection_ids(self, **kwargs):
+        return []
+
+    async def batch_get_documents(self, **kwargs):
+        return stream(
+            types.BatchGetDocumentsResponse(found=types.Document(name='users/1')),
+            types.BatchGetDocumentsResponse(missing='users/2'),
+        )
+
+    async def run_query(self, **kwargs):
+        return stream(
+            types.RunQueryResponse(transaction=b'id'),
+            types.RunQueryResponse(document=types.Document(name='users/1')),
+            types.RunQueryResponse(document=types.Document(name='users/2')),
+        )
+
+    async def run_aggregation_query(self, **kwargs):
+        return stream(
+            types.RunAggregationQueryResponse(result=types.AggregationResult()),
+        )
+
+
+async def read_all(operation):
+    return [response async for response in await operation()]
+
+
+def test_instrumented_streams_count_documents_of_their_own_response_type():
+    api = FakeFirestoreApi()
+    instrument_firestore(api)
+
+    counts = Counts()
+    token = current_update_counts.set(counts)
+    try:
+        assert len(asyncio.run(read_all(api.batch_get_documents))) == 2
+        assert len(asyncio.run(read_all(api.run_query))) == 3
+        assert len(asyncio.run(read_all(api.run_aggregation_query))) == 1
+    finally:
+        current_update_counts.reset(token)
+
+    assert counts['firestore_reads'] == 1
+    assert counts['firestore_queries'] == 2
+    assert counts['firestore_documents'] == 4